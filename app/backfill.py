@@ -0,0 +1,69 @@
+"""Headless historical backfill.
+
+Usage:
+    python -m app.backfill START END [--concurrency N] [--batch-days N] [--restart]
+
+Dates are ISO formatted and inclusive, e.g. ``python -m app.backfill 2023-08-01 2024-05-31`` for a
+season. Finished days are checkpointed in the database, so rerunning the same command after an
+interruption only fetches what is missing.
+"""
+
+import argparse
+import logging
+import sys
+from datetime import date
+from typing import List
+
+from app.config import configure_logging, settings
+from app.database.db import init_db
+from app.database.migrations import run_migrations
+from app.services.backfill_service import BackfillService
+from app.services.match_service import MatchService
+from app.services.scraper_service import ScraperService
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.backfill", description="Backfill historical fixtures.")
+    parser.add_argument("start", type=date.fromisoformat, help="first date, YYYY-MM-DD")
+    parser.add_argument("end", type=date.fromisoformat, help="last date (inclusive), YYYY-MM-DD")
+    parser.add_argument("--concurrency", type=int, default=settings.backfill_concurrency, help="dates in flight")
+    parser.add_argument(
+        "--batch-days", type=int, default=settings.backfill_batch_days, help="days ingested per transaction"
+    )
+    parser.add_argument("--restart", action="store_true", help="ignore existing checkpoints in the range")
+    args = parser.parse_args(argv)
+    if args.end < args.start:
+        parser.error("END must not be before START")
+    return args
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = parse_args(argv)
+    configure_logging()
+    init_db()
+    run_migrations()
+
+    match_service = MatchService()
+    match_service.warm_identity_maps()
+    scraper = ScraperService()
+    service = BackfillService(scraper, match_service, concurrency=args.concurrency, batch_days=args.batch_days)
+    if args.restart:
+        logger.info("Cleared %s checkpoints", service.reset(args.start, args.end))
+    try:
+        report = service.run(args.start, args.end, progress=lambda r: logger.info("Backfill: %s", r.summary()))
+    except KeyboardInterrupt:
+        logger.warning("Backfill interrupted; rerun the same command to resume")
+        return 130
+    finally:
+        scraper.close()
+    print(report.summary())
+    if report.failed:
+        print("Failed dates (rerun to retry): " + ", ".join(day.isoformat() for day in report.failed))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
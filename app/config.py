@@ -18,6 +18,28 @@ class Settings:
     ollama_model: str = os.getenv("OLLAMA_MODEL", "llama3.2:1b")
     scrape_primary: str = os.getenv("SCRAPE_PRIMARY", "bbc")
     scrape_fallback: str = os.getenv("SCRAPE_FALLBACK", "espn")
+    espn_leagues: str = os.getenv("ESPN_LEAGUES", "eng.1,eng.2,eng.3,eng.4,eng.5,eng.fa,eng.league_cup")
+    scrape_hedge: bool = os.getenv("SCRAPE_HEDGE", "1").lower() in {"1", "true", "yes"}
+    scrape_hedge_budget_ms: int = int(os.getenv("SCRAPE_HEDGE_BUDGET_MS", "3000"))
+    response_archive_dir: str = os.getenv("RESPONSE_ARCHIVE_DIR", "")
+    response_archive_max_mb: int = int(os.getenv("RESPONSE_ARCHIVE_MAX_MB", "200"))
+    scrape_replay: bool = os.getenv("SCRAPE_REPLAY", "0").lower() in {"1", "true", "yes"}
+    scrape_concurrency: int = int(os.getenv("SCRAPE_CONCURRENCY", "4"))
+    scrape_connections_per_host: int = int(os.getenv("SCRAPE_CONNECTIONS_PER_HOST", "2"))
+    backfill_concurrency: int = int(os.getenv("BACKFILL_CONCURRENCY", "4"))
+    backfill_batch_days: int = int(os.getenv("BACKFILL_BATCH_DAYS", "7"))
+    bbc_requests_per_second: float = float(os.getenv("BBC_REQUESTS_PER_SECOND", "1"))
+    bbc_burst: int = int(os.getenv("BBC_BURST", "2"))
+    espn_requests_per_second: float = float(os.getenv("ESPN_REQUESTS_PER_SECOND", "2"))
+    espn_burst: int = int(os.getenv("ESPN_BURST", "7"))
+    _default_l2_cache = Path.home() / ".cache" / "football_ai" / "l2_cache.db"
+    l2_cache_path: str = os.getenv("L2_CACHE_PATH", str(_default_l2_cache))
+    l2_cache_max_mb: int = int(os.getenv("L2_CACHE_MAX_MB", "32"))
+    sqlite_journal_mode: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_mmap_mb: int = int(os.getenv("SQLITE_MMAP_MB", "128"))
+    sqlite_cache_mb: int = int(os.getenv("SQLITE_CACHE_MB", "32"))
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
     refresh_interval_seconds: int = int(os.getenv("REFRESH_INTERVAL_SECONDS", "30"))
 
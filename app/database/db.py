@@ -1,13 +1,81 @@
+import logging
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.config import settings
 from app.models.base import Base
 
-engine = create_engine(settings.database_url, echo=False, future=True)
+logger = logging.getLogger(__name__)
+
+
+def _is_sqlite_file(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (None, "", ":memory:")
+
+
+def apply_storage_profile(dbapi_connection, read_only: bool = False) -> None:
+    """Apply the SQLite pragmas from settings to a freshly opened DB-API connection.
+
+    WAL lets the UI read while the background writer commits; ``read_only`` connections
+    additionally set ``query_only`` so a stray write on the reader pool fails loudly.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout_ms)}")
+        if not read_only:
+            cursor.execute(f"PRAGMA journal_mode = {settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous = {settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA mmap_size = {int(settings.sqlite_mmap_mb) * 1024 * 1024}")
+        cursor.execute(f"PRAGMA cache_size = {-int(settings.sqlite_cache_mb) * 1024}")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+    finally:
+        cursor.close()
+
+
+def create_storage_engine(url: str, read_only: bool = False, pool_size: int = 5) -> Engine:
+    """Engine for ``url``; SQLite files get the storage profile applied on every new connection."""
+    if not _is_sqlite_file(url):
+        return create_engine(url, echo=False, future=True)
+    new_engine = create_engine(
+        url,
+        echo=False,
+        future=True,
+        pool_size=pool_size,
+        connect_args={"timeout": settings.sqlite_busy_timeout_ms / 1000, "check_same_thread": False},
+    )
+
+    @event.listens_for(new_engine, "connect")
+    def _on_connect(dbapi_connection, _record) -> None:
+        apply_storage_profile(dbapi_connection, read_only=read_only)
+        if not read_only:
+            # Let SQLAlchemy issue BEGIN itself (pysqlite would defer it to the first INSERT/UPDATE).
+            dbapi_connection.isolation_level = None
+
+    if not read_only:
+
+        @event.listens_for(new_engine, "begin")
+        def _on_begin(conn) -> None:
+            # Take the write lock before the first read: ingest decides what to insert, update and
+            # log from what it reads, so two writers must not both read the same state.
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return new_engine
+
+
+engine = create_storage_engine(settings.database_url, pool_size=2)
+# UI queries use their own pool so they never queue behind the ingest transaction; in-memory
+# and non-SQLite databases share the writer engine.
+read_engine = (
+    create_storage_engine(settings.database_url, read_only=True, pool_size=4)
+    if _is_sqlite_file(settings.database_url)
+    else engine
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False, class_=Session)
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, expire_on_commit=False, class_=Session)
 
 
 def init_db() -> None:
@@ -26,3 +94,13 @@ def get_session() -> Session:
         raise
     finally:
         session.close()
+
+
+@contextmanager
+def get_read_session() -> Session:
+    """Session on the read-only pool; nothing is committed and loaded objects stay usable."""
+    session = ReadSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
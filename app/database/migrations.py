@@ -1,12 +1,281 @@
 import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
 
 from app.database.db import engine
+from app.models import (  # noqa: F401
+    backfill_checkpoint,
+    daily_summary,
+    league,
+    match,
+    match_event,
+    match_stats,
+    prediction,
+    prediction_response,
+    team,
+)
 from app.models.base import Base
+from app.models.match import normalize_status
+from app.models.prediction_response import PredictionResponse
+from app.utils.datetime_utils import local_match_date
 
 logger = logging.getLogger(__name__)
 
+_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+def _add_match_lookup_indexes(conn: Connection) -> None:
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_matches_kickoff_utc ON matches (kickoff_utc)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_matches_status ON matches (status)"))
+
+
+def _fold_matches(conn: Connection, keeper: int, duplicates: List[int]) -> None:
+    """Re-point predictions, events and (if the keeper has none) stats at ``keeper``, then delete."""
+    for match_id in reversed(duplicates):
+        conn.execute(
+            text(
+                "UPDATE match_stats SET match_id = :keeper WHERE match_id = :id "
+                "AND NOT EXISTS (SELECT 1 FROM match_stats WHERE match_id = :keeper)"
+            ),
+            {"keeper": keeper, "id": match_id},
+        )
+    for match_id in duplicates:
+        params = {"keeper": keeper, "id": match_id}
+        conn.execute(text("UPDATE predictions SET match_id = :keeper WHERE match_id = :id"), params)
+        conn.execute(text("UPDATE match_events SET match_id = :keeper WHERE match_id = :id"), params)
+        conn.execute(text("DELETE FROM match_stats WHERE match_id = :id"), params)
+        conn.execute(text("DELETE FROM matches WHERE id = :id"), params)
+
+
+def _dedupe_matches(conn: Connection) -> None:
+    """Collapse matches sharing (home, away, kickoff) into the oldest row.
+
+    The kept row takes the scores and status of the most recently updated duplicate;
+    predictions and events are re-pointed at it and it keeps one set of stats.
+    """
+    groups = conn.execute(
+        text(
+            "SELECT home_team_id, away_team_id, kickoff_utc FROM matches "
+            "GROUP BY home_team_id, away_team_id, kickoff_utc HAVING COUNT(*) > 1"
+        )
+    ).all()
+    removed = 0
+    for home_id, away_id, kickoff in groups:
+        ids = conn.execute(
+            text(
+                "SELECT id FROM matches WHERE home_team_id = :home AND away_team_id = :away "
+                "AND kickoff_utc IS :kickoff ORDER BY updated_at, id"
+            ),
+            {"home": home_id, "away": away_id, "kickoff": kickoff},
+        ).scalars().all()
+        keeper, newest = min(ids), ids[-1]
+        duplicates = [match_id for match_id in ids if match_id != keeper]
+        params = {"keeper": keeper, "newest": newest}
+        if newest != keeper:
+            conn.execute(
+                text(
+                    "UPDATE matches SET (league_id, status, home_score, away_score, home_ht_score, away_ht_score, "
+                    "venue, updated_at) = (SELECT league_id, status, home_score, away_score, home_ht_score, "
+                    "away_ht_score, COALESCE(venue, (SELECT venue FROM matches WHERE id = :keeper)), updated_at "
+                    "FROM matches WHERE id = :newest) WHERE id = :keeper"
+                ),
+                params,
+            )
+        _fold_matches(conn, keeper, duplicates)
+        removed += len(duplicates)
+    if removed:
+        logger.info("Merged %s duplicate matches across %s fixtures", removed, len(groups))
+
+
+def _add_match_natural_key(conn: Connection) -> None:
+    conn.execute(
+        text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_matches_natural_key "
+            "ON matches (home_team_id, away_team_id, kickoff_utc)"
+        )
+    )
+
+
+def _add_match_date(conn: Connection) -> None:
+    """Store each match's local calendar day and fold NULL-kickoff rows into their dated twins.
+
+    A NULL-kickoff row that has a twin with a known kickoff (the same fixture ingested by the
+    live service) on the day it was stored, or the day before or after, is folded into the
+    nearest such twin. Any other NULL-kickoff row keeps a NULL ``match_date``: the day it was
+    stored says nothing about the day it was listed for, so it is left out of every day's view.
+    """
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(matches)"))}
+    if "match_date" not in columns:
+        conn.execute(text("ALTER TABLE matches ADD COLUMN match_date DATE"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_matches_match_date ON matches (match_date)"))
+    conn.execute(
+        text(
+            "UPDATE matches SET match_date = date(kickoff_local) "
+            "WHERE match_date IS NULL AND kickoff_local IS NOT NULL"
+        )
+    )
+    rows = conn.execute(
+        text("SELECT id, kickoff_utc FROM matches WHERE match_date IS NULL AND kickoff_utc IS NOT NULL")
+    ).all()
+    for match_id, kickoff in rows:
+        kickoff = datetime.fromisoformat(kickoff) if isinstance(kickoff, str) else kickoff
+        conn.execute(
+            text("UPDATE matches SET match_date = :day WHERE id = :id"),
+            {"day": local_match_date(kickoff).isoformat(), "id": match_id},
+        )
+
+    orphans = conn.execute(
+        text("SELECT id, home_team_id, away_team_id, created_at FROM matches WHERE kickoff_utc IS NULL")
+    ).all()
+    folded = 0
+    for match_id, home_id, away_id, created_at in orphans:
+        twin = conn.execute(
+            text(
+                "SELECT id FROM matches WHERE home_team_id = :home AND away_team_id = :away "
+                "AND kickoff_utc IS NOT NULL "
+                "AND match_date BETWEEN date(:created, '-1 day') AND date(:created, '+1 day') "
+                "ORDER BY ABS(julianday(kickoff_utc) - julianday(:created)) LIMIT 1"
+            ),
+            {"home": home_id, "away": away_id, "created": created_at},
+        ).scalar()
+        if twin is not None:
+            _fold_matches(conn, twin, [match_id])
+            folded += 1
+    if orphans:
+        logger.info(
+            "Found %s NULL-kickoff matches: %s folded into dated twins, %s left undated",
+            len(orphans),
+            folded,
+            len(orphans) - folded,
+        )
+
+
+def _normalize_match_statuses(conn: Connection) -> None:
+    """Rewrite raw provider statuses ("FT", "in progress", "STATUS_FULL_TIME", ...) as MatchStatus values.
+
+    Rows stored before ingest normalized statuses would otherwise be missed by every status
+    filter and log a spurious event on their first re-ingest. The daily summary is rebuilt
+    from the corrected rows.
+    """
+    raw_statuses = conn.execute(text("SELECT DISTINCT status FROM matches")).scalars().all()
+    rewritten = 0
+    for raw in raw_statuses:
+        status = normalize_status(raw)
+        if status != raw:
+            result = conn.execute(
+                text("UPDATE matches SET status = :status WHERE status IS :raw"), {"status": status, "raw": raw}
+            )
+            rewritten += result.rowcount
+    rebuild_daily_summary(conn)
+    if rewritten:
+        logger.info("Normalized the status of %s matches", rewritten)
+
+
+def rebuild_daily_summary(conn: Connection) -> None:
+    """Rebuild ``daily_match_summary`` from ``matches``; ingest keeps it current afterwards."""
+    conn.execute(text("DELETE FROM daily_match_summary"))
+    conn.execute(
+        text(
+            "INSERT INTO daily_match_summary (match_date, league_id, status, match_count) "
+            "SELECT match_date, league_id, status, COUNT(*) FROM matches "
+            "WHERE match_date IS NOT NULL GROUP BY match_date, league_id, status"
+        )
+    )
+
+
+def _add_prediction_history_indexes(conn: Connection) -> None:
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_predictions_created_at_id ON predictions (created_at, id)"))
+    conn.execute(
+        text("CREATE INDEX IF NOT EXISTS ix_predictions_match_created_at ON predictions (match_id, created_at, id)")
+    )
+
+
+def _move_raw_responses(conn: Connection) -> None:
+    """Compress inline ``predictions.raw_response`` text into ``prediction_responses`` and drop the column.
+
+    SQLite reuses the freed pages for new rows; ``VACUUM`` returns them to the filesystem.
+    """
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(predictions)"))}
+    if "raw_response" not in columns:
+        return
+    moved, last_id = 0, 0
+    while True:
+        rows = conn.execute(
+            text(
+                "SELECT id, raw_response FROM predictions WHERE id > :last AND raw_response IS NOT NULL "
+                "AND raw_response != '' ORDER BY id LIMIT 5000"
+            ),
+            {"last": last_id},
+        ).all()
+        if not rows:
+            break
+        conn.execute(
+            text("INSERT OR IGNORE INTO prediction_responses (prediction_id, body) VALUES (:id, :body)"),
+            [{"id": prediction_id, "body": PredictionResponse.compress(raw)} for prediction_id, raw in rows],
+        )
+        moved += len(rows)
+        last_id = rows[-1][0]
+    conn.execute(text("ALTER TABLE predictions DROP COLUMN raw_response"))
+    if moved:
+        logger.info("Compressed %s raw prediction responses into prediction_responses", moved)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Index matches by kickoff and status", _add_match_lookup_indexes),
+    Migration(2, "Merge duplicate matches", _dedupe_matches),
+    Migration(3, "Unique natural key on matches", _add_match_natural_key),
+    Migration(4, "Store and index the local match date", _add_match_date),
+    # Added after 7, but the summary and everything later read normalized statuses.
+    Migration(8, "Normalize stored match statuses", _normalize_match_statuses),
+    Migration(5, "Backfill the daily match summary", rebuild_daily_summary),
+    Migration(6, "Index predictions for paginated history", _add_prediction_history_indexes),
+    Migration(7, "Move raw prediction responses to compressed storage", _move_raw_responses),
+]
+
+
+def schema_version(bind: Engine = engine) -> int:
+    with bind.begin() as conn:
+        conn.execute(text(_VERSION_TABLE))
+        return conn.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_version")).scalar_one()
+
+
+def run_migrations(bind: Engine = engine) -> int:
+    """Create missing tables, then apply pending migrations in list order; returns the schema version.
 
-def run_migrations() -> None:
-    """Simple auto migration that ensures tables exist."""
-    logger.info("Applying database migrations (auto-create tables)")
-    Base.metadata.create_all(bind=engine)
+    A migration is pending until its version has a ``schema_version`` row, so a fix-up added
+    later can be listed ahead of the steps that depend on it. Each migration runs in its own
+    transaction together with that row, so a failing step leaves the database as it was.
+    """
+    Base.metadata.create_all(bind=bind)
+    with bind.begin() as conn:
+        conn.execute(text(_VERSION_TABLE))
+        applied = set(conn.execute(text("SELECT version FROM schema_version")).scalars())
+    for migration in MIGRATIONS:
+        if migration.version in applied:
+            continue
+        logger.info("Applying migration %s: %s", migration.version, migration.description)
+        with bind.begin() as conn:
+            migration.apply(conn)
+            conn.execute(
+                text("INSERT INTO schema_version (version, description) VALUES (:version, :description)"),
+                {"version": migration.version, "description": migration.description},
+            )
+        applied.add(migration.version)
+    return max(applied, default=0)
@@ -0,0 +1,291 @@
+"""Columnar, compressed snapshots of the match database.
+
+A snapshot file is ``MAGIC`` followed by frames, each a little-endian ``uint32`` header length,
+a JSON header and (for chunks) a binary payload:
+
+* ``snapshot`` – format and schema version;
+* ``table`` – table name and ``(column, kind)`` pairs;
+* ``chunk`` – up to ``chunk_rows`` rows of the current table, stored column by column. Every
+  column is a zlib-compressed validity byte per row plus a zlib-compressed value buffer: int,
+  datetime (microseconds since the epoch) and date (ordinal) values are delta-encoded int64,
+  floats are float64, and strings and binary values are int32 lengths followed by the bytes
+  (UTF-8 for strings);
+* ``end`` – the number of rows written for the table, and finally ``snapshot_end``.
+
+Export and import hold one chunk in memory at a time, whatever the database size.
+"""
+
+import json
+import logging
+import struct
+import sys
+import zlib
+from array import array
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import Table, func, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.database.db import engine, read_engine
+from app.database.migrations import rebuild_daily_summary, run_migrations
+from app.models.base import Base
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"FAISNAP1"
+# 2: prediction_responses joined the table set.
+FORMAT_VERSION = 2
+# Parents before children, so an import never inserts a row before the row it references.
+SNAPSHOT_TABLES = ("leagues", "teams", "matches", "match_stats", "predictions", "prediction_responses")
+DEFAULT_CHUNK_ROWS = 65_536
+
+_HEADER = struct.Struct("<I")
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_KINDS = {int: "int", float: "float", str: "str", bytes: "bytes", datetime: "datetime", date: "date"}
+
+
+class SnapshotError(ValueError):
+    """The file is not a readable snapshot, or the target database cannot take one."""
+
+
+def _column_kind(column) -> str:
+    try:
+        return _KINDS[column.type.python_type]
+    except (KeyError, NotImplementedError) as exc:
+        raise SnapshotError(f"Column {column.table.name}.{column.name} has no snapshot encoding") from exc
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _encode_column(kind: str, values: Sequence, level: int) -> Tuple[bytes, bytes]:
+    validity = bytes(value is not None for value in values)
+    if kind in ("str", "bytes"):
+        if kind == "str":
+            encoded = [value.encode("utf-8") if value is not None else b"" for value in values]
+        else:
+            encoded = [bytes(value) if value is not None else b"" for value in values]
+        data = _little_endian(array("i", map(len, encoded))) + b"".join(encoded)
+    elif kind == "float":
+        data = _little_endian(array("d", (0.0 if value is None else value for value in values)))
+    else:
+        if kind == "datetime":
+            numbers = [
+                0 if value is None else (value.replace(tzinfo=None) - _EPOCH) // _MICROSECOND for value in values
+            ]
+        elif kind == "date":
+            numbers = [0 if value is None else value.toordinal() for value in values]
+        else:
+            numbers = [0 if value is None else value for value in values]
+        # Ids and timestamps mostly increase, so deltas are small numbers that compress well.
+        data = _little_endian(array("q", (b - a for a, b in zip([0, *numbers], numbers))))
+    return zlib.compress(validity, level), zlib.compress(data, level)
+
+
+def _decode_column(kind: str, rows: int, validity: bytes, data: bytes) -> List:
+    present = zlib.decompress(validity)
+    raw = zlib.decompress(data)
+    if kind in ("str", "bytes"):
+        lengths = _from_little_endian("i", raw[: 4 * rows])
+        values, offset = [], 4 * rows
+        for length in lengths:
+            values.append(raw[offset : offset + length])
+            offset += length
+        if kind == "str":
+            values = [value.decode("utf-8") for value in values]
+    elif kind == "float":
+        values = list(_from_little_endian("d", raw))
+    else:
+        numbers = accumulate(_from_little_endian("q", raw))
+        if kind == "datetime":
+            values = [_EPOCH + number * _MICROSECOND for number in numbers]
+        elif kind == "date":
+            values = [date.fromordinal(number) if number else None for number in numbers]
+        else:
+            values = list(numbers)
+    if present.count(0) == 0:
+        return values
+    return [value if flag else None for value, flag in zip(values, present)]
+
+
+def _write_frame(out: BinaryIO, header: Dict, payload: Sequence[bytes] = ()) -> None:
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    out.write(_HEADER.pack(len(encoded)))
+    out.write(encoded)
+    for part in payload:
+        out.write(part)
+
+
+def _read_frame(source: BinaryIO) -> Dict | None:
+    prefix = source.read(_HEADER.size)
+    if not prefix:
+        return None
+    if len(prefix) != _HEADER.size:
+        raise SnapshotError("Snapshot is truncated")
+    (length,) = _HEADER.unpack(prefix)
+    encoded = source.read(length)
+    if len(encoded) != length:
+        raise SnapshotError("Snapshot is truncated")
+    try:
+        return json.loads(encoded)
+    except ValueError as exc:
+        raise SnapshotError("Snapshot frame header is corrupt") from exc
+
+
+def _begin_sqlite_transaction(conn: Connection) -> None:
+    """Make sure ``conn`` is inside a real SQLite transaction.
+
+    pysqlite only sends ``BEGIN`` before DML, so reads and DDL issued first would otherwise run
+    in autocommit mode. Writer engines from ``create_storage_engine`` have already begun one.
+    """
+    if not conn.connection.dbapi_connection.in_transaction:
+        conn.exec_driver_sql("BEGIN")
+
+
+def _schema_version(conn: Connection) -> int:
+    if not conn.dialect.has_table(conn, "schema_version"):
+        return 0
+    return conn.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_version")).scalar_one()
+
+
+def export_snapshot(
+    path: str | Path, bind: Engine = read_engine, chunk_rows: int = DEFAULT_CHUNK_ROWS, level: int = 6
+) -> Dict[str, int]:
+    """Stream the snapshot tables of ``bind`` to ``path``; returns rows written per table.
+
+    All tables are read in one transaction, so rows committed by a concurrent writer during the
+    export are either in every table of the snapshot or in none.
+    """
+    tables = [Base.metadata.tables[name] for name in SNAPSHOT_TABLES]
+    counts: Dict[str, int] = {}
+    target = Path(path)
+    partial = target.with_name(target.name + ".partial")
+    with partial.open("wb") as out, bind.begin() as conn:
+        _begin_sqlite_transaction(conn)
+        out.write(MAGIC)
+        _write_frame(
+            out, {"type": "snapshot", "format": FORMAT_VERSION, "schema_version": _schema_version(conn)}
+        )
+        for table in tables:
+            kinds = [(column.name, _column_kind(column)) for column in table.columns]
+            _write_frame(out, {"type": "table", "name": table.name, "columns": kinds})
+            written = 0
+            result = conn.execution_options(yield_per=chunk_rows).execute(
+                select(table).order_by(*table.primary_key.columns)
+            )
+            for partition in result.partitions():
+                columns = list(zip(*partition))
+                payload: List[bytes] = []
+                sizes = []
+                for (_name, kind), values in zip(kinds, columns):
+                    validity, data = _encode_column(kind, values, level)
+                    payload += [validity, data]
+                    sizes.append([len(validity), len(data)])
+                _write_frame(out, {"type": "chunk", "rows": len(partition), "columns": sizes}, payload)
+                written += len(partition)
+            _write_frame(out, {"type": "end", "rows": written})
+            counts[table.name] = written
+        _write_frame(out, {"type": "snapshot_end", "tables": counts})
+    partial.replace(target)
+    logger.info("Exported snapshot %s: %s", target, counts)
+    return counts
+
+
+def iter_snapshot(path: str | Path) -> Iterator[Tuple[str, Dict[str, List]]]:
+    """Yield ``(table, {column: values})`` for every chunk in the snapshot, in file order."""
+    with Path(path).open("rb") as source:
+        if source.read(len(MAGIC)) != MAGIC:
+            raise SnapshotError(f"{path} is not a snapshot")
+        header = _read_frame(source)
+        if not header or header.get("type") != "snapshot" or header.get("format") != FORMAT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot header: {header}")
+        table, kinds, finished = None, [], False
+        while (frame := _read_frame(source)) is not None:
+            if frame["type"] == "table":
+                table, kinds = frame["name"], frame["columns"]
+            elif frame["type"] == "chunk":
+                chunk = {}
+                for (name, kind), (validity_size, data_size) in zip(kinds, frame["columns"]):
+                    validity, data = source.read(validity_size), source.read(data_size)
+                    if len(validity) != validity_size or len(data) != data_size:
+                        raise SnapshotError("Snapshot is truncated")
+                    chunk[name] = _decode_column(kind, frame["rows"], validity, data)
+                yield table, chunk
+            elif frame["type"] == "snapshot_end":
+                finished = True
+        if not finished:
+            raise SnapshotError("Snapshot is truncated")
+
+
+def _insert_chunk(conn: Connection, table: Table, chunk: Dict[str, List]) -> int:
+    """Insert one decoded chunk with a single DB-API ``executemany``.
+
+    Values are converted a column at a time with the dialect's own bind processors, which skips
+    SQLAlchemy's per-row parameter handling (the bulk of the cost at snapshot sizes).
+    """
+    unknown = [name for name in chunk if name not in table.columns]
+    if unknown:
+        raise SnapshotError(f"Snapshot has columns {unknown} that {table.name} does not")
+    columns = [table.columns[name] for name in chunk]
+    converted = []
+    for column in columns:
+        values = chunk[column.name]
+        process = column.type.dialect_impl(conn.dialect).bind_processor(conn.dialect)
+        converted.append([None if value is None else process(value) for value in values] if process else values)
+    rows = list(zip(*converted))
+    if rows:
+        quote = conn.dialect.identifier_preparer.quote
+        conn.exec_driver_sql(
+            f"INSERT INTO {quote(table.name)} ({', '.join(quote(column.name) for column in columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})",
+            rows,
+        )
+    return len(rows)
+
+
+def import_snapshot(path: str | Path, bind: Engine = engine) -> Dict[str, int]:
+    """Load a snapshot into an empty database at ``bind``; returns rows inserted per table.
+
+    The schema is created and migrated first, secondary indexes are dropped while rows are
+    loaded chunk by chunk and rebuilt afterwards, and derived tables (the daily summary) are
+    recomputed at the end. Everything happens in one transaction, so a failed import leaves
+    the database empty.
+    """
+    run_migrations(bind)
+    tables: Dict[str, Table] = {name: Base.metadata.tables[name] for name in SNAPSHOT_TABLES}
+    counts = {name: 0 for name in SNAPSHOT_TABLES}
+    with bind.begin() as conn:
+        # Indexes are dropped and recreated below; that DDL must roll back with the rows.
+        _begin_sqlite_transaction(conn)
+        for table in tables.values():
+            if conn.execute(select(func.count()).select_from(table)).scalar_one():
+                raise SnapshotError(f"Refusing to import into a database that already has {table.name}")
+        indexes = [index for table in tables.values() for index in table.indexes]
+        for index in indexes:
+            index.drop(conn, checkfirst=True)
+        for name, chunk in iter_snapshot(path):
+            table = tables.get(name)
+            if table is None:
+                logger.warning("Skipping unknown snapshot table %s", name)
+                continue
+            counts[name] += _insert_chunk(conn, table, chunk)
+        for index in indexes:
+            index.create(conn)
+        rebuild_daily_summary(conn)
+    logger.info("Imported snapshot %s: %s", path, counts)
+    return counts
@@ -3,7 +3,7 @@ from datetime import date
 
 from PySide6.QtWidgets import QApplication
 
-from app.config import configure_logging
+from app.config import configure_logging, settings
 from app.database.db import init_db
 from app.database.migrations import run_migrations
 from app.services.live_score_service import LiveScoreService
@@ -12,20 +12,22 @@ from app.services.prediction_service import PredictionService
 from app.services.scraper_service import ScraperService
 from app.ui.main_window import MainWindow
 from app.ui.theme import apply_dark_palette
+from app.utils.persistent_cache import enable_persistent_cache
 
 
 def bootstrap():
     configure_logging()
     init_db()
     run_migrations()
+    enable_persistent_cache(settings.l2_cache_path, max_bytes=settings.l2_cache_max_mb * 1024 * 1024)
 
     scraper = ScraperService()
     match_service = MatchService()
+    match_service.warm_identity_maps()
     prediction_service = PredictionService()
 
-    # Prime database with today's fixtures (and horizon from settings)
+    # The background loop primes the database; the first paint comes from the local caches.
     live_service = LiveScoreService(scraper, match_service)
-    live_service.refresh_window()
     live_service.start()
 
     app = QApplication(sys.argv)
@@ -36,9 +38,12 @@ def bootstrap():
         scraper_service=scraper,
         live_service=live_service,
     )
-    window.refresh_matches(date.today())
+    window.show_date(date.today())
     window.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    live_service.stop()
+    scraper.close()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,19 @@
+from datetime import date, datetime, timezone
+
+from sqlalchemy import Date, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class BackfillCheckpoint(Base):
+    """A scraped day whose fixtures are stored; a resumed backfill skips it."""
+
+    __tablename__ = "backfill_checkpoints"
+
+    match_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    fixtures: Mapped[int] = mapped_column(nullable=False, default=0)
+    completed_at: Mapped[datetime] = mapped_column(DateTime(), default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<BackfillCheckpoint {self.match_date} fixtures={self.fixtures}>"
@@ -0,0 +1,20 @@
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class DailyMatchSummary(Base):
+    """Number of matches per (local match day, league, status), maintained on ingest."""
+
+    __tablename__ = "daily_match_summary"
+
+    match_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    league_id: Mapped[int] = mapped_column(ForeignKey("leagues.id"), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    match_count: Mapped[int] = mapped_column(nullable=False, default=0)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<DailyMatchSummary {self.match_date} league={self.league_id} {self.status}={self.match_count}>"
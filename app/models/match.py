@@ -1,7 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import Date, DateTime, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
@@ -13,8 +13,31 @@ class MatchStatus:
     FINISHED = "finished"
 
 
+_FINISHED_CODES = {"ft", "aet", "pens", "full time", "result"}
+_LIVE_CODES = {"ht", "live", "in progress"}
+
+
+def normalize_status(raw: str | None) -> str:
+    """Map a provider status (BBC "FT"/"HT"/"45'", ESPN "status_full_time", ...) to a MatchStatus."""
+    value = (raw or "").strip().lower()
+    if value in {MatchStatus.UPCOMING, MatchStatus.LIVE, MatchStatus.FINISHED}:
+        return value
+    if value in _FINISHED_CODES or "full_time" in value or "final" in value:
+        return MatchStatus.FINISHED
+    if value in _LIVE_CODES or "progress" in value or "half" in value or value.endswith("'"):
+        return MatchStatus.LIVE
+    return MatchStatus.UPCOMING
+
+
 class Match(TimestampMixin, Base):
     __tablename__ = "matches"
+    # Keep in sync with app.database.migrations, which adds these to existing databases.
+    __table_args__ = (
+        Index("ix_matches_kickoff_utc", "kickoff_utc"),
+        Index("ix_matches_status", "status"),
+        Index("ix_matches_match_date", "match_date"),
+        Index("uq_matches_natural_key", "home_team_id", "away_team_id", "kickoff_utc", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     league_id: Mapped[int] = mapped_column(ForeignKey("leagues.id"), nullable=False)
@@ -22,6 +45,8 @@ class Match(TimestampMixin, Base):
     away_team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"), nullable=False)
     kickoff_utc: Mapped[datetime | None] = mapped_column(DateTime(timezone=False))
     kickoff_local: Mapped[datetime | None] = mapped_column(DateTime(timezone=False))
+    # Local (Europe/London) calendar day; for fixtures without a kickoff, the day they were listed on.
+    match_date: Mapped[date | None] = mapped_column(Date)
     venue: Mapped[str | None] = mapped_column(String(120))
     status: Mapped[str] = mapped_column(String(20), default=MatchStatus.UPCOMING)
     home_score: Mapped[Optional[int]] = mapped_column(default=None)
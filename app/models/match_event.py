@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base
+from .match import MatchStatus
+
+
+class MatchEventKind:
+    KICKOFF = "kickoff"
+    GOAL = "goal"
+    FULL_TIME = "full_time"
+    SCORE_CORRECTION = "score_correction"
+    STATUS_CHANGE = "status_change"
+
+
+def detect_events(before: Dict, after: Dict) -> List[str]:
+    """Event kinds implied by going from ``before`` to ``after`` (dicts with status and scores)."""
+    events: List[str] = []
+    if before["status"] != after["status"]:
+        if after["status"] == MatchStatus.LIVE and before["status"] == MatchStatus.UPCOMING:
+            events.append(MatchEventKind.KICKOFF)
+        elif after["status"] != MatchStatus.FINISHED:
+            events.append(MatchEventKind.STATUS_CHANGE)
+    old_goals = [before["home_score"] or 0, before["away_score"] or 0]
+    new_goals = [after["home_score"] or 0, after["away_score"] or 0]
+    if new_goals != old_goals:
+        scored = all(new >= old for new, old in zip(new_goals, old_goals))
+        events.append(MatchEventKind.GOAL if scored else MatchEventKind.SCORE_CORRECTION)
+    if after["status"] == MatchStatus.FINISHED and before["status"] != MatchStatus.FINISHED:
+        events.append(MatchEventKind.FULL_TIME)
+    return events
+
+
+class MatchEvent(Base):
+    __tablename__ = "match_events"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    match_id: Mapped[int] = mapped_column(ForeignKey("matches.id"), nullable=False, index=True)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    previous_status: Mapped[str | None] = mapped_column(String(20))
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    home_score: Mapped[Optional[int]] = mapped_column(default=None)
+    away_score: Mapped[Optional[int]] = mapped_column(default=None)
+    created_at: Mapped[datetime] = mapped_column(DateTime(), default=lambda: datetime.now(timezone.utc))
+
+    match: Mapped["Match"] = relationship()
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<MatchEvent match_id={self.match_id} kind={self.kind}>"
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -8,6 +8,11 @@ from .base import Base
 
 class Prediction(Base):
     __tablename__ = "predictions"
+    # Keep in sync with app.database.migrations; both serve the newest-first keyset pages.
+    __table_args__ = (
+        Index("ix_predictions_created_at_id", "created_at", "id"),
+        Index("ix_predictions_match_created_at", "match_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     match_id: Mapped[int] = mapped_column(ForeignKey("matches.id"), nullable=False)
@@ -19,7 +24,7 @@ class Prediction(Base):
     second_half_goals: Mapped[int | None] = mapped_column()
     total_corners: Mapped[int | None] = mapped_column()
     total_cards: Mapped[int | None] = mapped_column()
-    raw_response: Mapped[str | None] = mapped_column()
+    # The raw model reply is stored compressed in PredictionResponse, read only on demand.
     created_at: Mapped[datetime] = mapped_column(DateTime(), default=lambda: datetime.now(timezone.utc))
 
     match: Mapped["Match"] = relationship(back_populates="predictions")
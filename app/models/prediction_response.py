@@ -0,0 +1,30 @@
+import zlib
+
+from sqlalchemy import ForeignKey, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class PredictionResponse(Base):
+    """The model's raw reply for a prediction, zlib-compressed and kept out of the ``predictions`` rows.
+
+    History lists and analytics scan ``predictions``; the reply is only read when one prediction
+    is opened, so it lives here and is fetched by primary key.
+    """
+
+    __tablename__ = "prediction_responses"
+
+    prediction_id: Mapped[int] = mapped_column(ForeignKey("predictions.id"), primary_key=True)
+    body: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    @staticmethod
+    def compress(text: str) -> bytes:
+        return zlib.compress(text.encode("utf-8"))
+
+    @property
+    def text(self) -> str:
+        return zlib.decompress(self.body).decode("utf-8")
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<PredictionResponse prediction_id={self.prediction_id} bytes={len(self.body)}>"
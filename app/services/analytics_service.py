@@ -0,0 +1,226 @@
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+from sqlalchemy import func, select
+
+from app.database.db import get_read_session
+from app.models.league import League
+from app.models.match import Match, MatchStatus
+from app.models.prediction import Prediction
+
+logger = logging.getLogger(__name__)
+
+GROUP_KEYS = ("model", "league", "month")
+_EPSILON = 1e-6
+
+
+@dataclass
+class PredictionColumns:
+    """(prediction, result) pairs as parallel arrays; group columns are codes into their label arrays."""
+
+    model: np.ndarray
+    models: np.ndarray
+    league: np.ndarray
+    leagues: np.ndarray
+    month: np.ndarray
+    months: np.ndarray
+    pred_home: np.ndarray
+    pred_away: np.ndarray
+    actual_home: np.ndarray
+    actual_away: np.ndarray
+    # NaN where the model gave no confidence.
+    confidence: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.pred_home)
+
+    @classmethod
+    def empty(cls) -> "PredictionColumns":
+        labels, codes, ints = np.array([], dtype=object), np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        return cls(codes, labels, codes, labels, codes, labels, ints, ints, ints, ints, np.array([], dtype=float))
+
+
+def _codes(values: Sequence) -> tuple[np.ndarray, np.ndarray]:
+    """Integer code per value plus the sorted labels they index (a dict pass beats ``np.unique`` on objects)."""
+    index: Dict = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int64, count=len(values))
+    labels = np.array([str(label) for label in index], dtype=object)
+    order = np.argsort(labels)
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return rank[codes], labels[order]
+
+
+def _group_sum(keys: np.ndarray, size: int, values: np.ndarray) -> np.ndarray:
+    return np.bincount(keys, weights=values, minlength=size)
+
+
+class PredictionAnalyticsService:
+    """Accuracy of stored predictions against final results, computed on column arrays."""
+
+    def load_columns(self) -> PredictionColumns:
+        """Every scored prediction for a finished match, one array per column.
+
+        Predictions and results are fetched as two flat queries and joined on ``match_id`` in numpy;
+        at 100k+ rows building Python row tuples dominates, so each query returns as little as possible.
+        """
+        with get_read_session() as session:
+            # Plain DB-API tuples: every column here is a number or string SQLite returns as-is, so the
+            # ORM and Row wrapping would only add per-row overhead.
+            connection = session.connection()
+            results = connection.execute(
+                select(
+                    Match.id,
+                    Match.league_id,
+                    func.strftime("%Y-%m", func.coalesce(Match.match_date, Match.kickoff_utc)),
+                    Match.home_score,
+                    Match.away_score,
+                ).where(
+                    Match.status == MatchStatus.FINISHED,
+                    Match.home_score.is_not(None),
+                    Match.away_score.is_not(None),
+                )
+            ).cursor.fetchall()
+            predictions = connection.execute(
+                select(
+                    Prediction.match_id,
+                    Prediction.model_used,
+                    Prediction.final_score_home,
+                    Prediction.final_score_away,
+                    Prediction.confidence,
+                ).where(Prediction.final_score_home.is_not(None), Prediction.final_score_away.is_not(None))
+            ).cursor.fetchall()
+            league_names = dict(connection.execute(select(League.id, League.name)).all())
+        if not results or not predictions:
+            return PredictionColumns.empty()
+
+        match_ids, league_ids, months, home_scores, away_scores = zip(*results)
+        match_ids = np.asarray(match_ids, dtype=np.int64)
+        row_of_match = np.full(int(match_ids.max()) + 1, -1, dtype=np.int64)
+        row_of_match[match_ids] = np.arange(len(match_ids))
+
+        predicted_ids, models, pred_home, pred_away, confidence = zip(*predictions)
+        predicted_ids = np.asarray(predicted_ids, dtype=np.int64)
+        rows = np.full(len(predicted_ids), -1, dtype=np.int64)
+        known = predicted_ids < len(row_of_match)
+        rows[known] = row_of_match[predicted_ids[known]]
+        scored = rows >= 0
+        rows = rows[scored]
+
+        model_codes, model_labels = _codes(models)
+        league_codes, league_labels = _codes([league_names.get(league_id, "unknown") for league_id in league_ids])
+        month_codes, month_labels = _codes([month or "unknown" for month in months])
+        return PredictionColumns(
+            model=model_codes[scored],
+            models=model_labels,
+            league=league_codes[rows],
+            leagues=league_labels,
+            month=month_codes[rows],
+            months=month_labels,
+            pred_home=np.asarray(pred_home, dtype=np.int64)[scored],
+            pred_away=np.asarray(pred_away, dtype=np.int64)[scored],
+            actual_home=np.asarray(home_scores, dtype=np.int64)[rows],
+            actual_away=np.asarray(away_scores, dtype=np.int64)[rows],
+            confidence=np.asarray(confidence, dtype=float)[scored],
+        )
+
+    def accuracy(
+        self, group_by: Sequence[str] = GROUP_KEYS, columns: PredictionColumns | None = None
+    ) -> List[Dict]:
+        """Per-group metrics, largest groups first.
+
+        Each row holds the group labels, ``predictions``, ``exact_score_rate``, ``outcome_accuracy``,
+        ``goal_mae`` (per team), and ``brier``/``log_loss`` of ``confidence`` as the probability that
+        the predicted outcome is right (``None`` when no prediction in the group has a confidence).
+        """
+        unknown = set(group_by) - set(GROUP_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown analytics grouping: {sorted(unknown)}")
+        columns = columns if columns is not None else self.load_columns()
+        if not len(columns):
+            return []
+
+        keys, labels = self._group_keys(columns, group_by)
+        size = len(labels)
+        counts = np.bincount(keys, minlength=size)
+        exact = (columns.pred_home == columns.actual_home) & (columns.pred_away == columns.actual_away)
+        outcome = np.sign(columns.pred_home - columns.pred_away) == np.sign(columns.actual_home - columns.actual_away)
+        goal_error = (
+            np.abs(columns.pred_home - columns.actual_home) + np.abs(columns.pred_away - columns.actual_away)
+        ) / 2
+
+        rated = ~np.isnan(columns.confidence)
+        p = np.clip(np.where(rated, columns.confidence, 0.5), _EPSILON, 1 - _EPSILON)
+        y = outcome.astype(float)
+        brier = np.where(rated, (p - y) ** 2, 0.0)
+        log_loss = np.where(rated, -(y * np.log(p) + (1 - y) * np.log(1 - p)), 0.0)
+        rated_counts = _group_sum(keys, size, rated.astype(float))
+
+        sums = {
+            "exact_score_rate": _group_sum(keys, size, exact.astype(float)),
+            "outcome_accuracy": _group_sum(keys, size, y),
+            "goal_mae": _group_sum(keys, size, goal_error),
+        }
+        scored = {"brier": _group_sum(keys, size, brier), "log_loss": _group_sum(keys, size, log_loss)}
+
+        results: List[Dict] = []
+        for index in np.argsort(-counts, kind="stable"):
+            row = dict(zip(group_by, labels[index]))
+            row["predictions"] = int(counts[index])
+            for name, total in sums.items():
+                row[name] = float(total[index] / counts[index])
+            for name, total in scored.items():
+                row[name] = float(total[index] / rated_counts[index]) if rated_counts[index] else None
+            results.append(row)
+        return results
+
+    def calibration(self, bins: int = 10, columns: PredictionColumns | None = None) -> Dict[str, List[Dict]]:
+        """Confidence buckets per model: how often the predicted outcome came true at each confidence level."""
+        columns = columns if columns is not None else self.load_columns()
+        rated = ~np.isnan(columns.confidence)
+        if not rated.any():
+            return {}
+        confidence = np.clip(columns.confidence[rated], 0.0, 1.0)
+        correct = (
+            np.sign(columns.pred_home - columns.pred_away) == np.sign(columns.actual_home - columns.actual_away)
+        )[rated].astype(float)
+        model = columns.model[rated]
+        bucket = np.minimum((confidence * bins).astype(np.int64), bins - 1)
+        keys = model * bins + bucket
+        size = len(columns.models) * bins
+        counts = np.bincount(keys, minlength=size)
+        mean_confidence = _group_sum(keys, size, confidence)
+        hits = _group_sum(keys, size, correct)
+
+        result: Dict[str, List[Dict]] = {}
+        for key in np.flatnonzero(counts):
+            model_index, bucket_index = divmod(int(key), bins)
+            result.setdefault(str(columns.models[model_index]), []).append(
+                {
+                    "bucket": (bucket_index / bins, (bucket_index + 1) / bins),
+                    "predictions": int(counts[key]),
+                    "mean_confidence": float(mean_confidence[key] / counts[key]),
+                    "observed_accuracy": float(hits[key] / counts[key]),
+                }
+            )
+        return result
+
+    def _group_keys(self, columns: PredictionColumns, group_by: Sequence[str]) -> tuple[np.ndarray, List[tuple]]:
+        """Dense group id per prediction plus the label tuple of each group id."""
+        if not group_by:
+            return np.zeros(len(columns), dtype=np.int64), [()]
+        composite = np.zeros(len(columns), dtype=np.int64)
+        for name in group_by:
+            composite = composite * len(getattr(columns, f"{name}s")) + getattr(columns, name)
+        unique, keys = np.unique(composite, return_inverse=True)
+        labels = []
+        for value in unique:
+            parts = []
+            for name in reversed(group_by):
+                options = getattr(columns, f"{name}s")
+                value, code = divmod(int(value), len(options))
+                parts.append(str(options[code]))
+            labels.append(tuple(reversed(parts)))
+        return keys.astype(np.int64), labels
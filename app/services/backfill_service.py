@@ -0,0 +1,151 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.config import settings
+from app.database.db import get_read_session, get_session
+from app.models.backfill_checkpoint import BackfillCheckpoint
+from app.services.match_service import MatchService
+from app.services.scraper_service import ScraperService
+from app.services.source_registry import NoFixturesError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BackfillReport:
+    requested: int = 0
+    # Dates already checkpointed by an earlier run.
+    resumed: int = 0
+    completed: int = 0
+    failed: List[date] = field(default_factory=list)
+    fixtures: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def dates_per_second(self) -> float:
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def fixtures_per_second(self) -> float:
+        return self.fixtures / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        done = self.resumed + self.completed
+        line = (
+            f"{done}/{self.requested} dates done ({self.resumed} resumed) · {self.fixtures} fixtures "
+            f"({self.inserted} new, {self.updated} updated) · {self.dates_per_second:.2f} dates/s · "
+            f"{self.fixtures_per_second:.1f} fixtures/s"
+        )
+        if self.failed:
+            line += f" · {len(self.failed)} failed"
+        return line
+
+
+class BackfillService:
+    """Walks a date range through the scraper and stores it, resuming from per-day checkpoints.
+
+    Days are scraped concurrently (bounded by ``concurrency``) and ingested ``batch_days`` at a
+    time in one transaction each. A day is checkpointed after its batch commits, so an interrupted
+    run at worst re-ingests one batch, which the no-op-skipping upsert makes cheap.
+    """
+
+    def __init__(
+        self,
+        scraper: ScraperService,
+        match_service: MatchService,
+        concurrency: int | None = None,
+        batch_days: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.scraper = scraper
+        self.match_service = match_service
+        self.concurrency = max(1, concurrency or settings.backfill_concurrency)
+        self.batch_days = max(1, batch_days or settings.backfill_batch_days)
+        self._clock = clock
+
+    def pending_dates(self, start: date, end: date) -> List[date]:
+        """Dates from ``start`` to ``end`` (inclusive) without a checkpoint, oldest first."""
+        with get_read_session() as session:
+            done = set(
+                session.execute(
+                    select(BackfillCheckpoint.match_date).where(BackfillCheckpoint.match_date.between(start, end))
+                ).scalars()
+            )
+        days = (end - start).days + 1
+        return [day for day in (start + timedelta(days=offset) for offset in range(max(0, days))) if day not in done]
+
+    def reset(self, start: date, end: date) -> int:
+        """Forget checkpoints in the range so the next run scrapes it again; returns how many were removed."""
+        with get_session() as session:
+            removed = session.execute(
+                delete(BackfillCheckpoint).where(BackfillCheckpoint.match_date.between(start, end))
+            )
+            return removed.rowcount
+
+    def run(
+        self, start: date, end: date, progress: Callable[[BackfillReport], None] | None = None
+    ) -> BackfillReport:
+        started = self._clock()
+        pending = self.pending_dates(start, end)
+        report = BackfillReport(requested=max(0, (end - start).days + 1))
+        report.resumed = report.requested - len(pending)
+        batch: List[Tuple[date, List[Dict]]] = []
+        for target_date, fixtures, error in self.scraper.get_fixtures_for_dates(pending, self.concurrency):
+            if isinstance(error, NoFixturesError):
+                fixtures, error = [], None
+            if error is not None:
+                logger.warning("Backfill failed for %s: %s", target_date.isoformat(), error)
+                report.failed.append(target_date)
+                continue
+            batch.append((target_date, fixtures))
+            if len(batch) >= self.batch_days:
+                self._ingest_batch(batch, report)
+                batch = []
+                report.elapsed = self._clock() - started
+                if progress is not None:
+                    progress(report)
+        if batch:
+            self._ingest_batch(batch, report)
+        report.failed.sort()
+        report.elapsed = self._clock() - started
+        if progress is not None:
+            progress(report)
+        return report
+
+    def _ingest_batch(self, batch: List[Tuple[date, List[Dict]]], report: BackfillReport) -> None:
+        # Undated fixtures keep the day they were scraped for, so several days can share one transaction.
+        fixtures = [{**fixture, "match_date": target_date} for target_date, day in batch for fixture in day]
+        try:
+            result = self.match_service.bulk_upsert_fixtures(fixtures)
+        except Exception as exc:
+            first = min(target_date for target_date, _ in batch)
+            logger.error("Backfill ingest failed for %s days from %s: %s", len(batch), first, exc)
+            report.failed.extend(target_date for target_date, _ in batch)
+            return
+        now = datetime.now(timezone.utc)
+        stmt = sqlite_insert(BackfillCheckpoint.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BackfillCheckpoint.__table__.c.match_date],
+            set_={"fixtures": stmt.excluded.fixtures, "completed_at": stmt.excluded.completed_at},
+        )
+        with get_session() as session:
+            session.execute(
+                stmt,
+                [{"match_date": target_date, "fixtures": len(day), "completed_at": now} for target_date, day in batch],
+            )
+        report.completed += len(batch)
+        report.fixtures += len(fixtures)
+        report.inserted += result.inserted
+        report.updated += result.updated
+        report.unchanged += result.unchanged
+        report.skipped += result.skipped
@@ -0,0 +1,100 @@
+from typing import Dict, List
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+try:  # pragma: no cover - optional faster backend
+    import lxml  # noqa: F401
+
+    DEFAULT_BACKEND = "lxml"
+except ImportError:  # pragma: no cover
+    DEFAULT_BACKEND = "html.parser"
+
+FIXTURE_CLASS = "gs-o-list-ui__item--flush"
+
+TEAM_NAME_CLASS = "sp-c-fixture__team-name"
+HOME_TEAM_CLASS = "sp-c-fixture__team--home"
+AWAY_TEAM_CLASS = "sp-c-fixture__team--away"
+STATUS_CLASS = "sp-c-fixture__status"
+HOME_SCORE_CLASS = "sp-c-fixture__number--home"
+AWAY_SCORE_CLASS = "sp-c-fixture__number--away"
+_SPAN_CLASSES = {HOME_TEAM_CLASS, AWAY_TEAM_CLASS, STATUS_CLASS, HOME_SCORE_CLASS, AWAY_SCORE_CLASS}
+
+# Only competition headings and fixture articles are built into the tree.
+_SECTIONS = SoupStrainer(["h3", "article"])
+
+
+def safe_int(text: str | None) -> int | None:
+    if text is None:
+        return None
+    try:
+        return int(text)
+    except (ValueError, TypeError):
+        return None
+
+
+def _text(element: Tag | None) -> str | None:
+    return element.get_text(strip=True) if element is not None else None
+
+
+def _team_name(names: List[Tag], team_class: str) -> Tag | None:
+    for name in names:
+        for parent in name.parents:
+            if parent.name == "span" and team_class in (parent.get("class") or ()):
+                return name
+    return None
+
+
+def _parse_fixture(article: Tag, league_name: str) -> Dict | None:
+    """Collect every field of one fixture article in a single walk over its descendants."""
+    spans: Dict[str, Tag] = {}
+    names: List[Tag] = []
+    kickoff = None
+    for element in article.descendants:
+        if not isinstance(element, Tag):
+            continue
+        if kickoff is None and element.name == "time":
+            kickoff = element
+        classes = element.get("class")
+        if not classes:
+            continue
+        if TEAM_NAME_CLASS in classes:
+            names.append(element)
+        if element.name == "span":
+            for cls in classes:
+                if cls in _SPAN_CLASSES and cls not in spans:
+                    spans[cls] = element
+    home = _team_name(names, HOME_TEAM_CLASS) if HOME_TEAM_CLASS in spans else None
+    away = _team_name(names, AWAY_TEAM_CLASS) if AWAY_TEAM_CLASS in spans else None
+    if not home or not away:
+        return None
+    status = _text(spans.get(STATUS_CLASS))
+    return {
+        "league": league_name,
+        "home": home.get_text(strip=True),
+        "away": away.get_text(strip=True),
+        "status": status if status is not None else "upcoming",
+        "home_score": safe_int(_text(spans.get(HOME_SCORE_CLASS))),
+        "away_score": safe_int(_text(spans.get(AWAY_SCORE_CLASS))),
+        "kickoff": kickoff["datetime"] if kickoff and kickoff.has_attr("datetime") else None,
+    }
+
+
+def parse_bbc_fixtures(html: str, backend: str = DEFAULT_BACKEND) -> List[Dict]:
+    """Parse a BBC scores-fixtures page in a single forward pass.
+
+    Elements are visited in document order, so the competition heading is simply
+    the last ``<h3>`` seen before each fixture article.
+    """
+    soup = BeautifulSoup(html, backend, parse_only=_SECTIONS)
+    league_name = "Unknown"
+    fixtures: List[Dict] = []
+    for element in soup.find_all(["h3", "article"]):
+        if element.name == "h3":
+            league_name = element.get_text(strip=True)
+            continue
+        if FIXTURE_CLASS not in (element.get("class") or ()):
+            continue
+        fixture = _parse_fixture(element, league_name)
+        if fixture is not None:
+            fixtures.append(fixture)
+    return fixtures
@@ -1,7 +1,8 @@
 import logging
 import threading
 import time
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
+from typing import Callable, Dict, List
 
 from app.config import settings
 from app.services.match_service import MatchService
@@ -18,6 +19,33 @@ class LiveScoreService:
         self.matches = matches
         self._running = False
         self._thread: threading.Thread | None = None
+        self._subscribers: List[Callable[[date, List[Dict]], None]] = []
+        self._subscribers_lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[date, List[Dict]], None]) -> Callable[[], None]:
+        """Call ``callback(target_date, changed_fixtures)`` whenever a refresh changes stored matches.
+
+        Callbacks run on the refresh thread; UI code should hop threads (e.g. via a Qt signal).
+        Returns a function that removes the subscription.
+        """
+        with self._subscribers_lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._subscribers_lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def _notify(self, target_date: date, changed: List[Dict]) -> None:
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(target_date, changed)
+            except Exception as exc:
+                logger.error("Live update subscriber failed: %s", exc)
 
     def start(self) -> None:
         if self._running:
@@ -37,6 +65,9 @@ class LiveScoreService:
                 self.refresh_window()
             except Exception as exc:
                 logger.error("Background refresh failed: %s", exc)
+            degraded = self.scraper.health_summary()
+            if degraded:
+                logger.warning("Scrape sources degraded: %s", degraded)
             time.sleep(settings.refresh_interval_seconds)
 
     def refresh_today(self) -> None:
@@ -57,35 +88,28 @@ class LiveScoreService:
             except (TypeError, ValueError):
                 days_ahead = 0
         today = date.fromtimestamp(time.time())
-        for offset in range(days_ahead + 1):
-            target_date = today + timedelta(days=offset)
-            self._refresh_date(target_date)
+        end = today + timedelta(days=days_ahead)
+        for target_date, fixtures, error in self.scraper.get_fixtures_range(today, end):
+            if error is not None:
+                logger.warning("Skipping %s due to scrape error: %s", target_date, error)
+                continue
+            self._ingest_fixtures(fixtures, target_date)
 
-    def _refresh_date(self, target_date: date) -> None:
+    def _ingest_fixtures(self, fixtures: list[dict], target_date: date) -> None:
         try:
-            fixtures = self.scraper.get_fixtures(target_date)
+            result = self.matches.bulk_upsert_fixtures(fixtures, match_date=target_date)
         except Exception as exc:
-            logger.warning("Skipping %s due to scrape error: %s", target_date, exc)
+            logger.warning("Skipping %s fixtures due to error: %s", len(fixtures), exc)
             return
-        for item in fixtures:
-            try:
-                league = self.matches.ensure_league(item["league"], tier=1)
-                home = self.matches.ensure_team(item["home"], league)
-                away = self.matches.ensure_team(item["away"], league)
-                kickoff = None
-                if item.get("kickoff"):
-                    kickoff = datetime.fromisoformat(item["kickoff"].replace("Z", "+00:00"))
-                status = item.get("status", "upcoming").lower()
-                if status in {"live", "in progress"}:
-                    status = "live"
-                self.matches.upsert_match(
-                    league=league,
-                    home_team=home,
-                    away_team=away,
-                    kickoff=kickoff,
-                    status=status,
-                    home_score=item.get("home_score"),
-                    away_score=item.get("away_score"),
-                )
-            except Exception as exc:
-                logger.warning("Skipping fixture due to error: %s", exc)
+        logger.debug("Ingested fixtures: %s", result.counts())
+        for event in result.events:
+            logger.info(
+                "%s: %s %s-%s %s",
+                event["kind"],
+                event["home"],
+                event["home_score"],
+                event["away_score"],
+                event["away"],
+            )
+        if result.changed:
+            self._notify(target_date, result.changed)
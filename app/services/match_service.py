@@ -1,51 +1,171 @@
-from datetime import date, datetime
-from typing import List
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import case, func, insert, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import selectinload
 
-from app.database.db import get_session
+from app.database.db import get_read_session, get_session
+from app.models.daily_summary import DailyMatchSummary
 from app.models.league import League
-from app.models.match import Match, MatchStatus
+from app.models.match import Match, MatchStatus, normalize_status
+from app.models.match_event import MatchEvent, detect_events
 from app.models.match_stats import MatchStats
 from app.models.team import Team
-from app.utils.datetime_utils import to_local
+from app.utils.datetime_utils import local_match_date, parse_kickoff, to_local
+from app.utils.identity_map import IdentityMap
+
+logger = logging.getLogger(__name__)
+
+# Stay well below SQLite's bound-parameter limit in IN (...) lookups.
+_LOOKUP_CHUNK = 500
+
+_MATCH_FIELDS = ("league_id", "match_date", "status", "home_score", "away_score", "venue")
+
+
+def _chunks(values: List, size: int = _LOOKUP_CHUNK):
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _match_key(home_id: int, away_id: int, kickoff: datetime | None, match_date: date | None) -> tuple:
+    """Natural key of a match; fixtures without a kickoff are told apart by their day."""
+    return home_id, away_id, kickoff, match_date if kickoff is None else None
+
+
+def _count_summary_change(deltas: Counter, before: Dict | None, after: Dict) -> None:
+    """Record how a match moving from ``before`` to ``after`` shifts the daily summary counts."""
+    old_key = (before["match_date"], before["league_id"], before["status"]) if before is not None else None
+    new_key = (after["match_date"], after["league_id"], after["status"])
+    if old_key == new_key:
+        return
+    if old_key is not None and old_key[0] is not None:
+        deltas[old_key] -= 1
+    if new_key[0] is not None:
+        deltas[new_key] += 1
+
+
+def _apply_summary_deltas(session, deltas: Counter) -> None:
+    """Add ``deltas`` to the daily summary.
+
+    The deltas must come from rows read in the same writer transaction (which holds the
+    SQLite write lock from its first statement), otherwise a concurrent ingest counts the
+    same transition twice.
+    """
+    rows = [
+        {"match_date": match_date, "league_id": league_id, "status": status, "match_count": delta}
+        for (match_date, league_id, status), delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+    table = DailyMatchSummary.__table__
+    stmt = sqlite_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.match_date, table.c.league_id, table.c.status],
+        set_={"match_count": table.c.match_count + stmt.excluded.match_count},
+    )
+    session.execute(stmt, rows)
+    if any(row["match_count"] < 0 for row in rows):
+        session.execute(table.delete().where(table.c.match_count <= 0))
+
+
+@dataclass
+class IngestResult:
+    """Outcome of a bulk upsert.
+
+    ``changed`` holds the inserted and updated fixtures in the scraper dict shape, and
+    ``events`` the match events appended for them.
+    """
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    changed: List[Dict] = field(default_factory=list)
+    events: List[Dict] = field(default_factory=list)
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "skipped": self.skipped,
+            "events": len(self.events),
+        }
+
+
+def _event_rows(match_id: int, before: Dict, after: Dict, now: datetime) -> List[Dict]:
+    return [
+        {
+            "match_id": match_id,
+            "kind": kind,
+            "previous_status": before["status"],
+            "status": after["status"],
+            "home_score": after["home_score"],
+            "away_score": after["away_score"],
+            "created_at": now,
+        }
+        for kind in detect_events(before, after)
+    ]
 
 
 class MatchService:
+    """Reads and writes matches; league and team lookups go through bounded identity maps.
+
+    The maps hold detached, committed rows keyed by name, so resolving a known league or
+    team is a dict lookup. Entries are only published after the inserting transaction
+    commits, so a rollback cannot leave ids behind that were never stored.
+    """
+
+    def __init__(self, identity_map_size: int = 4096):
+        self._leagues = IdentityMap(identity_map_size)
+        self._teams = IdentityMap(identity_map_size)
+
+    def warm_identity_maps(self) -> None:
+        """Load known leagues and teams so the first ingest cycle does not have to."""
+        with get_read_session() as session:
+            leagues = session.execute(select(League).limit(self._leagues.maxsize)).scalars().all()
+            teams = session.execute(select(Team).limit(self._teams.maxsize)).scalars().all()
+        self._leagues.put_many({league.name: league for league in leagues})
+        self._teams.put_many({team.name: team for team in teams})
+
+    def identity_map_stats(self) -> Dict[str, Dict[str, int]]:
+        return {"leagues": self._leagues.stats(), "teams": self._teams.stats()}
+
     def ensure_league(self, name: str, tier: int = 1, session=None) -> League:
-        own_session = session is None
-        ctx = get_session() if own_session else None
-        sess = ctx.__enter__() if ctx else session
-        try:
-            league = sess.execute(select(League).where(League.name == name)).scalar_one_or_none()
-            if not league:
-                league = League(name=name, tier=tier)
-                sess.add(league)
-                sess.flush()
-            sess.refresh(league)
-            sess.expunge(league)
-            return league
-        finally:
-            if ctx:
-                ctx.__exit__(None, None, None)
+        if session is not None:
+            # The caller owns the transaction and may still roll it back, so don't cache.
+            return self._ensure(session, League, name, {"tier": tier})
+        league = self._leagues.get(name)
+        if league is None:
+            with get_session() as own_session:
+                league = self._ensure(own_session, League, name, {"tier": tier})
+            self._leagues.put(name, league)
+        return league
 
     def ensure_team(self, name: str, league: League, session=None) -> Team:
-        own_session = session is None
-        ctx = get_session() if own_session else None
-        sess = ctx.__enter__() if ctx else session
-        try:
-            team = sess.execute(select(Team).where(Team.name == name)).scalar_one_or_none()
-            if not team:
-                team = Team(name=name, league_id=league.id)
-                sess.add(team)
-                sess.flush()
-            sess.refresh(team)
-            sess.expunge(team)
-            return team
-        finally:
-            if ctx:
-                ctx.__exit__(None, None, None)
+        if session is not None:
+            return self._ensure(session, Team, name, {"league_id": league.id})
+        team = self._teams.get(name)
+        if team is None:
+            with get_session() as own_session:
+                team = self._ensure(own_session, Team, name, {"league_id": league.id})
+            self._teams.put(name, team)
+        return team
+
+    def _ensure(self, session, model, name: str, values: Dict):
+        instance = session.execute(select(model).where(model.name == name)).scalar_one_or_none()
+        if not instance:
+            instance = model(name=name, **values)
+            session.add(instance)
+            session.flush()
+        session.refresh(instance)
+        session.expunge(instance)
+        return instance
 
     def upsert_match(
         self,
@@ -57,17 +177,42 @@ class MatchService:
         home_score: int | None,
         away_score: int | None,
         venue: str | None = None,
+        match_date: date | None = None,
     ) -> Match:
+        return self.upsert_match_with_events(
+            league, home_team, away_team, kickoff, status, home_score, away_score, venue, match_date
+        )[0]
+
+    def upsert_match_with_events(
+        self,
+        league: League,
+        home_team: Team,
+        away_team: Team,
+        kickoff: datetime | None,
+        status: str,
+        home_score: int | None,
+        away_score: int | None,
+        venue: str | None = None,
+        match_date: date | None = None,
+    ) -> Tuple[Match, List[Dict]]:
+        """Insert or update one match, returning it with the events the update produced.
+
+        An update that changes nothing is not written at all, so ``updated_at`` only moves
+        on real changes. ``match_date`` dates a fixture whose kickoff is unknown.
+        """
+        after = {"status": status, "home_score": home_score, "away_score": away_score}
+        events: List[Dict] = []
+        if kickoff is not None:
+            match_date = local_match_date(kickoff)
         with get_session() as session:
-            match = (
-                session.execute(
-                    select(Match).where(
-                        Match.home_team_id == home_team.id,
-                        Match.away_team_id == away_team.id,
-                        Match.kickoff_utc == kickoff,
-                    )
-                ).scalar_one_or_none()
+            query = select(Match).where(
+                Match.home_team_id == home_team.id,
+                Match.away_team_id == away_team.id,
+                Match.kickoff_utc == kickoff,
             )
+            if kickoff is None:
+                query = query.where(Match.match_date == match_date)
+            match = session.execute(query).scalar_one_or_none()
             if not match:
                 match = Match(
                     league_id=league.id,
@@ -75,39 +220,215 @@ class MatchService:
                     away_team_id=away_team.id,
                     kickoff_utc=kickoff,
                     kickoff_local=to_local(kickoff) if kickoff else None,
+                    match_date=match_date,
                     venue=venue,
                     status=status,
                     home_score=home_score,
                     away_score=away_score,
                 )
                 session.add(match)
+                _apply_summary_deltas(
+                    session, Counter({(match_date, league.id, status): 1} if match_date else {})
+                )
             else:
-                match.status = status
-                match.home_score = home_score
-                match.away_score = away_score
-                match.venue = venue
-                match.kickoff_utc = kickoff
-                match.kickoff_local = to_local(kickoff) if kickoff else None
+                before = {"status": match.status, "home_score": match.home_score, "away_score": match.away_score}
+                # Like the bulk path, a fixture that lists no venue keeps the one already stored.
+                venue = venue or match.venue
+                if before != after or match.venue != venue or match.match_date != match_date:
+                    events = _event_rows(match.id, before, after, datetime.now(timezone.utc))
+                    deltas: Counter = Counter()
+                    _count_summary_change(
+                        deltas,
+                        {**before, "match_date": match.match_date, "league_id": match.league_id},
+                        {**after, "match_date": match_date, "league_id": match.league_id},
+                    )
+                    _apply_summary_deltas(session, deltas)
+                    match.match_date = match_date
+                    match.status = status
+                    match.home_score = home_score
+                    match.away_score = away_score
+                    match.venue = venue
+                    if events:
+                        session.execute(insert(MatchEvent.__table__), events)
             session.flush()
             session.refresh(match)
             session.expunge(match)
-            return match
+            return match, events
 
-    def list_matches_for_date(self, target_date: date) -> List[Match]:
-        start = datetime.combine(target_date, datetime.min.time())
-        end = datetime.combine(target_date, datetime.max.time())
+    def bulk_upsert_fixtures(self, fixtures: Iterable[Dict], match_date: date | None = None) -> IngestResult:
+        """Store scraped fixtures in one transaction and report what happened to them.
+
+        League and team names are resolved set-based (one lookup and at most one insert per
+        table), existing matches are loaded in one query, and only new or changed matches are
+        written with a single ``INSERT ... ON CONFLICT DO UPDATE``. Status and score changes on
+        existing matches are appended to ``match_events`` and returned with team names attached.
+        ``match_date`` (usually the scraped day) dates fixtures that have no kickoff; a fixture's own
+        ``match_date`` key takes precedence, so one call can carry several scraped days.
+        """
+        result = IngestResult()
+        incoming: Dict[tuple, Dict] = {}
+        for item in fixtures:
+            try:
+                row = {
+                    "league": item["league"],
+                    "tier": item.get("tier") or 1,
+                    "home": item["home"],
+                    "away": item["away"],
+                    "kickoff": parse_kickoff(item.get("kickoff")),
+                    "status": normalize_status(item.get("status")),
+                    "home_score": item.get("home_score"),
+                    "away_score": item.get("away_score"),
+                    "venue": item.get("venue"),
+                }
+            except (KeyError, TypeError, AttributeError) as exc:
+                logger.warning("Skipping malformed fixture %r: %s", item, exc)
+                result.skipped += 1
+                continue
+            kickoff = row["kickoff"]
+            row["match_date"] = local_match_date(kickoff) if kickoff else item.get("match_date", match_date)
+            incoming[(row["home"], row["away"], row["kickoff"], row["match_date"])] = row
+        if not incoming:
+            return result
+
+        new_leagues: Dict[str, League] = {}
+        new_teams: Dict[str, Team] = {}
         with get_session() as session:
-            base_query = (
-                select(Match)
-                .options(selectinload(Match.home_team), selectinload(Match.away_team))
-                .where(Match.kickoff_utc >= start, Match.kickoff_utc <= end)
+            leagues: Dict[str, Dict] = {}
+            for row in incoming.values():
+                leagues.setdefault(row["league"], {"tier": row["tier"]})
+            league_ids = self._resolve_ids(session, League, leagues, self._leagues, new_leagues)
+            teams: Dict[str, Dict] = {}
+            for row in incoming.values():
+                for name in (row["home"], row["away"]):
+                    teams.setdefault(name, {"league_id": league_ids[row["league"]]})
+            team_ids = self._resolve_ids(session, Team, teams, self._teams, new_teams)
+
+            # A match's day follows from its kickoff, so only the incoming days can hold a match to update.
+            existing: Dict[tuple, Dict] = {}
+            days = {row["match_date"] for row in incoming.values()}
+            on_days = Match.match_date.in_(sorted(day for day in days if day is not None))
+            if None in days:
+                on_days = or_(on_days, Match.match_date.is_(None))
+            home_ids = sorted({team_ids[row["home"]] for row in incoming.values()})
+            for chunk in _chunks(home_ids):
+                for match in session.execute(
+                    select(
+                        Match.id,
+                        Match.home_team_id,
+                        Match.away_team_id,
+                        Match.kickoff_utc,
+                        *(getattr(Match, field) for field in _MATCH_FIELDS),
+                    ).where(Match.home_team_id.in_(chunk), on_days)
+                ).mappings():
+                    key = _match_key(
+                        match["home_team_id"], match["away_team_id"], match["kickoff_utc"], match["match_date"]
+                    )
+                    existing[key] = dict(match)
+
+            now = datetime.now(timezone.utc)
+            payload: List[Dict] = []
+            events: List[Dict] = []
+            deltas: Counter = Counter()
+            for (home, away, kickoff, _day), row in incoming.items():
+                home_id, away_id = team_ids[home], team_ids[away]
+                current = existing.get(_match_key(home_id, away_id, kickoff, row["match_date"]))
+                values = {
+                    "league_id": league_ids[row["league"]],
+                    "match_date": row["match_date"],
+                    "status": row["status"],
+                    "home_score": row["home_score"],
+                    "away_score": row["away_score"],
+                    "venue": row["venue"] or (current["venue"] if current else None),
+                }
+                _count_summary_change(deltas, current, values)
+                if current is None:
+                    result.inserted += 1
+                elif all(current[field] == values[field] for field in _MATCH_FIELDS):
+                    result.unchanged += 1
+                    continue
+                else:
+                    result.updated += 1
+                    # ``current`` was read under the write lock, so no other ingest can log this change too.
+                    for event in _event_rows(current["id"], current, values, now):
+                        events.append(event)
+                        result.events.append({**event, "league": row["league"], "home": home, "away": away})
+                result.changed.append(
+                    {
+                        "league": row["league"],
+                        "tier": row["tier"],
+                        "home": home,
+                        "away": away,
+                        "status": row["status"],
+                        "home_score": row["home_score"],
+                        "away_score": row["away_score"],
+                        "kickoff": kickoff.isoformat() + "Z" if kickoff else None,
+                    }
+                )
+                payload.append(
+                    {
+                        "id": current["id"] if current is not None else None,
+                        "home_team_id": home_id,
+                        "away_team_id": away_id,
+                        "kickoff_utc": kickoff,
+                        "kickoff_local": to_local(kickoff) if kickoff else None,
+                        "created_at": now,
+                        "updated_at": now,
+                        **values,
+                    }
+                )
+            if payload:
+                stmt = sqlite_insert(Match.__table__)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Match.__table__.c.id],
+                    set_={field: stmt.excluded[field] for field in (*_MATCH_FIELDS, "updated_at")},
+                )
+                session.execute(stmt, payload)
+            if events:
+                session.execute(insert(MatchEvent.__table__), events)
+            _apply_summary_deltas(session, deltas)
+        self._leagues.put_many(new_leagues)
+        self._teams.put_many(new_teams)
+        logger.debug("Bulk upserted fixtures: %s", result.counts())
+        return result
+
+    def _resolve_ids(
+        self, session, model, wanted: Dict[str, Dict], identity: IdentityMap, resolved: Dict[str, object]
+    ) -> Dict[str, int]:
+        """Map names to ids for a name-keyed table, inserting the missing ones with ``wanted`` values.
+
+        Names not in ``identity`` are loaded (or inserted) in bulk; their detached rows are added
+        to ``resolved`` for the caller to publish once the transaction has committed.
+        """
+        cached = identity.get_many(wanted)
+        ids: Dict[str, int] = {name: instance.id for name, instance in cached.items()}
+        unknown = [name for name in wanted if name not in cached]
+        ids.update(self._load_named(session, model, unknown, resolved))
+        missing = [name for name in unknown if name not in ids]
+        if missing:
+            session.execute(
+                sqlite_insert(model.__table__).on_conflict_do_nothing(index_elements=["name"]),
+                [{"name": name, **wanted[name]} for name in missing],
             )
-            matches = session.execute(base_query).scalars().all()
-            matches += (
+            ids.update(self._load_named(session, model, missing, resolved))
+        return ids
+
+    def _load_named(self, session, model, names: List[str], resolved: Dict[str, object]) -> Dict[str, int]:
+        ids: Dict[str, int] = {}
+        for chunk in _chunks(names):
+            for instance in session.execute(select(model).where(model.name.in_(chunk))).scalars():
+                session.expunge(instance)
+                resolved[instance.name] = instance
+                ids[instance.name] = instance.id
+        return ids
+
+    def list_matches_for_date(self, target_date: date) -> List[Match]:
+        with get_read_session() as session:
+            matches = (
                 session.execute(
                     select(Match)
                     .options(selectinload(Match.home_team), selectinload(Match.away_team))
-                    .where(Match.kickoff_utc.is_(None))
+                    .where(Match.match_date == target_date)
+                    .order_by(Match.kickoff_utc, Match.id)
                 )
                 .scalars()
                 .all()
@@ -116,9 +437,70 @@ class MatchService:
                 session.expunge(match)
             return matches
 
+    def is_date_settled(self, target_date: date, today: date | None = None) -> bool:
+        """True for a past date whose stored matches have all finished, so it needs no more scraping."""
+        if target_date >= (today or date.today()):
+            return False
+        with get_read_session() as session:
+            total, finished = session.execute(
+                select(
+                    func.count(Match.id),
+                    func.coalesce(func.sum(case((Match.status == MatchStatus.FINISHED, 1), else_=0)), 0),
+                ).where(Match.match_date == target_date)
+            ).one()
+        return total > 0 and total == finished
+
+    def fixtures_for_date(self, target_date: date) -> List[Dict]:
+        """Stored matches for a date in the same dict shape the scrapers return."""
+        with get_read_session() as session:
+            matches = (
+                session.execute(
+                    select(Match)
+                    .options(
+                        selectinload(Match.league), selectinload(Match.home_team), selectinload(Match.away_team)
+                    )
+                    .where(Match.match_date == target_date)
+                    .order_by(Match.kickoff_utc, Match.id)
+                )
+                .scalars()
+                .all()
+            )
+            return [
+                {
+                    "league": match.league.name,
+                    "tier": match.league.tier,
+                    "home": match.home_team.name,
+                    "away": match.away_team.name,
+                    "status": match.status,
+                    "home_score": match.home_score,
+                    "away_score": match.away_score,
+                    "kickoff": match.kickoff_utc.isoformat() + "Z" if match.kickoff_utc else None,
+                }
+                for match in matches
+            ]
+
+    def daily_summary(self, start: date, end: date | None = None) -> Dict[str, Dict]:
+        """Match counts for a day (or inclusive date range) from the precomputed summary table.
+
+        Returns ``{"statuses": {status: n}, "leagues": {league name: {status: n}}}``.
+        """
+        with get_read_session() as session:
+            rows = session.execute(
+                select(League.name, DailyMatchSummary.status, func.sum(DailyMatchSummary.match_count))
+                .join(League, League.id == DailyMatchSummary.league_id)
+                .where(DailyMatchSummary.match_date.between(start, end or start))
+                .group_by(League.name, DailyMatchSummary.status)
+            ).all()
+        statuses = {MatchStatus.LIVE: 0, MatchStatus.FINISHED: 0, MatchStatus.UPCOMING: 0}
+        leagues: Dict[str, Dict[str, int]] = {}
+        for league_name, status, count in rows:
+            statuses[status] = statuses.get(status, 0) + count
+            leagues.setdefault(league_name, {})[status] = count
+        return {"statuses": statuses, "leagues": leagues}
+
     def get_match(self, match_id: int) -> Match | None:
         """Return a detached Match with teams eagerly loaded, or None if missing."""
-        with get_session() as session:
+        with get_read_session() as session:
             match = session.get(
                 Match,
                 match_id,
@@ -129,7 +511,7 @@ class MatchService:
             return match
 
     def live_matches(self) -> List[Match]:
-        with get_session() as session:
+        with get_read_session() as session:
             return session.execute(select(Match).where(Match.status == MatchStatus.LIVE)).scalars().all()
 
     def save_stats(
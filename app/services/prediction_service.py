@@ -1,12 +1,17 @@
 import logging
-from typing import Dict, List
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import aliased
 
 from app.config import settings
-from app.database.db import get_session
+from app.database.db import get_read_session, get_session
 from app.models.match import Match
 from app.models.prediction import Prediction
+from app.models.prediction_response import PredictionResponse
+from app.models.team import Team
 
 try:  # pragma: no cover - optional dependency runtime check
     import ollama
@@ -15,6 +20,15 @@ except ImportError:  # pragma: no cover
 
 logger = logging.getLogger(__name__)
 
+# (created_at, id) of the last row on a page; pass it back as ``after`` for the next one.
+PredictionCursor = Tuple[datetime, int]
+
+
+@dataclass
+class PredictionPage:
+    rows: List[Dict]
+    next_cursor: Optional[PredictionCursor] = None
+
 
 class PredictionService:
     def __init__(self) -> None:
@@ -25,9 +39,61 @@ class PredictionService:
         prediction_data = self._run_model(prompt)
         return self._persist_prediction(match, prediction_data)
 
-    def list_predictions(self) -> List[Prediction]:
-        with get_session() as session:
-            return session.execute(select(Prediction).order_by(Prediction.created_at.desc())).scalars().all()
+    def get_raw_response(self, prediction_id: int) -> Optional[str]:
+        """The model's full reply for one prediction, or ``None`` if none was stored."""
+        with get_read_session() as session:
+            response = session.get(PredictionResponse, prediction_id)
+            return response.text if response is not None else None
+
+    def list_prediction_page(
+        self,
+        limit: int = 50,
+        after: Optional[PredictionCursor] = None,
+        match_id: Optional[int] = None,
+        model: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> PredictionPage:
+        """One newest-first page of prediction history, keyed on (created_at, id).
+
+        Rows are plain dicts with only the columns the history list shows (the raw reply is fetched
+        separately with ``get_raw_response``); ``start``/``end`` bound the UTC day the prediction was made, inclusive.
+        """
+        home, away = aliased(Team), aliased(Team)
+        stmt = (
+            select(
+                Prediction.id,
+                Prediction.match_id,
+                Prediction.model_used,
+                Prediction.confidence,
+                Prediction.final_score_home,
+                Prediction.final_score_away,
+                Prediction.created_at,
+                home.name.label("home"),
+                away.name.label("away"),
+            )
+            .join(Match, Match.id == Prediction.match_id)
+            .join(home, home.id == Match.home_team_id)
+            .join(away, away.id == Match.away_team_id)
+            .order_by(Prediction.created_at.desc(), Prediction.id.desc())
+            .limit(limit + 1)
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(Prediction.created_at, Prediction.id) < tuple_(*after))
+        if match_id is not None:
+            stmt = stmt.where(Prediction.match_id == match_id)
+        if model is not None:
+            stmt = stmt.where(Prediction.model_used == model)
+        if start is not None:
+            stmt = stmt.where(Prediction.created_at >= datetime.combine(start, time.min))
+        if end is not None:
+            stmt = stmt.where(Prediction.created_at < datetime.combine(end + timedelta(days=1), time.min))
+        with get_read_session() as session:
+            rows = [dict(row) for row in session.execute(stmt).mappings()]
+        if len(rows) <= limit:
+            return PredictionPage(rows=rows)
+        rows = rows[:limit]
+        return PredictionPage(rows=rows, next_cursor=(rows[-1]["created_at"], rows[-1]["id"]))
 
     def _persist_prediction(self, match: Match, data: Dict) -> Prediction:
         with get_session() as session:
@@ -41,10 +107,14 @@ class PredictionService:
                 second_half_goals=data.get("second_half_goals"),
                 total_corners=data.get("total_corners"),
                 total_cards=data.get("total_cards"),
-                raw_response=data.get("raw_response"),
             )
             session.add(prediction)
             session.flush()
+            raw_response = data.get("raw_response")
+            if raw_response:
+                session.add(
+                    PredictionResponse(prediction_id=prediction.id, body=PredictionResponse.compress(raw_response))
+                )
             session.refresh(prediction)
             session.expunge(prediction)
             return prediction
@@ -1,100 +1,368 @@
+import json
 import logging
-from datetime import date
-from typing import Dict, List
-
-import requests
-from bs4 import BeautifulSoup
+import math
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterator, List, Tuple
 
 from app.config import settings
+from app.models.match import MatchStatus, normalize_status
+from app.services.bbc_parser import parse_bbc_fixtures, safe_int
+from app.services.source_registry import NoFixturesError, SourceRegistry
+from app.utils.circuit_breaker import CircuitOpenError
 from app.utils.caching import ttl_cache
+from app.utils.http_client import HttpClient
+from app.utils.latency import LatencyTracker
 from app.utils.rate_limit import RateLimiter
+from app.utils.response_archive import ArchiveMissError, ResponseArchive
+
+logger = logging.getLogger(__name__)
 
+BBC_HOST = "www.bbc.co.uk"
+ESPN_HOST = "site.api.espn.com"
+ESPN_SCOREBOARD_URL = f"https://{ESPN_HOST}/apis/site/v2/sports/soccer/{{slug}}/scoreboard?dates={{day}}"
 
-def safe_int(text: str | None) -> int | None:
-    if text is None:
-        return None
-    try:
-        return int(text)
-    except (ValueError, TypeError):
-        return None
+# Pyramid tier for each ESPN league slug, matching League.tier. Cups span tiers and map to None.
+ESPN_LEAGUE_TIERS = {
+    "eng.1": 1,
+    "eng.2": 2,
+    "eng.3": 3,
+    "eng.4": 4,
+    "eng.5": 5,
+}
 
-logger = logging.getLogger(__name__)
+# Display names for the default slugs, used when a scoreboard omits its ``leagues`` block.
+ESPN_LEAGUE_NAMES = {
+    "eng.1": "English Premier League",
+    "eng.2": "English League Championship",
+    "eng.3": "English League One",
+    "eng.4": "English League Two",
+    "eng.5": "English National League",
+    "eng.fa": "English FA Cup",
+    "eng.league_cup": "English Carabao Cup",
+}
+
+# The hedge budget adapts to the primary's observed p95, clamped to this floor and the configured budget.
+MIN_HEDGE_BUDGET_SECONDS = 0.5
+MIN_HEDGE_SAMPLES = 10
+
+
+# Cache lifetimes by how likely a date's fixtures are to change.
+LIVE_TTL_SECONDS = 30
+TODAY_TTL_SECONDS = 120
+TODAY_FINISHED_TTL_SECONDS = 15 * 60
+FUTURE_TTL_SECONDS = 60 * 60
+PAST_UNSETTLED_TTL_SECONDS = 60 * 60
+
+
+def is_settled(fixtures: List[Dict]) -> bool:
+    """True when every fixture has finished, i.e. the matchday can no longer change."""
+    return bool(fixtures) and all(normalize_status(f.get("status")) == MatchStatus.FINISHED for f in fixtures)
+
+
+def fixture_ttl(fixtures: List[Dict], _service, target_date: date, today: date | None = None) -> float:
+    """Cache lifetime for a date's fixtures: settled past dates never expire, live days expire fast."""
+    today = today or date.today()
+    settled = is_settled(fixtures)
+    if target_date < today:
+        return math.inf if settled else PAST_UNSETTLED_TTL_SECONDS
+    if target_date > today:
+        return FUTURE_TTL_SECONDS
+    if any(normalize_status(f.get("status")) == MatchStatus.LIVE for f in fixtures):
+        return LIVE_TTL_SECONDS
+    return TODAY_FINISHED_TTL_SECONDS if settled else TODAY_TTL_SECONDS
+
+
+def _all_failed(errors: List[Exception], target_date: date) -> ValueError:
+    """Error for a date no source could serve; ``NoFixturesError`` when every source reported an empty day."""
+    if errors and all(isinstance(exc, NoFixturesError) for exc in errors):
+        return NoFixturesError(f"No source has fixtures for {target_date}")
+    return ValueError("All scrapers failed")
 
 
 class ScraperService:
-    def __init__(self):
-        self.rate_limiter = RateLimiter(1.0)
+    def __init__(self, archive: ResponseArchive | None = None, replay: bool | None = None):
+        if archive is None and settings.response_archive_dir:
+            archive = ResponseArchive(
+                settings.response_archive_dir, max_bytes=settings.response_archive_max_mb * 1024 * 1024
+            )
+        self.archive = archive
+        self.replay = settings.scrape_replay if replay is None else replay
+        self.rate_limiter = RateLimiter(
+            limits={
+                BBC_HOST: (settings.bbc_requests_per_second, settings.bbc_burst),
+                ESPN_HOST: (settings.espn_requests_per_second, settings.espn_burst),
+            }
+        )
+        self.http = HttpClient(
+            timeout=15,
+            pool_maxsize=settings.scrape_connections_per_host,
+            archive=archive,
+            replay=self.replay,
+            rate_limiter=self.rate_limiter,
+        )
+        self.max_workers = settings.scrape_concurrency
         self.primary = settings.scrape_primary.lower()
         self.fallback = settings.scrape_fallback.lower()
+        self.espn_leagues = [slug.strip() for slug in settings.espn_leagues.split(",") if slug.strip()]
+        self.hedge = settings.scrape_hedge
+        self.max_hedge_budget = settings.scrape_hedge_budget_ms / 1000
+        self.latency = LatencyTracker()
+        self.sources = SourceRegistry(self.latency, neutral_errors=(NoFixturesError, ArchiveMissError))
+        self.sources.register("bbc", lambda target_date: self._scrape_bbc(target_date))
+        self.sources.register("espn", lambda target_date: self._scrape_espn(target_date))
+        self._hedge_lock = threading.Lock()
+        self._hedge_workers = 2 * max(1, self.max_workers)
+        self._hedge_pool = ThreadPoolExecutor(max_workers=self._hedge_workers, thread_name_prefix="hedge")
 
-    @ttl_cache(ttl_seconds=120)
+    @ttl_cache(
+        ttl_seconds=fixture_ttl,
+        maxsize=512,
+        error_ttl_seconds=15,
+        persist=lambda _self, target_date: target_date.isoformat(),
+        version=1,
+    )
     def get_fixtures(self, target_date: date) -> List[Dict]:
         """Return fixtures and results for the given date, primary source BBC with ESPN fallback."""
+        if self.hedge:
+            return self._get_fixtures_hedged(target_date)
         order = [self.primary, self.fallback]
+        errors: List[Exception] = []
         for source in order:
             try:
-                if source == "bbc":
-                    return self._scrape_bbc(target_date)
-                if source == "espn":
-                    return self._scrape_espn(target_date)
+                return self._scrape(source, target_date)
+            except CircuitOpenError as exc:
+                logger.debug("Skipping %s: %s", source.upper(), exc)
+                errors.append(exc)
             except Exception as exc:
                 logger.warning("%s scrape failed, trying next: %s", source.upper(), exc)
-        raise ValueError("All scrapers failed")
+                errors.append(exc)
+        raise _all_failed(errors, target_date)
 
-    def _scrape_bbc(self, target_date: date) -> List[Dict]:
-        url = f"https://www.bbc.co.uk/sport/football/scores-fixtures/{target_date.isoformat()}"
-        with self.rate_limiter.wait():
-            response = requests.get(url, timeout=15)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-        fixtures: List[Dict] = []
+    def cached_fixtures(self, target_date: date) -> List[Dict] | None:
+        """Last fetched fixtures for a date, possibly stale, without touching the network."""
+        return ScraperService.get_fixtures.peek(self, target_date)
 
-        for fixture in soup.select("article.gs-o-list-ui__item--flush"):
-            league = fixture.find_previous("h3")
-            league_name = league.get_text(strip=True) if league else "Unknown"
-            home = fixture.select_one("span.sp-c-fixture__team--home .sp-c-fixture__team-name")
-            away = fixture.select_one("span.sp-c-fixture__team--away .sp-c-fixture__team-name")
-            status_el = fixture.select_one("span.sp-c-fixture__status")
-            score_home = fixture.select_one("span.sp-c-fixture__number--home")
-            score_away = fixture.select_one("span.sp-c-fixture__number--away")
-            kickoff = fixture.select_one("time")
-            if not home or not away:
-                continue
-            fixtures.append(
-                {
-                    "league": league_name,
-                    "home": home.get_text(strip=True),
-                    "away": away.get_text(strip=True),
-                    "status": status_el.get_text(strip=True) if status_el else "upcoming",
-                    "home_score": safe_int(score_home.get_text(strip=True) if score_home else None),
-                    "away_score": safe_int(score_away.get_text(strip=True) if score_away else None),
-                    "kickoff": kickoff["datetime"] if kickoff and kickoff.has_attr("datetime") else None,
-                }
+    def _get_fixtures_hedged(self, target_date: date) -> List[Dict]:
+        """Start the fallback if the primary has not answered within the hedge budget.
+
+        The first non-empty result from either source wins; a primary that fails before the
+        budget elapses starts the fallback straight away.
+        """
+        budget = self.hedge_budget()
+        # The budget runs from when the primary starts, not from when it was queued behind other dates.
+        started = threading.Event()
+
+        def run_primary() -> List[Dict]:
+            started.set()
+            return self._scrape(self.primary, target_date)
+
+        primary = self._submit_hedged(run_primary)
+        primary.add_done_callback(lambda _future: started.set())
+        started.wait()
+        done, _ = wait([primary], timeout=budget)
+        if done and primary.exception() is None and primary.result():
+            return primary.result()
+        if not done:
+            logger.info(
+                "%s slower than %.2fs for %s, hedging with %s",
+                self.primary.upper(),
+                budget,
+                target_date,
+                self.fallback.upper(),
             )
+        fallback = self._submit_hedged(self._scrape, self.fallback, target_date)
+        errors: List[Exception] = []
+        for future in as_completed([primary, fallback]):
+            source = self.primary if future is primary else self.fallback
+            try:
+                result = future.result()
+            except CircuitOpenError as exc:
+                logger.debug("Skipping %s: %s", source.upper(), exc)
+                errors.append(exc)
+                continue
+            except Exception as exc:
+                logger.warning("%s scrape failed: %s", source.upper(), exc)
+                errors.append(exc)
+                continue
+            if result:
+                return result
+            errors.append(NoFixturesError(f"{source.upper()} returned no fixtures for {target_date}"))
+        raise _all_failed(errors, target_date)
+
+    def _submit_hedged(self, fn: Callable, *args) -> Future:
+        with self._hedge_lock:
+            return self._hedge_pool.submit(fn, *args)
+
+    def _reserve_hedge_workers(self, callers: int) -> None:
+        """Grow the hedge pool so ``callers`` concurrent fetches each get a primary and a fallback thread."""
+        size = 2 * max(1, callers)
+        with self._hedge_lock:
+            if size <= self._hedge_workers:
+                return
+            retired = self._hedge_pool
+            self._hedge_workers = size
+            self._hedge_pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix="hedge")
+        # Work already queued on the old pool still runs; it just takes no new submissions.
+        retired.shutdown(wait=False)
+
+    def close(self) -> None:
+        """Stop the hedge pool, waiting for running scrapes, and close the HTTP sessions."""
+        with self._hedge_lock:
+            pool = self._hedge_pool
+        pool.shutdown(wait=True, cancel_futures=True)
+        self.http.close()
+
+    def hedge_budget(self) -> float:
+        """Seconds to wait for the primary before hedging, adapted to its observed p95."""
+        if self.latency.count(self.primary) < MIN_HEDGE_SAMPLES:
+            return self.max_hedge_budget
+        p95 = self.latency.percentile(self.primary, 95) or self.max_hedge_budget
+        return min(self.max_hedge_budget, max(MIN_HEDGE_BUDGET_SECONDS, p95))
+
+    def latency_snapshot(self) -> Dict[str, Dict]:
+        return self.latency.snapshot()
+
+    def rate_limit_stats(self) -> Dict[str, Dict]:
+        """Politeness wait times per host, e.g. to tell throttling apart from slow sources."""
+        return self.rate_limiter.stats()
+
+    def health(self) -> Dict[str, Dict]:
+        """Circuit state, last error and latency percentiles per source."""
+        return self.sources.health()
+
+    def health_summary(self) -> str:
+        """Short human-readable note about unhealthy sources, empty when all are closed."""
+        notes = []
+        for name, entry in self.health().items():
+            if entry["state"] == "closed":
+                continue
+            retry = f", retry in {entry['retry_in_seconds']:.0f}s" if entry["retry_in_seconds"] else ""
+            notes.append(f"{name.upper()} {entry['state'].replace('_', '-')}{retry}")
+        return "; ".join(notes)
+
+    def _scrape(self, source: str, target_date: date) -> List[Dict]:
+        return self.sources.fetch(source, target_date)
+
+    def get_fixtures_range(
+        self, start: date, end: date
+    ) -> Iterator[Tuple[date, List[Dict] | None, Exception | None]]:
+        """Fetch every date from ``start`` to ``end`` (inclusive) concurrently.
+
+        Yields ``(date, fixtures, error)`` as each date completes, so callers can ingest
+        results without waiting for the slowest day. Exactly one of ``fixtures`` and
+        ``error`` is set. Per-host parallelism is bounded by the HTTP client and every
+        request still goes through the rate limiter.
+        """
+        if end < start:
+            return
+        dates = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+        yield from self.get_fixtures_for_dates(dates)
+
+    def get_fixtures_for_dates(
+        self, dates: List[date], max_workers: int | None = None
+    ) -> Iterator[Tuple[date, List[Dict] | None, Exception | None]]:
+        """Like ``get_fixtures_range`` for an arbitrary list of dates and worker count.
+
+        Dates not yet started are cancelled if the caller stops iterating early.
+        """
+        if not dates:
+            return
+        workers = max(1, min(max_workers or self.max_workers, len(dates)))
+        if self.hedge:
+            self._reserve_hedge_workers(workers)
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fixtures")
+        try:
+            futures = {pool.submit(self.get_fixtures, target_date): target_date for target_date in dates}
+            for future in as_completed(futures):
+                target_date = futures[future]
+                try:
+                    yield target_date, future.result(), None
+                except Exception as exc:
+                    yield target_date, None, exc
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _scrape_bbc(self, target_date: date) -> List[Dict]:
+        url = f"https://{BBC_HOST}/sport/football/scores-fixtures/{target_date.isoformat()}"
+        return self.http.fetch(url, lambda text: self._parse_bbc(text, target_date, url), source="bbc")
+
+    def _parse_bbc(self, text: str, target_date: date, url: str) -> List[Dict]:
+        fixtures = parse_bbc_fixtures(text)
         if not fixtures:
-            raise ValueError(f"BBC returned no fixtures for {target_date} ({url})")
+            raise NoFixturesError(f"BBC returned no fixtures for {target_date} ({url})")
         return fixtures
 
     def _scrape_espn(self, target_date: date) -> List[Dict]:
-        url = f"https://site.api.espn.com/apis/site/v2/sports/soccer/eng.1/scoreboard?dates={target_date.strftime('%Y%m%d')}"
-        with self.rate_limiter.wait():
-            response = requests.get(url, timeout=15)
-        response.raise_for_status()
-        data = response.json()
+        """Fan out over every configured ESPN league and merge the scoreboards.
+
+        Fixtures listed by more than one feed (e.g. a cup tie also on a league board) are
+        de-duplicated by ``(home, away, kickoff)``. A league that failed makes the whole day a
+        retryable ``ValueError``, so a partial scoreboard is never cached as the day's fixtures;
+        ``NoFixturesError`` means every league answered with an empty board. In replay mode,
+        leagues missing from the archive are skipped when others were recorded.
+        """
+        fixtures: List[Dict] = []
+        seen: set = set()
+        errors: List[Exception] = []
+        with ThreadPoolExecutor(max_workers=max(1, len(self.espn_leagues)), thread_name_prefix="espn") as pool:
+            results = pool.map(lambda slug: self._try_espn_league(target_date, slug), self.espn_leagues)
+            for league_fixtures, error in results:
+                if error is not None:
+                    errors.append(error)
+                    continue
+                for fixture in league_fixtures:
+                    key = (fixture["home"], fixture["away"], fixture["kickoff"])
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    fixtures.append(fixture)
+        failed = [error for error in errors if not isinstance(error, ArchiveMissError)]
+        if failed:
+            raise ValueError(
+                f"ESPN failed for {len(failed)} of {len(self.espn_leagues)} leagues on {target_date}: {failed[0]}"
+            )
+        if not fixtures:
+            message = f"ESPN returned no fixtures for {target_date} across {len(self.espn_leagues)} leagues"
+            if errors:
+                raise ArchiveMissError(f"{message} ({len(errors)} not archived)")
+            raise NoFixturesError(message)
+        return fixtures
+
+    def _try_espn_league(self, target_date: date, slug: str) -> Tuple[List[Dict], Exception | None]:
+        try:
+            return self._scrape_espn_league(target_date, slug), None
+        except ArchiveMissError as exc:
+            logger.debug("ESPN %s not archived for %s: %s", slug, target_date, exc)
+            return [], exc
+        except Exception as exc:
+            logger.warning("ESPN %s scrape failed for %s: %s", slug, target_date, exc)
+            return [], exc
+
+    def _scrape_espn_league(self, target_date: date, slug: str) -> List[Dict]:
+        url = ESPN_SCOREBOARD_URL.format(slug=slug, day=target_date.strftime("%Y%m%d"))
+        return self.http.fetch(url, lambda text: self._parse_espn(text, slug), source="espn")
+
+    def _parse_espn(self, text: str, slug: str) -> List[Dict]:
+        data = json.loads(text)
         fixtures: List[Dict] = []
         events = data.get("events", [])
+        tier = ESPN_LEAGUE_TIERS.get(slug)
+        # The scoreboard names its league once at the top level; competitions carry no league block.
+        leagues = data.get("leagues") or [{}]
+        league_name = leagues[0].get("name") or ESPN_LEAGUE_NAMES.get(slug, f"ESPN {slug}")
         for event in events:
             competitions = event.get("competitions", [])
             if not competitions:
                 continue
             comp = competitions[0]
             competitors = {c["homeAway"]: c for c in comp.get("competitors", [])}
-            status = event.get("status", {}).get("type", {}).get("name", "upcoming").lower()
-            if status == "in progress":
-                status = "live"
+            status = normalize_status(event.get("status", {}).get("type", {}).get("name"))
             fixtures.append(
                 {
-                    "league": comp.get("league", {}).get("name", "ESPN England"),
+                    "league": league_name,
+                    "tier": tier,
                     "home": competitors.get("home", {}).get("team", {}).get("displayName"),
                     "away": competitors.get("away", {}).get("team", {}).get("displayName"),
                     "status": status,
@@ -104,6 +372,5 @@ class ScraperService:
                 }
             )
         if not fixtures:
-            logger.debug("ESPN response payload keys: %s", list(data.keys()))
-            raise ValueError(f"ESPN returned no fixtures for {target_date} ({url}) - events: {len(events)}")
+            logger.debug("ESPN %s payload keys: %s (events: %s)", slug, list(data.keys()), len(events))
         return fixtures
@@ -0,0 +1,79 @@
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, List, Tuple, Type
+
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.utils.latency import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+
+class NoFixturesError(ValueError):
+    """The source answered but listed no fixtures; this does not count against its health."""
+
+
+@dataclass
+class ScrapeSource:
+    name: str
+    fetch: Callable[[date], List[Dict]]
+    breaker: CircuitBreaker
+
+
+class SourceRegistry:
+    """Named scrape sources, each guarded by its own circuit breaker.
+
+    Errors listed in ``neutral_errors`` mean the source itself is fine (e.g. a quiet day) and
+    are re-raised without counting as a failure.
+    """
+
+    def __init__(
+        self,
+        latency: LatencyTracker | None = None,
+        neutral_errors: Tuple[Type[BaseException], ...] = (NoFixturesError,),
+        **breaker_options,
+    ):
+        self.latency = latency or LatencyTracker()
+        self.neutral_errors = neutral_errors
+        self._breaker_options = breaker_options
+        self._sources: Dict[str, ScrapeSource] = {}
+
+    def register(self, name: str, fetch: Callable[[date], List[Dict]]) -> ScrapeSource:
+        source = ScrapeSource(name=name, fetch=fetch, breaker=CircuitBreaker(name, **self._breaker_options))
+        self._sources[name] = source
+        return source
+
+    def get(self, name: str) -> ScrapeSource:
+        try:
+            return self._sources[name]
+        except KeyError:
+            raise ValueError(f"Unknown scrape source: {name}") from None
+
+    def fetch(self, name: str, target_date: date) -> List[Dict]:
+        source = self.get(name)
+        if not source.breaker.allow():
+            retry_in = source.breaker.snapshot()["retry_in_seconds"]
+            raise CircuitOpenError(f"{name.upper()} circuit open, retry in {retry_in:.0f}s")
+        started = time.perf_counter()
+        try:
+            fixtures = source.fetch(target_date)
+        except self.neutral_errors:
+            source.breaker.record_success()
+            raise
+        except Exception as exc:
+            source.breaker.record_failure(exc)
+            raise
+        source.breaker.record_success()
+        self.latency.record(name, time.perf_counter() - started)
+        return fixtures
+
+    def health(self) -> Dict[str, Dict]:
+        """Breaker state plus latency percentiles for every registered source."""
+        latency = self.latency.snapshot()
+        snapshot: Dict[str, Dict] = {}
+        for name, source in self._sources.items():
+            entry = source.breaker.snapshot()
+            entry.update(latency.get(name, {"samples": 0, "p50": None, "p95": None}))
+            snapshot[name] = entry
+        return snapshot
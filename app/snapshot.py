@@ -0,0 +1,55 @@
+"""Export the match database to a columnar snapshot, or rebuild a fresh database from one.
+
+Usage:
+    python -m app.snapshot export PATH [--chunk-rows N]
+    python -m app.snapshot import PATH [--database URL]
+
+``import`` needs an empty database; by default it targets ``DATABASE_URL``.
+"""
+
+import argparse
+import sys
+import time
+from typing import List
+
+from app.config import configure_logging
+from app.database.db import create_storage_engine, engine
+from app.database.migrations import run_migrations
+from app.database.snapshot import DEFAULT_CHUNK_ROWS, SnapshotError, export_snapshot, import_snapshot
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.snapshot", description="Columnar database snapshots.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="write a snapshot of the current database")
+    export.add_argument("path")
+    export.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="rows per column chunk")
+    restore = commands.add_parser("import", help="load a snapshot into an empty database")
+    restore.add_argument("path")
+    restore.add_argument("--database", help="SQLAlchemy URL of the target database (default: DATABASE_URL)")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = parse_args(argv)
+    configure_logging()
+    started = time.perf_counter()
+    try:
+        if args.command == "export":
+            run_migrations()
+            counts = export_snapshot(args.path, chunk_rows=args.chunk_rows)
+        else:
+            target = create_storage_engine(args.database) if args.database else engine
+            counts = import_snapshot(args.path, bind=target)
+    except SnapshotError as exc:
+        print(f"Snapshot {args.command} failed: {exc}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+    rows = sum(counts.values())
+    rate = rows / elapsed if elapsed else 0.0
+    print(f"{args.command.capitalize()}ed {rows} rows in {elapsed:.2f}s ({rate:.0f} rows/s): {counts}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,10 @@
 import logging
+import threading
+from collections import Counter
 from datetime import date, timedelta
 from typing import List, Optional
 
-from PySide6.QtCore import QDate
+from PySide6.QtCore import QDate, QObject, Signal
 from PySide6.QtWidgets import (
     QFrame,
     QHBoxLayout,
@@ -18,15 +20,44 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from app.models.match import normalize_status
 from app.services.live_score_service import LiveScoreService
 from app.services.match_service import MatchService
 from app.services.prediction_service import PredictionService
 from app.services.scraper_service import ScraperService
-from app.database.db import get_session
 from app.ui.pages.home import HomePage
 from app.ui.pages.match_detail import MatchDetailPage
 from app.ui.pages.predictions import PredictionsPage
 from app.ui.pages.settings import SettingsPage
+from app.utils.datetime_utils import parse_kickoff
+
+
+def _fixture_signature(rows: list[dict]) -> Counter:
+    """What the fixture cards show, in one shape whether ``rows`` came from a scraper or from SQLite."""
+    return Counter(
+        (
+            row.get("home"),
+            row.get("away"),
+            normalize_status(row.get("status")),
+            row.get("home_score"),
+            row.get("away_score"),
+            parse_kickoff(row.get("kickoff")),
+        )
+        for row in rows
+    )
+
+
+class _RevalidationSignals(QObject):
+    """Carries background revalidation results back onto the Qt thread."""
+
+    finished = Signal(object, object)
+    failed = Signal(object, str)
+
+
+class _LiveUpdateSignals(QObject):
+    """Carries fixtures changed by the live refresh thread onto the Qt thread."""
+
+    changed = Signal(object, object)
 
 
 class MainWindow(QMainWindow):
@@ -45,6 +76,12 @@ class MainWindow(QMainWindow):
         self.scraper_service = scraper_service
         self.live_service = live_service
         self.current_date = date.today()
+        self._revalidation = _RevalidationSignals()
+        self._revalidation.finished.connect(self._on_revalidated)
+        self._revalidation.failed.connect(self._on_revalidation_failed)
+        self._live_updates = _LiveUpdateSignals()
+        self._live_updates.changed.connect(self._on_live_changes)
+        self.live_service.subscribe(self._live_updates.changed.emit)
 
         self.date_picker = QDateEdit(QDate.currentDate())
         self.date_picker.setCalendarPopup(True)
@@ -180,32 +217,85 @@ class MainWindow(QMainWindow):
         self.stack.setCurrentIndex(index)
 
     def refresh_matches(self, target_date: date) -> list[dict]:
-        fixtures = self.scraper_service.get_fixtures(target_date)
-        rows = self._ingest_fixtures(fixtures)
+        if self.match_service.is_date_settled(target_date):
+            # Finished matchdays cannot change, so serve them from the local DB without scraping.
+            rows = self.match_service.fixtures_for_date(target_date)
+        else:
+            fixtures = self.scraper_service.get_fixtures(target_date)
+            rows = self._ingest_fixtures(fixtures, target_date)
+        self._render_rows(rows, target_date)
+        return rows
+
+    def show_date(self, target_date: date) -> None:
+        """Draw the last known fixtures for a date immediately, then revalidate in the background."""
+        self.current_date = target_date
+        self.stack.setCurrentWidget(self.home_page)
+        self.sidebar.setCurrentRow(0)
+        if self.match_service.is_date_settled(target_date):
+            self._render_rows(self.match_service.fixtures_for_date(target_date), target_date)
+            return
+        stale = self.scraper_service.cached_fixtures(target_date)
+        if stale is None:
+            stale = self.match_service.fixtures_for_date(target_date) or None
+        if stale is not None:
+            self._render_rows(stale, target_date, status="Refreshing")
+        else:
+            self.home_page.show_empty_state(target_date, "Fetching fixtures…")
+            self.predictions_page.reload_matches(target_date)
+            self._set_last_updated(f"Fetching · {target_date.strftime('%b %d')}")
+        self._revalidate(target_date)
+
+    def _revalidate(self, target_date: date) -> None:
+        def work() -> None:
+            try:
+                rows = self._ingest_fixtures(self.scraper_service.get_fixtures(target_date), target_date)
+            except Exception as exc:
+                self._revalidation.failed.emit(target_date, str(exc))
+                return
+            self._revalidation.finished.emit(target_date, rows)
+
+        threading.Thread(target=work, name=f"revalidate-{target_date}", daemon=True).start()
+
+    def _on_revalidated(self, target_date: date, rows: list) -> None:
+        if target_date != self.current_date:
+            return
+        if _fixture_signature(rows) != _fixture_signature(self.home_page.rows):
+            self._render_rows(rows, target_date)
+        else:
+            self._set_last_updated(f"Synced {len(rows)} fixtures · {target_date.strftime('%b %d')}")
+
+    def _on_revalidation_failed(self, target_date: date, reason: str) -> None:
+        if target_date != self.current_date:
+            return
+        logging.getLogger(__name__).error("Revalidation failed for %s: %s", target_date, reason)
+        if not self.home_page.rows:
+            self.home_page.show_empty_state(target_date, reason)
+        self._set_last_updated(f"Sync failed · {target_date.strftime('%b %d')}")
+
+    def _on_live_changes(self, target_date: date, changed: list) -> None:
+        if target_date != self.current_date:
+            return
+        self.home_page.apply_updates(changed)
+        self._set_last_updated(f"Live · {len(changed)} updated · {target_date.strftime('%b %d')}")
+
+    def _render_rows(self, rows: list[dict], target_date: date, status: str = "Synced") -> None:
         self.current_date = target_date
         self.home_page.load_matches(rows, target_date)
         self.predictions_page.reload_matches(target_date)
-        self.last_updated.setText(f"Synced {len(rows)} fixtures · {target_date.strftime('%b %d')}")
-        return rows
+        self._set_last_updated(f"{status} {len(rows)} fixtures · {target_date.strftime('%b %d')}")
 
-    def _ingest_fixtures(self, fixtures: list[dict]) -> list[dict]:
-        rows: list[dict] = []
-        with get_session() as session:
-            for item in fixtures:
-                league = self.match_service.ensure_league(item["league"], tier=1, session=session)
-                home = self.match_service.ensure_team(item["home"], league, session=session)
-                away = self.match_service.ensure_team(item["away"], league, session=session)
-                self.match_service.upsert_match(
-                    league=league,
-                    home_team=home,
-                    away_team=away,
-                    kickoff=None,
-                    status=item.get("status", "upcoming"),
-                    home_score=item.get("home_score"),
-                    away_score=item.get("away_score"),
-                )
-                rows.append(item)
-        return rows
+    def _set_last_updated(self, text: str) -> None:
+        degraded = self.scraper_service.health_summary()
+        self.last_updated.setText(f"{text} · {degraded}" if degraded else text)
+        lines = []
+        for name, entry in self.scraper_service.health().items():
+            p95 = f"{entry['p95']:.1f}s" if entry["p95"] is not None else "n/a"
+            lines.append(f"{name.upper()}: {entry['state'].replace('_', '-')} · p95 {p95}")
+        self.last_updated.setToolTip("\n".join(lines))
+
+    def _ingest_fixtures(self, fixtures: list[dict], target_date: date) -> list[dict]:
+        self.match_service.bulk_upsert_fixtures(fixtures, match_date=target_date)
+        return list(fixtures)
 
     def _safe_refresh(self):
         qdate = self.date_picker.date()
@@ -219,10 +309,10 @@ class MainWindow(QMainWindow):
             if self.stack.currentWidget() is self.home_page:
                 self.home_page.show_empty_state(selected_date, str(exc))
                 self.predictions_page.reload_matches(selected_date)
-            self.last_updated.setText(f"Sync failed · {selected_date.strftime('%b %d')}")
+            self._set_last_updated(f"Sync failed · {selected_date.strftime('%b %d')}")
 
     def _on_date_change(self, target: QDate) -> None:
-        self._safe_refresh()
+        self.show_date(target.toPython() if hasattr(target, "toPython") else target.toPyDate())
 
     def _sync_range(self, days_ahead: int) -> None:
         """Sync fixtures for today and the requested horizon, persisting to the local DB."""
@@ -234,20 +324,23 @@ class MainWindow(QMainWindow):
         end_date = today + timedelta(days=days_ahead)
         failed_dates: List[date] = []
         today_rows: Optional[List[dict]] = None
-        for offset in range(days_ahead + 1):
-            target_date = today + timedelta(days=offset)
+        for target_date, fixtures, error in self.scraper_service.get_fixtures_range(today, end_date):
+            if error is not None:
+                logging.getLogger(__name__).error("Sync failed for %s: %s", target_date.isoformat(), error)
+                failed_dates.append(target_date)
+                continue
             try:
-                fixtures = self.scraper_service.get_fixtures(target_date)
-                rows = self._ingest_fixtures(fixtures)
-                aggregated += len(rows)
-                if offset == 0:
-                    today_rows = rows
-                if target_date == current_date:
-                    window_rows = rows
+                rows = self._ingest_fixtures(fixtures, target_date)
             except Exception as exc:
                 logging.getLogger(__name__).error("Sync failed for %s: %s", target_date.isoformat(), exc)
                 failed_dates.append(target_date)
                 continue
+            aggregated += len(rows)
+            if target_date == today:
+                today_rows = rows
+            if target_date == current_date:
+                window_rows = rows
+        failed_dates.sort()
         if window_rows is not None:
             self.current_date = current_date
             self.home_page.load_matches(window_rows, current_date)
@@ -258,10 +351,10 @@ class MainWindow(QMainWindow):
             self.home_page.load_matches(today_rows, today)
             self.predictions_page.reload_matches(today)
         if not failed_dates:
-            self.last_updated.setText(f"Synced {aggregated} fixtures · through {end_date.strftime('%b %d')}")
+            self._set_last_updated(f"Synced {aggregated} fixtures · through {end_date.strftime('%b %d')}")
         else:
             failed_str = ", ".join(d.strftime("%b %d") for d in failed_dates)
-            self.last_updated.setText(
+            self._set_last_updated(
                 f"Synced {aggregated} fixtures · through {end_date.strftime('%b %d')} (failed: {failed_str})"
             )
 
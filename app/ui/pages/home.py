@@ -1,4 +1,5 @@
-from typing import List, Optional
+import logging
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 import matplotlib
@@ -18,9 +19,12 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from app.models.match import normalize_status
 from app.services.match_service import MatchService
 from app.services.prediction_service import PredictionService
 
+logger = logging.getLogger(__name__)
+
 
 class HomePage(QWidget):
     match_selected = Signal(dict)
@@ -30,6 +34,8 @@ class HomePage(QWidget):
         self.match_service = match_service
         self.prediction_service = prediction_service
         self.rows: List[dict] = []
+        self._cards: Dict[Tuple, QFrame] = {}
+        self._target_date = None
 
         self.status_label = QLabel("Today's fixtures")
         self.status_label.setStyleSheet("font-size: 20px; font-weight: 800;")
@@ -105,19 +111,50 @@ class HomePage(QWidget):
         self.setLayout(layout)
 
     def load_matches(self, rows: List[dict], target_date) -> None:
-        self.rows = rows
+        # ``rows`` may be a cached scraper result shared with background threads; patch a private copy.
+        self.rows = [dict(row) for row in rows]
+        self._target_date = target_date
         self._clear_cards()
-        if not rows:
+        if not self.rows:
             self._show_empty_message("No fixtures available for this date.")
-        for idx, match in enumerate(rows):
-            card = self._build_match_card(match)
-            self.cards_layout.addWidget(card, idx // 2, idx % 2)
-        self.status_label.setText(f"Loaded {len(rows)} fixtures")
+        for match in self.rows:
+            self._add_card(match)
+        self.status_label.setText(f"Loaded {len(self.rows)} fixtures")
         self.sub_status.setText(f"Viewing fixtures for {target_date.strftime('%b %d, %Y')}")
-        status_counts = self._count_statuses(rows)
+        self._refresh_summary()
+
+    def apply_updates(self, changes: List[dict]) -> None:
+        """Patch the cards of changed fixtures in place and refresh the metrics, without a rebuild."""
+        if not self.rows:
+            self._clear_cards()
+        for change in changes:
+            card = self._cards.get(self._row_key(change))
+            if card is None:
+                self.rows.append(dict(change))
+                self._add_card(self.rows[-1])
+                continue
+            index = self.rows.index(card.match)
+            self.rows[index] = {**card.match, **change}
+            card.match = self.rows[index]
+            card.status_label.setText(self._format_status(card.match))
+            card.score_label.setText(self._format_score(card.match))
+        self.status_label.setText(f"Loaded {len(self.rows)} fixtures")
+        self._refresh_summary()
+
+    def _refresh_summary(self) -> None:
+        status_counts = self._summary_counts() or self._count_statuses(self.rows)
         self._render_chart(status_counts)
         self._update_metrics(status_counts)
 
+    def _row_key(self, match: dict) -> Tuple:
+        return match.get("home"), match.get("away")
+
+    def _add_card(self, match: dict) -> None:
+        idx = len(self._cards)
+        card = self._build_match_card(match)
+        self.cards_layout.addWidget(card, idx // 2, idx % 2)
+        self._cards[self._row_key(match)] = card
+
     def _render_chart(self, status_counts: dict) -> None:
         self.figure.clear()
         ax = self.figure.add_subplot(111)
@@ -156,17 +193,26 @@ class HomePage(QWidget):
         for key, label in self.metric_labels.items():
             label.setText(str(status_counts.get(key, 0)))
 
+    def _summary_counts(self) -> dict:
+        """Status counts for the viewed day from the stored summary; empty if nothing is stored yet."""
+        if self._target_date is None:
+            return {}
+        try:
+            statuses = self.match_service.daily_summary(self._target_date)["statuses"]
+        except Exception as exc:  # pragma: no cover - UI fallback
+            logger.warning("Daily summary unavailable for %s: %s", self._target_date, exc)
+            return {}
+        status_counts = {key: statuses.get(key, 0) for key in ("live", "finished", "upcoming")}
+        return status_counts if any(status_counts.values()) else {}
+
     def _count_statuses(self, rows: List[dict]) -> dict:
         status_counts = {"live": 0, "finished": 0, "upcoming": 0}
         for m in rows:
-            status = m.get("status", "upcoming").lower()
-            if status not in status_counts:
-                status_counts["upcoming"] += 1
-                continue
-            status_counts[status] += 1
+            status_counts[normalize_status(m.get("status"))] += 1
         return status_counts
 
     def _clear_cards(self) -> None:
+        self._cards = {}
         while self.cards_layout.count():
             item = self.cards_layout.takeAt(0)
             widget = item.widget()
@@ -186,6 +232,7 @@ class HomePage(QWidget):
 
     def show_empty_state(self, target_date, reason: Optional[str] = None) -> None:
         self.rows = []
+        self._target_date = target_date
         self._clear_cards()
         detail = reason or "No data returned by providers."
         self._show_empty_message(detail)
@@ -197,6 +244,7 @@ class HomePage(QWidget):
     def _build_match_card(self, match: dict) -> QFrame:
         card = QFrame()
         card.setObjectName("panel")
+        card.match = match
         layout = QVBoxLayout()
         layout.setSpacing(8)
 
@@ -208,7 +256,7 @@ class HomePage(QWidget):
         status_layout = QHBoxLayout()
         status_layout.setContentsMargins(10, 6, 10, 6)
         status_layout.setSpacing(6)
-        status_label = QLabel(match.get("status", "upcoming").title())
+        status_label = QLabel(self._format_status(match))
         status_layout.addWidget(status_label)
         status_chip.setLayout(status_layout)
         header.addWidget(league_label)
@@ -238,18 +286,24 @@ class HomePage(QWidget):
         meta_row.addStretch()
         open_button = QPushButton("Open match")
         open_button.setObjectName("ghost")
-        open_button.clicked.connect(lambda _=None, m=match: self._emit_match_selection(m))
+        open_button.clicked.connect(lambda _=None, c=card: self._emit_match_selection(c.match))
         meta_row.addWidget(open_button)
 
         layout.addLayout(header)
         layout.addLayout(teams_row)
         layout.addLayout(meta_row)
         card.setLayout(layout)
+        card.status_label = status_label
+        card.score_label = score
         return card
 
     def _emit_match_selection(self, match: dict) -> None:
         self.match_selected.emit(match)
 
+    def _format_status(self, match: dict) -> str:
+        # Scraped rows carry provider text ("FT", "STATUS_FULL_TIME"); show the one normalized name.
+        return normalize_status(match.get("status")).title()
+
     def _format_score(self, match: dict) -> str:
         if match.get("home_score") is None or match.get("away_score") is None:
             return "–"
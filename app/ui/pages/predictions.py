@@ -1,25 +1,119 @@
 from datetime import date
+from typing import Dict, List, Optional
 
+import matplotlib
+
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
 from PySide6.QtWidgets import (
+    QAbstractItemView,
     QComboBox,
     QFrame,
     QHBoxLayout,
+    QHeaderView,
     QLabel,
-    QListWidget,
+    QListView,
+    QPlainTextEdit,
     QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
     QVBoxLayout,
     QWidget,
 )
 
-from app.services.prediction_service import PredictionService
+from app.services.analytics_service import PredictionAnalyticsService, PredictionColumns
+from app.services.prediction_service import PredictionCursor, PredictionService
 from app.services.match_service import MatchService
 
+_GROUPINGS = {
+    "By model": ("model",),
+    "By model & league": ("model", "league"),
+    "By model & month": ("model", "month"),
+    "By model, league & month": ("model", "league", "month"),
+}
+_METRIC_COLUMNS = (
+    ("Predictions", "predictions", "{:d}"),
+    ("Exact score", "exact_score_rate", "{:.1%}"),
+    ("Outcome", "outcome_accuracy", "{:.1%}"),
+    ("Goal MAE", "goal_mae", "{:.2f}"),
+    ("Brier", "brier", "{:.3f}"),
+    ("Log loss", "log_loss", "{:.3f}"),
+)
+
+
+class PredictionListModel(QAbstractListModel):
+    """Prediction history that pulls keyset pages from the service as the view scrolls."""
+
+    def __init__(self, prediction_service: PredictionService, page_size: int = 50, parent=None):
+        super().__init__(parent)
+        self.prediction_service = prediction_service
+        self.page_size = page_size
+        self._filters: Dict = {}
+        self._rows: List[Dict] = []
+        self._cursor: Optional[PredictionCursor] = None
+        self._exhausted = False
+
+    def set_filters(self, **filters) -> None:
+        """Filter by ``match_id``, ``model``, ``start`` or ``end`` (see ``list_prediction_page``)."""
+        self._filters = {key: value for key, value in filters.items() if value is not None}
+        self.reload()
+
+    def reload(self) -> None:
+        self.beginResetModel()
+        self._rows = []
+        self._cursor = None
+        self._exhausted = False
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        row = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return (
+                f"{row['home']} vs {row['away']} | "
+                f"{row['final_score_home']}-{row['final_score_away']} "
+                f"confidence {row['confidence'] or 'N/A'} · {row['model_used']}"
+            )
+        if role == Qt.UserRole:
+            return row
+        return None
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if not self.canFetchMore(parent):
+            return
+        page = self.prediction_service.list_prediction_page(
+            limit=self.page_size, after=self._cursor, **self._filters
+        )
+        self._cursor = page.next_cursor
+        self._exhausted = page.next_cursor is None
+        if page.rows:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(page.rows) - 1)
+            self._rows.extend(page.rows)
+            self.endInsertRows()
+
 
 class PredictionsPage(QWidget):
-    def __init__(self, prediction_service: PredictionService, match_service: MatchService):
+    def __init__(
+        self,
+        prediction_service: PredictionService,
+        match_service: MatchService,
+        analytics_service: PredictionAnalyticsService | None = None,
+    ):
         super().__init__()
         self.prediction_service = prediction_service
         self.match_service = match_service
+        self.analytics_service = analytics_service or PredictionAnalyticsService()
+        self._accuracy_columns = PredictionColumns.empty()
 
         self.header = QLabel("AI Predictions")
         self.header.setStyleSheet("font-size: 20px; font-weight: 800;")
@@ -32,7 +126,15 @@ class PredictionsPage(QWidget):
         self.match_select = QComboBox()
         self.generate_button = QPushButton("Generate with AI")
         self.generate_button.clicked.connect(self.generate_prediction)
-        self.list_widget = QListWidget()
+        self.history_model = PredictionListModel(prediction_service, parent=self)
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setModel(self.history_model)
+        self.list_view.selectionModel().currentChanged.connect(self.show_prediction_detail)
+        self.raw_response_view = QPlainTextEdit()
+        self.raw_response_view.setReadOnly(True)
+        self.raw_response_view.setPlaceholderText("Select a prediction to read the model's full reply.")
+        self.raw_response_view.setMaximumHeight(140)
         self.status_label = QLabel("Pick a match to begin.")
         self.status_label.setObjectName("muted")
 
@@ -58,7 +160,8 @@ class PredictionsPage(QWidget):
         list_card.setObjectName("panel")
         list_layout = QVBoxLayout()
         list_layout.addWidget(QLabel("Saved Predictions"))
-        list_layout.addWidget(self.list_widget)
+        list_layout.addWidget(self.list_view)
+        list_layout.addWidget(self.raw_response_view)
         list_card.setLayout(list_layout)
 
         row = QHBoxLayout()
@@ -66,14 +169,45 @@ class PredictionsPage(QWidget):
         row.addWidget(form_card, 1)
         row.addWidget(list_card, 1)
 
+        self.grouping_select = QComboBox()
+        self.grouping_select.addItems(list(_GROUPINGS))
+        self.grouping_select.currentTextChanged.connect(self._render_accuracy)
+        self.accuracy_table = QTableWidget()
+        self.accuracy_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.accuracy_table.setAlternatingRowColors(True)
+        self.accuracy_table.verticalHeader().setVisible(False)
+        self.accuracy_summary = QLabel("No finished matches with predictions yet.")
+        self.accuracy_summary.setObjectName("muted")
+        self.calibration_figure = Figure(figsize=(3, 2), facecolor="#111827")
+        self.calibration_canvas = FigureCanvasQTAgg(self.calibration_figure)
+
+        accuracy_card = QFrame()
+        accuracy_card.setObjectName("panel")
+        accuracy_layout = QVBoxLayout()
+        accuracy_header = QHBoxLayout()
+        accuracy_title = QLabel("Model accuracy")
+        accuracy_title.setStyleSheet("font-size: 16px; font-weight: 700;")
+        accuracy_header.addWidget(accuracy_title)
+        accuracy_header.addStretch()
+        accuracy_header.addWidget(self.grouping_select)
+        accuracy_body = QHBoxLayout()
+        accuracy_body.addWidget(self.accuracy_table, 3)
+        accuracy_body.addWidget(self.calibration_canvas, 2)
+        accuracy_layout.addLayout(accuracy_header)
+        accuracy_layout.addWidget(self.accuracy_summary)
+        accuracy_layout.addLayout(accuracy_body)
+        accuracy_card.setLayout(accuracy_layout)
+
         layout = QVBoxLayout()
         layout.setSpacing(12)
         layout.addWidget(hero_card)
         layout.addLayout(row)
+        layout.addWidget(accuracy_card)
         self.setLayout(layout)
 
         self.reload_matches(date.today())
         self.refresh_predictions()
+        self.refresh_accuracy()
 
     def reload_matches(self, target_date: date) -> None:
         matches = self.match_service.list_matches_for_date(target_date)
@@ -90,14 +224,67 @@ class PredictionsPage(QWidget):
             self.status_label.setText(f"{len(matches)} matches available for predictions.")
 
     def refresh_predictions(self) -> None:
-        self.list_widget.clear()
-        for prediction in self.prediction_service.list_predictions():
-            desc = (
-                f"Match {prediction.match_id} | "
-                f"{prediction.final_score_home}-{prediction.final_score_away} "
-                f"confidence {prediction.confidence or 'N/A'}"
+        # Only the first page is queried now; the view fetches more as it scrolls.
+        self.history_model.reload()
+        self.raw_response_view.clear()
+
+    def show_prediction_detail(self, current: QModelIndex, _previous: QModelIndex = QModelIndex()) -> None:
+        """Load the raw reply of the selected prediction; the history pages never carry it."""
+        row = self.history_model.data(current, Qt.UserRole)
+        if row is None:
+            self.raw_response_view.clear()
+            return
+        raw = self.prediction_service.get_raw_response(row["id"])
+        self.raw_response_view.setPlainText(raw if raw is not None else "No raw reply stored for this prediction.")
+
+    def refresh_accuracy(self) -> None:
+        """Reload (prediction, result) pairs; regrouping afterwards reuses the loaded columns."""
+        self._accuracy_columns = self.analytics_service.load_columns()
+        self._render_accuracy()
+        self._render_calibration()
+
+    def _render_accuracy(self, *_args) -> None:
+        group_by = _GROUPINGS[self.grouping_select.currentText()]
+        rows = self.analytics_service.accuracy(group_by, columns=self._accuracy_columns)
+        headers = [key.capitalize() for key in group_by] + [title for title, _key, _fmt in _METRIC_COLUMNS]
+        self.accuracy_table.clear()
+        self.accuracy_table.setColumnCount(len(headers))
+        self.accuracy_table.setHorizontalHeaderLabels(headers)
+        self.accuracy_table.setRowCount(len(rows))
+        for row_index, row in enumerate(rows):
+            values = [row[key] for key in group_by]
+            values += ["–" if row[key] is None else fmt.format(row[key]) for _title, key, fmt in _METRIC_COLUMNS]
+            for column, value in enumerate(values):
+                self.accuracy_table.setItem(row_index, column, QTableWidgetItem(value))
+        self.accuracy_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        if rows:
+            self.accuracy_summary.setText(
+                f"{len(self._accuracy_columns)} predictions scored against final results across {len(rows)} groups."
+            )
+        else:
+            self.accuracy_summary.setText("No finished matches with predictions yet.")
+
+    def _render_calibration(self) -> None:
+        self.calibration_figure.clear()
+        ax = self.calibration_figure.add_subplot(111)
+        ax.plot([0, 1], [0, 1], color="#6b7280", linestyle="--", linewidth=1)
+        for model, buckets in self.analytics_service.calibration(columns=self._accuracy_columns).items():
+            ax.plot(
+                [bucket["mean_confidence"] for bucket in buckets],
+                [bucket["observed_accuracy"] for bucket in buckets],
+                marker="o",
+                label=model,
             )
-            self.list_widget.addItem(desc)
+        if ax.get_legend_handles_labels()[0]:
+            ax.legend(fontsize=7, facecolor="#111827", labelcolor="#e5e7eb")
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.set_facecolor("#111827")
+        ax.tick_params(colors="#e5e7eb", labelsize=7)
+        for spine in ax.spines.values():
+            spine.set_color("#374151")
+        ax.set_title("Calibration", color="#e5e7eb", fontsize=9)
+        self.calibration_canvas.draw_idle()
 
     def generate_prediction(self) -> None:
         match_id = self.match_select.currentData()
@@ -114,3 +301,4 @@ class PredictionsPage(QWidget):
             f"(confidence {prediction.confidence})"
         )
         self.refresh_predictions()
+        self.refresh_accuracy()
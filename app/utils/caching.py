@@ -1,33 +1,202 @@
+import copy
+import logging
+import sqlite3
+import threading
 import time
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 from functools import wraps
-from typing import Callable
+from typing import Any, Callable, Dict, Tuple
 
+from app.utils.persistent_cache import MISSING, active_persistent_cache
 
-def ttl_cache(ttl_seconds: int = 60):
-    """Simple TTL cache decorator suitable for small lookups."""
+logger = logging.getLogger(__name__)
+
+CacheInfo = namedtuple(
+    "CacheInfo",
+    ["hits", "misses", "negative_hits", "coalesced", "evictions", "in_flight", "currsize", "maxsize", "l2_hits"],
+)
+
+
+class _Call:
+    """A computation in progress that concurrent callers with the same key wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+def _raise_cached(exc: BaseException):
+    """Raise a copy of a cached exception, chained to the original.
+
+    Raising the shared instance itself would append every caller's frames to its one
+    traceback, from several threads at once.
+    """
+    try:
+        fresh = copy.copy(exc)
+    except Exception:
+        fresh = None
+    if fresh is None or fresh is exc:
+        raise exc
+    raise fresh from exc
+
+
+def ttl_cache(
+    ttl_seconds: float | Callable[..., float] = 60,
+    maxsize: int = 256,
+    error_ttl_seconds: float = 0,
+    persist: Callable[..., str] | None = None,
+    version: int = 1,
+):
+    """Thread-safe TTL cache decorator suitable for small lookups.
+
+    ``ttl_seconds`` may be a callable ``ttl(result, *args, **kwargs)`` returning the lifetime for
+    that particular result; ``math.inf`` keeps it until evicted. Concurrent calls with the same
+    arguments are coalesced into one, and with ``error_ttl_seconds`` a raised exception is
+    re-raised to callers for that long instead of retrying immediately.
+
+    The wrapper exposes ``cache_info()`` and ``cache_clear()`` like ``functools.lru_cache``, plus
+    ``peek(*args, **kwargs)`` which returns the last cached value even if it has expired (or None)
+    without calling the function - the read side of stale-while-revalidate.
+
+    Passing ``persist`` (a function mapping the call arguments to a string key) opts into the
+    persistent second tier installed with ``enable_persistent_cache``: L1 misses are looked up on
+    disk before calling the function, results are written through with the same TTL, and
+    ``version`` invalidates everything persisted by an older version of the function.
+    """
 
     def decorator(func: Callable):
         cache: "OrderedDict[Tuple[Any, ...], Tuple[float, Any]]" = OrderedDict()
+        errors: "OrderedDict[Tuple[Any, ...], Tuple[float, BaseException]]" = OrderedDict()
+        in_flight: Dict[Tuple[Any, ...], _Call] = {}
+        stats = {"hits": 0, "misses": 0, "negative_hits": 0, "coalesced": 0, "evictions": 0, "l2_hits": 0}
+        lock = threading.Lock()
+        namespace = f"{func.__module__}.{func.__qualname__}"
+
+        def _l2_get(args, kwargs, allow_expired: bool = False) -> Tuple[Any, float]:
+            store = active_persistent_cache() if persist else None
+            if store is None:
+                return MISSING, 0.0
+            try:
+                return store.get(namespace, version, persist(*args, **kwargs), allow_expired=allow_expired)
+            except (sqlite3.Error, OSError, ValueError) as exc:
+                logger.warning("Persistent cache read failed for %s: %s", namespace, exc)
+                return MISSING, 0.0
+
+        def _l2_set(args, kwargs, value, ttl: float) -> None:
+            store = active_persistent_cache() if persist else None
+            if store is None or ttl <= 0:
+                return
+            try:
+                store.set(namespace, version, persist(*args, **kwargs), value, ttl)
+            except (sqlite3.Error, OSError) as exc:
+                logger.warning("Persistent cache write failed for %s: %s", namespace, exc)
+
+        def _store(store: OrderedDict, key, expires_at: float, value) -> None:
+            store[key] = (expires_at, value)
+            store.move_to_end(key)
+            while len(store) > maxsize:
+                store.popitem(last=False)
+                stats["evictions"] += 1
 
         @wraps(func)
         def wrapper(*args, **kwargs):
             try:
                 key = (args, tuple(sorted(kwargs.items())))
+                hash(key)
             except TypeError:
                 return func(*args, **kwargs)
-            now = time.time()
-            if key in cache:
-                expires_at, value = cache.pop(key)
-                cache[key] = (expires_at, value)
-                if now < expires_at:
-                    return value
-            result = func(*args, **kwargs)
-            cache[key] = (now + ttl_seconds, result)
-            if len(cache) > 256:
-                cache.popitem(last=False)
-            return result
 
+            with lock:
+                now = time.time()
+                entry = cache.get(key)
+                if entry is not None and now < entry[0]:
+                    cache.move_to_end(key)
+                    stats["hits"] += 1
+                    return entry[1]
+                failure = errors.get(key)
+                if failure is not None:
+                    if now < failure[0]:
+                        stats["negative_hits"] += 1
+                        _raise_cached(failure[1])
+                    del errors[key]
+                call = in_flight.get(key)
+                leader = call is None
+                if leader:
+                    call = in_flight[key] = _Call()
+                    stats["misses"] += 1
+                else:
+                    stats["coalesced"] += 1
+
+            if not leader:
+                call.done.wait()
+                if call.error is not None:
+                    _raise_cached(call.error)
+                return call.result
+
+            # Whatever happens below, the key must leave ``in_flight`` or its waiters hang forever.
+            try:
+                value, ttl = _l2_get(args, kwargs)
+                computed = value is MISSING
+                if computed:
+                    value = func(*args, **kwargs)
+                    ttl = ttl_seconds(value, *args, **kwargs) if callable(ttl_seconds) else ttl_seconds
+            except BaseException as exc:
+                call.error = exc
+                if error_ttl_seconds and isinstance(exc, Exception):
+                    with lock:
+                        _store(errors, key, time.time() + error_ttl_seconds, exc)
+                raise
+            else:
+                call.result = value
+                with lock:
+                    if not computed:
+                        stats["l2_hits"] += 1
+                    _store(cache, key, time.time() + ttl, value)
+            finally:
+                with lock:
+                    in_flight.pop(key, None)
+                call.done.set()
+            if computed:
+                _l2_set(args, kwargs, value, ttl)
+            return value
+
+        def cache_info() -> CacheInfo:
+            with lock:
+                return CacheInfo(
+                    hits=stats["hits"],
+                    misses=stats["misses"],
+                    negative_hits=stats["negative_hits"],
+                    coalesced=stats["coalesced"],
+                    evictions=stats["evictions"],
+                    in_flight=len(in_flight),
+                    currsize=len(cache),
+                    maxsize=maxsize,
+                    l2_hits=stats["l2_hits"],
+                )
+
+        def peek(*args, **kwargs):
+            try:
+                key = (args, tuple(sorted(kwargs.items())))
+                with lock:
+                    entry = cache.get(key)
+            except TypeError:
+                return None
+            if entry is not None:
+                return entry[1]
+            value, _ = _l2_get(args, kwargs, allow_expired=True)
+            return None if value is MISSING else value
+
+        def cache_clear() -> None:
+            with lock:
+                cache.clear()
+                errors.clear()
+                for key in stats:
+                    stats[key] = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        wrapper.peek = peek
         return wrapper
 
     return decorator
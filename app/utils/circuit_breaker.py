@@ -0,0 +1,115 @@
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected because the breaker is open."""
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker with exponential backoff and jitter.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and calls are rejected
+    until the backoff elapses. One trial call is then let through (half-open): success closes
+    the circuit, failure reopens it with a doubled backoff.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        base_backoff_seconds: float = 30.0,
+        max_backoff_seconds: float = 900.0,
+        jitter: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.jitter = jitter
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_count = 0
+        self._retry_at = 0.0
+        self._trial_in_flight = False
+        self._last_error: str | None = None
+        self._last_success_at: float | None = None
+        self._last_failure_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed now."""
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.OPEN and self._clock() >= self._retry_at:
+                self._state = CircuitState.HALF_OPEN
+                self._trial_in_flight = False
+                logger.info("Circuit %s half-open, allowing a trial request", self.name)
+            if self._state == CircuitState.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CircuitState.CLOSED:
+                logger.info("Circuit %s closed after successful trial", self.name)
+            self._state = CircuitState.CLOSED
+            self._consecutive_failures = 0
+            self._opened_count = 0
+            self._trial_in_flight = False
+            self._last_success_at = time.time()
+
+    def record_failure(self, error: BaseException) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            self._last_error = str(error)
+            self._last_failure_at = time.time()
+            self._trial_in_flight = False
+            if self._state == CircuitState.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        self._opened_count += 1
+        backoff = min(self.max_backoff_seconds, self.base_backoff_seconds * 2 ** (self._opened_count - 1))
+        backoff *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        self._state = CircuitState.OPEN
+        self._retry_at = self._clock() + backoff
+        logger.warning(
+            "Circuit %s open after %s consecutive failures, retrying in %.0fs (last error: %s)",
+            self.name,
+            self._consecutive_failures,
+            backoff,
+            self._last_error,
+        )
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            retry_in = max(0.0, self._retry_at - self._clock()) if self._state == CircuitState.OPEN else 0.0
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "retry_in_seconds": retry_in,
+                "last_error": self._last_error,
+                "last_success_at": self._last_success_at,
+                "last_failure_at": self._last_failure_at,
+            }
@@ -1,4 +1,4 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
 import pytz
 
@@ -13,6 +13,24 @@ def to_local(dt: datetime, tz_name: str = "Europe/London") -> datetime:
     return dt.astimezone(pytz.timezone(tz_name))
 
 
+def local_match_date(kickoff: datetime, tz_name: str = "Europe/London") -> date:
+    """Calendar day of a (naive UTC) kickoff in the local timezone, as stored in ``match_date``."""
+    return to_local(kickoff, tz_name).date()
+
+
+def parse_kickoff(value: str | None) -> datetime | None:
+    """Parse a scraper ISO-8601 kickoff ("2026-01-07T15:00:00Z") into a naive UTC datetime."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
 def format_match_time(dt: datetime | None) -> str:
     if not dt:
         return "TBD"
@@ -0,0 +1,151 @@
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.utils.rate_limit import RateLimiter
+from app.utils.response_archive import ArchiveMissError, ResponseArchive
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "User-Agent": "Football-AI/1.0",
+}
+
+
+@dataclass
+class _CachedResponse:
+    etag: str | None
+    last_modified: str | None
+    value: Any
+
+
+class HttpClient:
+    """Pooled keep-alive sessions (one per host) with conditional GET support.
+
+    Validators from each response are remembered per URL together with the parsed
+    payload, so a ``304 Not Modified`` returns the previous result without reparsing.
+    Only the ``max_cached`` most recently used URLs are kept; older ones fall back to a
+    plain GET.
+    At most ``pool_maxsize`` requests are in flight per host at any time, and with a
+    ``rate_limiter`` each network request first takes a token from its host's bucket.
+
+    With an ``archive`` every fresh body is also written to disk; with ``replay`` enabled
+    bodies are read back from the archive and the network is never touched.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 15,
+        pool_maxsize: int = 4,
+        archive: ResponseArchive | None = None,
+        replay: bool = False,
+        rate_limiter: RateLimiter | None = None,
+        max_cached: int = 512,
+    ):
+        if replay and archive is None:
+            raise ValueError("Replay mode requires a response archive")
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.archive = archive
+        self.replay = replay
+        self.rate_limiter = rate_limiter
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self.max_cached = max_cached
+        self._cached: "OrderedDict[str, _CachedResponse]" = OrderedDict()
+        self._stats = {"requests": 0, "fetched": 0, "not_modified": 0, "replayed": 0}
+
+    def session_for(self, url: str) -> requests.Session:
+        host = urlsplit(url).netloc
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                self._sessions[host] = session
+                self._host_slots[host] = threading.BoundedSemaphore(self.pool_maxsize)
+            return session
+
+    def _slot_for(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        self.session_for(url)
+        with self._lock:
+            return self._host_slots[host]
+
+    def fetch(self, url: str, parse: Callable[[str], T], source: str = "http") -> T:
+        """GET ``url`` and return ``parse(body)``, reusing the last parse on a 304."""
+        if self.replay:
+            body = self.archive.latest(url)
+            if body is None:
+                raise ArchiveMissError(f"No archived response for {url}")
+            self._bump("replayed")
+            return parse(body)
+        with self._lock:
+            cached = self._cached.get(url)
+            if cached is not None:
+                self._cached.move_to_end(url)
+        headers: Dict[str, str] = {}
+        if cached:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(urlsplit(url).netloc)
+        with self._slot_for(url):
+            response = self.session_for(url).get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and cached is not None:
+            self._bump("requests", "not_modified")
+            logger.debug("Not modified: %s", url)
+            return cached.value
+        response.raise_for_status()
+        self._bump("requests", "fetched")
+        if self.archive is not None:
+            try:
+                self.archive.store(source, url, response.text)
+            except (OSError, sqlite3.Error) as exc:
+                logger.warning("Unable to archive response for %s: %s", url, exc)
+
+        value = parse(response.text)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        with self._lock:
+            if etag or last_modified:
+                self._cached[url] = _CachedResponse(etag, last_modified, value)
+                self._cached.move_to_end(url)
+                while len(self._cached) > self.max_cached:
+                    self._cached.popitem(last=False)
+            else:
+                self._cached.pop(url, None)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def _bump(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._stats[key] += 1
@@ -0,0 +1,143 @@
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS ix_cache_entries_last_access ON cache_entries (last_access);
+"""
+
+MISSING = object()
+
+
+class PersistentCache:
+    """SQLite-backed second cache tier for JSON-serialisable values.
+
+    Entries are stored per ``(namespace, key)`` with their own expiry (NULL for never) and the
+    namespace's version; bumping the version drops older entries for that namespace. When the
+    stored values exceed ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    def __init__(self, path: Path | str, max_bytes: int = 32 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._checked_versions: set[Tuple[str, int]] = set()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def get(self, namespace: str, version: int, key: str, allow_expired: bool = False) -> Tuple[Any, float]:
+        """Return ``(value, remaining_ttl)``; value is ``MISSING`` when absent or expired."""
+        self._check_version(namespace, version)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ? AND version = ?",
+                (namespace, key, version),
+            ).fetchone()
+            if row is None:
+                return MISSING, 0.0
+            value, expires_at = row
+            remaining = math.inf if expires_at is None else expires_at - now
+            if remaining <= 0 and not allow_expired:
+                return MISSING, 0.0
+            conn.execute(
+                "UPDATE cache_entries SET last_access = ? WHERE namespace = ? AND key = ?", (now, namespace, key)
+            )
+        return json.loads(value), remaining
+
+    def set(self, namespace: str, version: int, key: str, value: Any, ttl_seconds: float) -> None:
+        self._check_version(namespace, version)
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError) as exc:
+            logger.debug("Not persisting %s/%s: %s", namespace, key, exc)
+            return
+        now = time.time()
+        expires_at = None if math.isinf(ttl_seconds) else now + ttl_seconds
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO cache_entries (namespace, version, key, value, size, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(namespace, key) DO UPDATE SET version = excluded.version, value = excluded.value, "
+                "size = excluded.size, expires_at = excluded.expires_at, last_access = excluded.last_access",
+                (namespace, version, key, payload, len(payload), expires_at, now),
+            )
+            self._evict(conn)
+
+    def clear(self, namespace: str | None = None) -> None:
+        with self._lock, self._connect() as conn:
+            if namespace is None:
+                conn.execute("DELETE FROM cache_entries")
+            else:
+                conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+
+    def total_bytes(self) -> int:
+        with self._lock, self._connect() as conn:
+            return conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+
+    def _check_version(self, namespace: str, version: int) -> None:
+        if (namespace, version) in self._checked_versions:
+            return
+        with self._lock, self._connect() as conn:
+            dropped = conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND version != ?", (namespace, version)
+            ).rowcount
+        if dropped:
+            logger.info("Dropped %s persisted cache entries for %s from older versions", dropped, namespace)
+        self._checked_versions.add((namespace, version))
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT namespace, key, size FROM cache_entries ORDER BY last_access").fetchall()
+        for namespace, key, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key))
+            total -= size
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+
+_active: PersistentCache | None = None
+
+
+def enable_persistent_cache(path: Path | str | None, max_bytes: int = 32 * 1024 * 1024) -> PersistentCache | None:
+    """Install the process-wide L2 store used by ``ttl_cache(persist=...)``; a falsy path disables it."""
+    global _active
+    _active = PersistentCache(path, max_bytes=max_bytes) if path else None
+    return _active
+
+
+def active_persistent_cache() -> PersistentCache | None:
+    return _active
@@ -1,20 +1,108 @@
+import asyncio
 import threading
 import time
 from contextlib import contextmanager
+from typing import Callable, Dict, Tuple
+
+from app.utils.latency import LatencyTracker
+
+
+class _TokenBucket:
+    """Tokens refill at ``rate`` per second up to ``capacity``; a negative balance is a queue."""
+
+    def __init__(self, rate: float, capacity: int, now: float):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("Rate limits need a positive rate and a burst of at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """Take one token and return how long the caller must wait before using it."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
 
 
 class RateLimiter:
-    def __init__(self, min_interval_seconds: float):
-        self.min_interval_seconds = min_interval_seconds
+    """Per-host token-bucket limiter with blocking and ``asyncio`` acquire paths.
+
+    Each host gets its own bucket, so a slow source never queues requests for another one.
+    Hosts without an explicit limit from ``limits`` (``{host: (rate_per_second, burst)}``) use
+    the defaults. A token is reserved under the lock and the caller sleeps outside it, so
+    waiters for one host never block acquires for another and are served in arrival order.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = 1.0,
+        burst: int = 1,
+        limits: Dict[str, Tuple[float, int]] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._limits = dict(limits or {})
+        self._clock = clock
         self._lock = threading.Lock()
-        self._last_time = 0.0
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self.waits = LatencyTracker()
 
-    @contextmanager
-    def wait(self):
+    def configure(self, host: str, rate_per_second: float, burst: int = 1) -> None:
         with self._lock:
-            now = time.time()
-            wait_for = max(0.0, self.min_interval_seconds - (now - self._last_time))
-            if wait_for:
-                time.sleep(wait_for)
-            self._last_time = time.time()
+            self._limits[host] = (rate_per_second, burst)
+            self._buckets.pop(host, None)
+
+    def acquire(self, host: str = "default") -> float:
+        """Block until a request to ``host`` is allowed; returns the seconds waited."""
+        delay = self._reserve(host)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, host: str = "default") -> float:
+        """Coroutine variant of :meth:`acquire` that yields to the event loop while waiting."""
+        delay = self._reserve(host)
+        if delay:
+            await asyncio.sleep(delay)
+        return delay
+
+    @contextmanager
+    def wait(self, host: str = "default"):
+        self.acquire(host)
         yield
+
+    def stats(self) -> Dict[str, Dict[str, float | int | None]]:
+        """Acquire counts and wait times per host, including p50/p95 over the recent window."""
+        waits = self.waits.snapshot()
+        with self._lock:
+            return {
+                host: {
+                    **counters,
+                    "p50_wait_seconds": waits.get(host, {}).get("p50"),
+                    "p95_wait_seconds": waits.get(host, {}).get("p95"),
+                }
+                for host, counters in self._stats.items()
+            }
+
+    def _reserve(self, host: str) -> float:
+        with self._lock:
+            now = self._clock()
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self._limits.get(host, (self.rate_per_second, self.burst))
+                bucket = self._buckets[host] = _TokenBucket(rate, burst, now)
+            delay = bucket.reserve(now)
+            counters = self._stats.setdefault(
+                host, {"acquired": 0, "delayed": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+            )
+            counters["acquired"] += 1
+            if delay:
+                counters["delayed"] += 1
+                counters["total_wait_seconds"] += delay
+                counters["max_wait_seconds"] = max(counters["max_wait_seconds"], delay)
+        self.waits.record(host, delay)
+        return delay
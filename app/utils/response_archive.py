@@ -0,0 +1,155 @@
+import gzip
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Rough bytes an index row costs besides its source and URL text; counted against ``max_bytes``.
+_INDEX_ROW_BYTES = 32
+_BLOB_USAGE = f"""
+SELECT blobs.digest,
+       blobs.size + COALESCE(SUM(length(responses.source) + length(responses.url) + {_INDEX_ROW_BYTES}), 0)
+FROM blobs LEFT JOIN responses ON responses.digest = blobs.digest
+GROUP BY blobs.digest ORDER BY blobs.last_access
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    digest TEXT NOT NULL REFERENCES blobs(digest)
+);
+CREATE INDEX IF NOT EXISTS ix_responses_url_fetched ON responses (url, fetched_at);
+CREATE INDEX IF NOT EXISTS ix_blobs_last_access ON blobs (last_access);
+"""
+
+
+class ArchiveMissError(LookupError):
+    """Raised in replay mode when no archived response exists for a URL."""
+
+
+class ResponseArchive:
+    """Content-addressed, gzip-compressed store of raw HTTP response bodies.
+
+    Bodies are written once per SHA-256 digest under ``objects/``; a small SQLite index maps
+    ``(source, url, fetched_at)`` to digests, with one row each time a URL's body changes (a
+    refetch of an unchanged body adds nothing). When the compressed bodies plus their index
+    rows exceed ``max_bytes`` the least recently used bodies are evicted with their rows.
+    """
+
+    def __init__(self, root: Path | str, max_bytes: int = 200 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def store(self, source: str, url: str, body: str, fetched_at: float | None = None) -> str:
+        raw = body.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        path = self._path(digest)
+        with self._lock:
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(gzip.compress(raw))
+                tmp.replace(path)
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO blobs (digest, size, last_access) VALUES (?, ?, ?) "
+                    "ON CONFLICT(digest) DO UPDATE SET last_access = excluded.last_access",
+                    (digest, path.stat().st_size, fetched_at),
+                )
+                current = conn.execute(
+                    "SELECT digest FROM responses WHERE url = ? AND fetched_at <= ? ORDER BY fetched_at DESC LIMIT 1",
+                    (url, fetched_at),
+                ).fetchone()
+                if current is None or current[0] != digest:
+                    conn.execute(
+                        "INSERT INTO responses (source, url, fetched_at, digest) VALUES (?, ?, ?, ?)",
+                        (source, url, fetched_at, digest),
+                    )
+                self._evict(conn)
+        return digest
+
+    def latest(self, url: str, before: float | None = None) -> str | None:
+        """Return the most recent archived body for ``url`` (optionally fetched before a timestamp)."""
+        query = "SELECT digest FROM responses WHERE url = ?"
+        params: list = [url]
+        if before is not None:
+            query += " AND fetched_at <= ?"
+            params.append(before)
+        query += " ORDER BY fetched_at DESC LIMIT 1"
+        with self._lock, self._connect() as conn:
+            row = conn.execute(query, params).fetchone()
+            if row is None:
+                return None
+            digest = row[0]
+            conn.execute("UPDATE blobs SET last_access = ? WHERE digest = ?", (time.time(), digest))
+        try:
+            return gzip.decompress(self._path(digest).read_bytes()).decode("utf-8")
+        except OSError as exc:
+            logger.warning("Archived body %s for %s unreadable: %s", digest, url, exc)
+            return None
+
+    def entries(self, url: str) -> List[Dict]:
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT source, fetched_at, digest FROM responses WHERE url = ? ORDER BY fetched_at", (url,)
+            ).fetchall()
+        return [{"source": source, "fetched_at": fetched_at, "digest": digest} for source, fetched_at, digest in rows]
+
+    def total_bytes(self) -> int:
+        """Compressed body bytes plus the estimated size of the index rows, as capped by ``max_bytes``."""
+        with self._lock, self._connect() as conn:
+            return self._total_bytes(conn)
+
+    def _total_bytes(self, conn: sqlite3.Connection) -> int:
+        blobs = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        index = conn.execute(
+            f"SELECT COALESCE(SUM(length(source) + length(url) + {_INDEX_ROW_BYTES}), 0) FROM responses"
+        ).fetchone()[0]
+        return blobs + index
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = self._total_bytes(conn)
+        if total <= self.max_bytes:
+            return
+        for digest, size in conn.execute(_BLOB_USAGE).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE digest = ?", (digest,))
+            conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            self._path(digest).unlink(missing_ok=True)
+            total -= size
+            logger.debug("Evicted archived response %s (%s bytes)", digest, size)
+
+    def _path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest[2:]}.gz"
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.root / "index.db")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
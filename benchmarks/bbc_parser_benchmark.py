@@ -0,0 +1,97 @@
+"""Compare the single-pass BBC parser with the previous find_previous() implementation.
+
+Usage:
+    python -m benchmarks.bbc_parser_benchmark [saved_page.html ...]
+
+Without arguments two synthetic pages are generated: a busy Saturday with many
+competitions, and one with long competition sections.
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+from app.services.bbc_parser import DEFAULT_BACKEND, parse_bbc_fixtures, safe_int
+
+
+def legacy_parse(html: str) -> List[Dict]:
+    soup = BeautifulSoup(html, "html.parser")
+    fixtures: List[Dict] = []
+    for fixture in soup.select("article.gs-o-list-ui__item--flush"):
+        league = fixture.find_previous("h3")
+        league_name = league.get_text(strip=True) if league else "Unknown"
+        home = fixture.select_one("span.sp-c-fixture__team--home .sp-c-fixture__team-name")
+        away = fixture.select_one("span.sp-c-fixture__team--away .sp-c-fixture__team-name")
+        status_el = fixture.select_one("span.sp-c-fixture__status")
+        score_home = fixture.select_one("span.sp-c-fixture__number--home")
+        score_away = fixture.select_one("span.sp-c-fixture__number--away")
+        kickoff = fixture.select_one("time")
+        if not home or not away:
+            continue
+        fixtures.append(
+            {
+                "league": league_name,
+                "home": home.get_text(strip=True),
+                "away": away.get_text(strip=True),
+                "status": status_el.get_text(strip=True) if status_el else "upcoming",
+                "home_score": safe_int(score_home.get_text(strip=True) if score_home else None),
+                "away_score": safe_int(score_away.get_text(strip=True) if score_away else None),
+                "kickoff": kickoff["datetime"] if kickoff and kickoff.has_attr("datetime") else None,
+            }
+        )
+    return fixtures
+
+
+def synthetic_page(competitions: int = 25, fixtures_per_competition: int = 40) -> str:
+    parts = ["<html><head><script>var x = 1;</script></head><body>"]
+    parts.append("<nav>" + "<a href='#'>link</a>" * 200 + "</nav>")
+    for comp in range(competitions):
+        parts.append(f"<div class='sp-c-competition'><h3>Competition {comp}</h3><ul>")
+        for idx in range(fixtures_per_competition):
+            parts.append(
+                "<li><article class='gs-o-list-ui__item--flush'><div class='sp-c-fixture'>"
+                f"<span class='sp-c-fixture__team--home'><span class='sp-c-fixture__team-name'>Home {comp}-{idx}</span></span>"
+                f"<span class='sp-c-fixture__number--home'>{idx % 4}</span>"
+                f"<span class='sp-c-fixture__number--away'>{idx % 3}</span>"
+                f"<span class='sp-c-fixture__team--away'><span class='sp-c-fixture__team-name'>Away {comp}-{idx}</span></span>"
+                "<span class='sp-c-fixture__status'>FT</span>"
+                "<time datetime='2026-01-10T15:00:00Z'></time>"
+                "<div class='sp-c-fixture__meta'>" + "<span>meta</span>" * 10 + "</div>"
+                "</div></article></li>"
+            )
+        parts.append("</ul></div>")
+    parts.append("<footer>" + "<p>footer</p>" * 200 + "</footer></body></html>")
+    return "".join(parts)
+
+
+def _time(func, html: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(paths: List[str]) -> None:
+    pages = {path: Path(path).read_text(encoding="utf-8") for path in paths} or {
+        "synthetic busy saturday": synthetic_page(),
+        "synthetic long sections": synthetic_page(competitions=2, fixtures_per_competition=500),
+    }
+    for name, html in pages.items():
+        legacy = legacy_parse(html)
+        current = parse_bbc_fixtures(html)
+        assert legacy == current, f"{name}: parser output differs from legacy implementation"
+        legacy_s = _time(legacy_parse, html)
+        current_s = _time(parse_bbc_fixtures, html)
+        print(
+            f"{name}: {len(current)} fixtures · legacy {legacy_s * 1000:.1f} ms · "
+            f"single-pass ({DEFAULT_BACKEND}) {current_s * 1000:.1f} ms · {legacy_s / current_s:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,124 @@
+import math
+import unittest
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app.database.db import engine, get_session, init_db
+from app.models import league, team, match, prediction, match_stats  # noqa: F401
+from app.models.base import Base
+from app.models.prediction import Prediction
+from app.services.analytics_service import PredictionAnalyticsService
+from app.services.match_service import MatchService
+
+
+class PredictionAnalyticsTests(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        init_db()
+        matches = MatchService()
+        premier = matches.ensure_league("Premier League", tier=1)
+        cup = matches.ensure_league("Cup")
+        home = matches.ensure_team("Home FC", premier)
+        away = matches.ensure_team("Away FC", premier)
+        played = [
+            (premier, datetime(2026, 1, 10, 15), "finished", 2, 1),
+            (premier, datetime(2026, 2, 10, 15), "finished", 0, 0),
+            (cup, datetime(2026, 2, 14, 15), "finished", 1, 3),
+            (cup, datetime(2026, 3, 1, 15), "upcoming", None, None),
+        ]
+        ids = [
+            matches.upsert_match(
+                league=league_row,
+                home_team=home if kickoff.month != 2 else away,
+                away_team=away if kickoff.month != 2 else home,
+                kickoff=kickoff,
+                status=status,
+                home_score=home_score,
+                away_score=away_score,
+            ).id
+            for league_row, kickoff, status, home_score, away_score in played
+        ]
+        # (match, model, predicted home, predicted away, confidence)
+        self.predictions = [
+            (ids[0], "llama", 2, 1, 0.8),
+            (ids[0], "mistral", 1, 1, 0.6),
+            (ids[1], "llama", 1, 0, 0.7),
+            (ids[1], "mistral", 0, 0, None),
+            (ids[2], "llama", 0, 2, 0.9),
+            (ids[2], "llama", None, None, 0.5),
+            (ids[3], "llama", 1, 0, 0.5),
+        ]
+        with get_session() as session:
+            session.execute(
+                insert(Prediction),
+                [
+                    {
+                        "match_id": match_id,
+                        "model_used": model,
+                        "final_score_home": home_score,
+                        "final_score_away": away_score,
+                        "confidence": confidence,
+                    }
+                    for match_id, model, home_score, away_score, confidence in self.predictions
+                ],
+            )
+        self.service = PredictionAnalyticsService()
+
+    def test_accuracy_by_model(self):
+        rows = {row["model"]: row for row in self.service.accuracy(("model",))}
+        self.assertEqual(set(rows), {"llama", "mistral"})
+
+        llama = rows["llama"]
+        self.assertEqual(llama["predictions"], 3)
+        self.assertAlmostEqual(llama["exact_score_rate"], 1 / 3)
+        self.assertAlmostEqual(llama["outcome_accuracy"], 2 / 3)
+        self.assertAlmostEqual(llama["goal_mae"], (0 + 0.5 + 1) / 3)
+        self.assertAlmostEqual(llama["brier"], ((0.8 - 1) ** 2 + 0.7**2 + (0.9 - 1) ** 2) / 3)
+        self.assertAlmostEqual(llama["log_loss"], -(math.log(0.8) + math.log(0.3) + math.log(0.9)) / 3)
+
+        mistral = rows["mistral"]
+        self.assertEqual(mistral["predictions"], 2)
+        self.assertAlmostEqual(mistral["exact_score_rate"], 0.5)
+        self.assertAlmostEqual(mistral["outcome_accuracy"], 0.5)
+        # Only the prediction that carried a confidence is scored for calibration.
+        self.assertAlmostEqual(mistral["brier"], 0.6**2)
+
+    def test_accuracy_groups_by_league_and_month(self):
+        rows = self.service.accuracy()
+        keys = {(row["model"], row["league"], row["month"]): row["predictions"] for row in rows}
+        self.assertEqual(
+            keys,
+            {
+                ("llama", "Premier League", "2026-01"): 1,
+                ("llama", "Premier League", "2026-02"): 1,
+                ("llama", "Cup", "2026-02"): 1,
+                ("mistral", "Premier League", "2026-01"): 1,
+                ("mistral", "Premier League", "2026-02"): 1,
+            },
+        )
+        by_league = {row["league"]: row["predictions"] for row in self.service.accuracy(("league",))}
+        self.assertEqual(by_league, {"Premier League": 4, "Cup": 1})
+        with self.assertRaises(ValueError):
+            self.service.accuracy(("team",))
+
+    def test_calibration_buckets_per_model(self):
+        calibration = self.service.calibration(bins=5)
+        self.assertEqual(set(calibration), {"llama", "mistral"})
+        llama = {bucket["bucket"]: bucket for bucket in calibration["llama"]}
+        self.assertEqual(set(llama), {(0.6, 0.8), (0.8, 1.0)})
+        self.assertEqual(llama[(0.8, 1.0)]["predictions"], 2)
+        self.assertAlmostEqual(llama[(0.8, 1.0)]["mean_confidence"], 0.85)
+        self.assertEqual(llama[(0.8, 1.0)]["observed_accuracy"], 1.0)
+        self.assertEqual(llama[(0.6, 0.8)]["observed_accuracy"], 0.0)
+
+    def test_empty_history(self):
+        with get_session() as session:
+            session.query(Prediction).delete()
+        self.assertEqual(len(self.service.load_columns()), 0)
+        self.assertEqual(self.service.accuracy(), [])
+        self.assertEqual(self.service.calibration(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
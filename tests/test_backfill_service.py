@@ -0,0 +1,103 @@
+import unittest
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+from app.database.db import engine, get_session, init_db
+from app.models import backfill_checkpoint, league, team, match, prediction, match_stats  # noqa: F401
+from app.models.backfill_checkpoint import BackfillCheckpoint
+from app.models.base import Base
+from app.models.match import Match
+from app.services.backfill_service import BackfillService
+from app.services.match_service import MatchService
+from app.services.source_registry import NoFixturesError
+
+START = date(2025, 8, 1)
+
+
+class _HistoryScraper:
+    """Two fixtures a day; ``broken`` days fail, ``empty`` days have no fixtures."""
+
+    def __init__(self, broken=(), empty=()):
+        self.broken = set(broken)
+        self.empty = set(empty)
+        self.requested: list[date] = []
+
+    def get_fixtures_for_dates(self, dates, max_workers=None):
+        for target_date in dates:
+            self.requested.append(target_date)
+            if target_date in self.broken:
+                yield target_date, None, ValueError("All scrapers failed")
+            elif target_date in self.empty:
+                yield target_date, None, NoFixturesError(f"No source has fixtures for {target_date}")
+            else:
+                day = target_date.isoformat()
+                yield target_date, [
+                    {"league": "League", "home": f"Home {day}", "away": "Away", "kickoff": f"{day}T15:00:00Z"},
+                    {"league": "League", "home": "Undated", "away": f"Away {day}", "status": "upcoming"},
+                ], None
+
+
+class BackfillServiceTests(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        init_db()
+        self.match_service = MatchService()
+
+    def _service(self, scraper, batch_days=3):
+        return BackfillService(scraper, self.match_service, concurrency=2, batch_days=batch_days)
+
+    def _checkpointed(self):
+        with get_session() as session:
+            return dict(session.execute(select(BackfillCheckpoint.match_date, BackfillCheckpoint.fixtures)).all())
+
+    def test_backfill_ingests_in_batches_and_checkpoints_days(self):
+        end = START + timedelta(days=9)
+        broken, empty = START + timedelta(days=4), START + timedelta(days=5)
+        progress = []
+        report = self._service(_HistoryScraper(broken=[broken], empty=[empty])).run(
+            START, end, progress=lambda r: progress.append(r.completed)
+        )
+
+        self.assertEqual((report.requested, report.resumed, report.completed), (10, 0, 9))
+        self.assertEqual(report.failed, [broken])
+        self.assertEqual((report.fixtures, report.inserted), (16, 16))
+        self.assertEqual(progress, [3, 6, 9, 9])
+        self.assertGreater(report.fixtures_per_second, 0)
+        checkpoints = self._checkpointed()
+        self.assertNotIn(broken, checkpoints)
+        self.assertEqual(checkpoints[empty], 0)
+        self.assertEqual(checkpoints[START], 2)
+        # The undated fixture is stored once per scraped day, on that day.
+        self.assertEqual(len(self.match_service.list_matches_for_date(START + timedelta(days=2))), 2)
+
+        retry = _HistoryScraper()
+        report = self._service(retry).run(START, end)
+        self.assertEqual(retry.requested, [broken])
+        self.assertEqual((report.resumed, report.completed, report.inserted), (9, 1, 2))
+        with get_session() as session:
+            self.assertEqual(session.execute(select(func.count()).select_from(Match)).scalar_one(), 18)
+
+    def test_interrupted_run_resumes_after_last_committed_batch(self):
+        end = START + timedelta(days=6)
+
+        def interrupt(report):
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            self._service(_HistoryScraper()).run(START, end, progress=interrupt)
+        self.assertEqual(sorted(self._checkpointed()), [START + timedelta(days=offset) for offset in range(3)])
+
+        scraper = _HistoryScraper()
+        report = self._service(scraper).run(START, end)
+        self.assertEqual(scraper.requested, [START + timedelta(days=offset) for offset in range(3, 7)])
+        self.assertEqual((report.resumed, report.completed, report.failed), (3, 4, []))
+
+        service = self._service(_HistoryScraper())
+        self.assertEqual(service.pending_dates(START, end), [])
+        self.assertEqual(service.reset(START, START + timedelta(days=1)), 2)
+        self.assertEqual(service.pending_dates(START, end), [START, START + timedelta(days=1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
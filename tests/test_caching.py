@@ -0,0 +1,231 @@
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from app.utils.caching import ttl_cache
+from app.utils.http_client import HttpClient
+from app.utils.persistent_cache import MISSING, PersistentCache, enable_persistent_cache
+
+
+class TtlCacheTests(unittest.TestCase):
+    def test_concurrent_misses_are_coalesced(self):
+        calls = []
+        started = threading.Event()
+
+        @ttl_cache(ttl_seconds=60)
+        def slow(value):
+            calls.append(value)
+            started.set()
+            time.sleep(0.1)
+            return value * 2
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(slow(21))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [42] * 5)
+        self.assertEqual(calls, [21])
+        info = slow.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.coalesced + info.hits, 4)
+        self.assertEqual(info.in_flight, 0)
+
+    def test_failures_are_cached_briefly(self):
+        calls = []
+
+        @ttl_cache(ttl_seconds=60, error_ttl_seconds=60)
+        def flaky():
+            calls.append(1)
+            raise ConnectionError("down")
+
+        raised = []
+        for _ in range(3):
+            with self.assertRaises(ConnectionError) as caught:
+                flaky()
+            raised.append(caught.exception)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flaky.cache_info().negative_hits, 2)
+        # Each negative hit raises its own copy, so the cached failure's traceback does not grow.
+        self.assertEqual(len({id(exc) for exc in raised}), 3)
+        self.assertIs(raised[1].__cause__, raised[0])
+        self.assertIs(raised[2].__cause__, raised[0])
+        flaky.cache_clear()
+        with self.assertRaises(ConnectionError):
+            flaky()
+        self.assertEqual(len(calls), 2)
+
+    def test_maxsize_evicts_least_recently_used(self):
+        @ttl_cache(ttl_seconds=60, maxsize=2)
+        def ident(value):
+            return value
+
+        ident(1)
+        ident(2)
+        ident(1)
+        ident(3)
+        info = ident.cache_info()
+        self.assertEqual((info.currsize, info.evictions), (2, 1))
+        ident(1)
+        self.assertEqual(ident.cache_info().hits, 2)
+
+    def test_callable_ttl_controls_expiry(self):
+        @ttl_cache(ttl_seconds=lambda result, value: 0 if value == "stale" else 60)
+        def ident(value):
+            return object()
+
+        self.assertIs(ident("fresh"), ident("fresh"))
+        self.assertIsNot(ident("stale"), ident("stale"))
+
+    def test_peek_returns_expired_value_without_calling(self):
+        calls = []
+
+        @ttl_cache(ttl_seconds=0)
+        def ident(value):
+            calls.append(value)
+            return value
+
+        self.assertIsNone(ident.peek("a"))
+        ident("a")
+        self.assertEqual(ident.peek("a"), "a")
+        self.assertEqual(calls, ["a"])
+
+
+class PersistentCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "l2.db"
+
+    def tearDown(self):
+        enable_persistent_cache(None)
+        self._tmp.cleanup()
+
+    def _decorated(self, calls, version=1):
+        @ttl_cache(ttl_seconds=60, persist=lambda value: str(value), version=version)
+        def fetch(value):
+            calls.append(value)
+            return {"value": value}
+
+        return fetch
+
+    def test_results_survive_a_restart(self):
+        enable_persistent_cache(self.path)
+        calls = []
+        self.assertEqual(self._decorated(calls)(1), {"value": 1})
+
+        # A freshly decorated function has an empty L1, as after relaunching the app.
+        restarted = self._decorated(calls)
+        self.assertEqual(restarted(1), {"value": 1})
+        self.assertEqual(calls, [1])
+        self.assertEqual(restarted.cache_info().l2_hits, 1)
+        self.assertEqual(restarted.cache_info().currsize, 1)
+
+    def test_version_bump_invalidates_persisted_entries(self):
+        enable_persistent_cache(self.path)
+        calls = []
+        self._decorated(calls)(1)
+        self._decorated(calls, version=2)(1)
+        self.assertEqual(calls, [1, 1])
+
+    def test_peek_falls_back_to_expired_disk_entry(self):
+        store = enable_persistent_cache(self.path)
+        calls = []
+        self._decorated(calls)(1)
+        namespace = next(iter(store._checked_versions))[0]
+        store.set(namespace, 1, "1", {"value": "old"}, ttl_seconds=-1)
+
+        restarted = self._decorated(calls)
+        self.assertEqual(restarted.peek(1), {"value": "old"})
+        self.assertEqual(restarted(1), {"value": 1})
+        self.assertEqual(calls, [1, 1])
+
+    def test_failed_disk_lookup_releases_the_key(self):
+        enable_persistent_cache(self.path)
+        calls = []
+        keys = iter([KeyError("bad key")])
+
+        def persist(value):
+            error = next(keys, None)
+            if error is not None:
+                raise error
+            return str(value)
+
+        @ttl_cache(ttl_seconds=60, persist=persist)
+        def fetch(value):
+            calls.append(value)
+            return {"value": value}
+
+        with self.assertRaises(KeyError):
+            fetch(1)
+        self.assertEqual(fetch.cache_info().in_flight, 0)
+        self.assertEqual(fetch(1), {"value": 1})
+        self.assertEqual(calls, [1])
+
+    def test_size_cap_evicts_least_recently_used(self):
+        store = PersistentCache(self.path, max_bytes=300)
+        for idx in range(5):
+            store.set("ns", 1, str(idx), "x" * 100, ttl_seconds=60)
+        self.assertLessEqual(store.total_bytes(), 300)
+        self.assertIs(store.get("ns", 1, "0")[0], MISSING)
+        self.assertEqual(store.get("ns", 1, "4")[0], "x" * 100)
+
+
+class _Response:
+    def __init__(self, status_code: int, text: str = "", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+class _ValidatingSession:
+    """Answers 304 whenever the request carries the URL's ETag, otherwise a fresh body."""
+
+    def __init__(self):
+        self.fresh = 0
+
+    def get(self, url, headers=None, timeout=None):
+        if (headers or {}).get("If-None-Match") == f'"{url}"':
+            return _Response(304)
+        self.fresh += 1
+        return _Response(200, f"body of {url}", {"ETag": f'"{url}"'})
+
+
+class HttpClientTests(unittest.TestCase):
+    def test_validator_cache_keeps_only_recent_urls(self):
+        client = HttpClient(max_cached=2)
+        session = _ValidatingSession()
+        client.session_for = lambda url: session
+        client._slot_for = lambda url: threading.BoundedSemaphore(1)
+
+        for url in ("https://a/1", "https://a/2", "https://a/1", "https://a/3"):
+            client.fetch(url, str.upper)
+        self.assertEqual(list(client._cached), ["https://a/1", "https://a/3"])
+        self.assertEqual(client.fetch("https://a/1", str.upper), "BODY OF HTTPS://A/1")
+        self.assertEqual(session.fresh, 3)
+        # The evicted URL is fetched again in full.
+        client.fetch("https://a/2", str.upper)
+        self.assertEqual(session.fresh, 4)
+
+    def test_archive_failure_still_returns_the_response(self):
+        class _LockedArchive:
+            def store(self, source, url, text):
+                raise sqlite3.OperationalError("database is locked")
+
+        client = HttpClient(archive=_LockedArchive())
+        session = _ValidatingSession()
+        client.session_for = lambda url: session
+        client._slot_for = lambda url: threading.BoundedSemaphore(1)
+
+        with self.assertLogs("app.utils.http_client", "WARNING"):
+            self.assertEqual(client.fetch("https://a/1", str.upper), "BODY OF HTTPS://A/1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.database.db import create_storage_engine
+
+
+class StorageProfileTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{Path(self._tmp.name) / 'profile.db'}"
+        self.writer = create_storage_engine(url)
+        self.reader = create_storage_engine(url, read_only=True)
+        with self.writer.begin() as conn:
+            conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+            conn.execute(text("INSERT INTO items (id) VALUES (1)"))
+
+    def tearDown(self):
+        self.writer.dispose()
+        self.reader.dispose()
+        self._tmp.cleanup()
+
+    def test_pragmas_are_applied_on_connect(self):
+        with self.writer.connect() as conn:
+            self.assertEqual(conn.execute(text("PRAGMA journal_mode")).scalar_one(), "wal")
+            self.assertEqual(conn.execute(text("PRAGMA synchronous")).scalar_one(), 1)
+            self.assertGreater(conn.execute(text("PRAGMA busy_timeout")).scalar_one(), 0)
+            self.assertEqual(conn.execute(text("PRAGMA query_only")).scalar_one(), 0)
+        with self.reader.connect() as conn:
+            self.assertEqual(conn.execute(text("PRAGMA query_only")).scalar_one(), 1)
+            with self.assertRaises(OperationalError):
+                conn.execute(text("INSERT INTO items (id) VALUES (2)"))
+
+    def test_reader_does_not_wait_for_open_write_transaction(self):
+        with self.writer.begin() as write:
+            write.execute(text("INSERT INTO items (id) VALUES (2)"))
+            started = time.perf_counter()
+            with self.reader.connect() as read:
+                count = read.execute(text("SELECT COUNT(*) FROM items")).scalar_one()
+            self.assertLess(time.perf_counter() - started, 0.5)
+            self.assertEqual(count, 1)
+        with self.reader.connect() as read:
+            self.assertEqual(read.execute(text("SELECT COUNT(*) FROM items")).scalar_one(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,22 @@
 import unittest
-from datetime import date
-from types import SimpleNamespace
+from datetime import date, timedelta
 from unittest.mock import patch
 
 from app.services.live_score_service import LiveScoreService
+from app.services.match_service import IngestResult
 
 
-class _DummyScraper:
+class _SequentialRangeMixin:
+    def get_fixtures_range(self, start: date, end: date):
+        for offset in range((end - start).days + 1):
+            target_date = start + timedelta(days=offset)
+            try:
+                yield target_date, self.get_fixtures(target_date), None
+            except Exception as exc:
+                yield target_date, None, exc
+
+
+class _DummyScraper(_SequentialRangeMixin):
     def __init__(self):
         self.calls: list[date] = []
 
@@ -24,30 +34,19 @@ class _DummyScraper:
         ]
 
 
-class _FailingScraper:
+class _FailingScraper(_SequentialRangeMixin):
     def get_fixtures(self, target_date: date):
         raise RuntimeError(f"no fixtures for {target_date}")
 
 
 class _DummyMatchService:
-    def ensure_league(self, name: str, tier: int = 1, session=None):
-        return SimpleNamespace(id=1, name=name)
-
-    def ensure_team(self, name: str, league, session=None):
-        return SimpleNamespace(id=hash(name) % 10_000, name=name)
-
-    def upsert_match(
-        self,
-        league,
-        home_team,
-        away_team,
-        kickoff,
-        status,
-        home_score,
-        away_score,
-        venue=None,
-    ):
-        return SimpleNamespace()
+    def __init__(self):
+        self.batches: list[list[dict]] = []
+
+    def bulk_upsert_fixtures(self, fixtures, match_date=None):
+        self.batches.append(list(fixtures))
+        changed = [fixture for fixture in fixtures if fixture["status"] != "upcoming"]
+        return IngestResult(updated=len(changed), unchanged=len(fixtures) - len(changed), changed=changed)
 
 
 class LiveScoreServiceTests(unittest.TestCase):
@@ -75,6 +74,21 @@ class LiveScoreServiceTests(unittest.TestCase):
             service.refresh_window(days_ahead=0)
         self.assertTrue(any("Skipping" in entry for entry in logs.output))
 
+    def test_subscribers_receive_only_changed_fixtures(self):
+        service = LiveScoreService(_DummyScraper(), _DummyMatchService())
+        received = []
+        unsubscribe = service.subscribe(lambda target_date, changed: received.append((target_date, changed)))
+
+        quiet = {"league": "Test League", "home": "Alpha", "away": "Beta", "status": "upcoming"}
+        live = {"league": "Test League", "home": "Gamma", "away": "Delta", "status": "live"}
+        service._ingest_fixtures([quiet, live], date(2000, 1, 1))
+        service._ingest_fixtures([quiet], date(2000, 1, 1))
+        self.assertEqual(received, [(date(2000, 1, 1), [live])])
+
+        unsubscribe()
+        service._ingest_fixtures([live], date(2000, 1, 1))
+        self.assertEqual(len(received), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
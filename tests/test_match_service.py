@@ -1,9 +1,16 @@
+import threading
 import unittest
-from datetime import datetime
+from unittest.mock import patch
+from datetime import date, datetime
 
-from app.database.db import engine
+from sqlalchemy import event, func, select
+
+from app.database.db import engine, get_session
 from app.database.db import init_db
 from app.models import league, team, match, prediction, match_stats  # noqa: F401
+from app.models.daily_summary import DailyMatchSummary
+from app.models.match import Match
+from app.models.match_event import MatchEvent
 from app.models.base import Base
 from app.services.match_service import MatchService
 
@@ -37,6 +44,314 @@ class MatchServiceTests(unittest.TestCase):
     def test_get_match_missing_returns_none(self):
         self.assertIsNone(self.service.get_match(9999))
 
+    def test_date_settles_once_every_match_finished(self):
+        match = self.service.get_match(self.match_id)
+        today = date(2026, 1, 8)
+        self.assertFalse(self.service.is_date_settled(date(2026, 1, 7), today=today))
+        self.service.upsert_match(
+            league=self.service.ensure_league("Test League"),
+            home_team=match.home_team,
+            away_team=match.away_team,
+            kickoff=datetime(2026, 1, 7, 12, 0),
+            status="finished",
+            home_score=2,
+            away_score=0,
+        )
+        self.assertTrue(self.service.is_date_settled(date(2026, 1, 7), today=today))
+        self.assertFalse(self.service.is_date_settled(date(2026, 1, 7), today=date(2026, 1, 7)))
+        rows = self.service.fixtures_for_date(date(2026, 1, 7))
+        self.assertEqual(rows[0]["home"], "Home FC")
+        self.assertEqual(rows[0]["status"], "finished")
+        self.assertEqual(rows[0]["kickoff"], "2026-01-07T12:00:00Z")
+
+    def test_bulk_upsert_reports_inserted_updated_unchanged(self):
+        fixtures = [
+            {
+                "league": "Test League",
+                "home": "Home FC",
+                "away": "Away FC",
+                "kickoff": "2026-01-07T12:00:00Z",
+                "status": "FT",
+                "home_score": 1,
+                "away_score": 1,
+            },
+            {
+                "league": "Cup",
+                "tier": None,
+                "home": "New Town",
+                "away": "Home FC",
+                "kickoff": "2026-01-07T15:00:00+00:00",
+                "status": "upcoming",
+            },
+            {"league": "Cup", "home": "Missing away"},
+        ]
+        result = self.service.bulk_upsert_fixtures(fixtures)
+        self.assertEqual(
+            result.counts(), {"inserted": 1, "updated": 1, "unchanged": 0, "skipped": 1, "events": 2}
+        )
+        self.assertEqual([event["kind"] for event in result.events], ["goal", "full_time"])
+        self.assertEqual(self.service.get_match(self.match_id).status, "finished")
+
+        result = self.service.bulk_upsert_fixtures(fixtures[:2])
+        self.assertEqual(
+            result.counts(), {"inserted": 0, "updated": 0, "unchanged": 2, "skipped": 0, "events": 0}
+        )
+        rows = self.service.fixtures_for_date(date(2026, 1, 7))
+        self.assertEqual([(row["home"], row["kickoff"]) for row in rows], [
+            ("Home FC", "2026-01-07T12:00:00Z"),
+            ("New Town", "2026-01-07T15:00:00Z"),
+        ])
+
+    def test_bulk_upsert_statement_count_does_not_grow_with_fixtures(self):
+        def run(count: int, offset: int) -> int:
+            fixtures = [
+                {
+                    "league": f"League {offset}-{idx % 3}",
+                    "home": f"Home {idx}",
+                    "away": f"Away {idx}",
+                    "kickoff": f"2026-02-{offset:02d}T15:00:00Z",
+                    "status": "upcoming",
+                }
+                for idx in range(count)
+            ]
+            statements = []
+            listener = lambda *args: statements.append(args[2])  # noqa: E731
+            event.listen(engine, "before_cursor_execute", listener)
+            try:
+                self.assertEqual(self.service.bulk_upsert_fixtures(fixtures).inserted, count)
+            finally:
+                event.remove(engine, "before_cursor_execute", listener)
+            return len(statements)
+
+        self.assertEqual(run(5, 1), run(200, 2))
+
+    def test_upsert_skips_no_op_writes_and_logs_events(self):
+        match = self.service.get_match(self.match_id)
+        league = self.service.ensure_league("Test League")
+        kwargs = dict(league=league, home_team=match.home_team, away_team=match.away_team, kickoff=match.kickoff_utc)
+
+        unchanged, events = self.service.upsert_match_with_events(
+            status="upcoming", home_score=None, away_score=None, **kwargs
+        )
+        self.assertEqual(events, [])
+        self.assertEqual(unchanged.updated_at, match.updated_at)
+
+        steps = [("live", 0, 0), ("live", 1, 0), ("live", 1, 0), ("finished", 1, 0)]
+        kinds = []
+        for status, home_score, away_score in steps:
+            _, events = self.service.upsert_match_with_events(
+                status=status, home_score=home_score, away_score=away_score, **kwargs
+            )
+            kinds.extend(event["kind"] for event in events)
+        self.assertEqual(kinds, ["kickoff", "goal", "full_time"])
+        with get_session() as session:
+            stored = session.execute(select(MatchEvent.kind).order_by(MatchEvent.id)).scalars().all()
+        self.assertEqual(stored, kinds)
+
+    def test_upsert_without_a_venue_keeps_the_stored_one(self):
+        match = self.service.get_match(self.match_id)
+        league = self.service.ensure_league("Test League")
+        kwargs = dict(league=league, home_team=match.home_team, away_team=match.away_team, kickoff=match.kickoff_utc)
+
+        self.service.upsert_match(status="upcoming", home_score=None, away_score=None, venue="Home Park", **kwargs)
+        updated = self.service.upsert_match(status="live", home_score=0, away_score=0, **kwargs)
+        self.assertEqual(updated.venue, "Home Park")
+        unchanged = self.service.upsert_match(status="live", home_score=0, away_score=0, **kwargs)
+        self.assertEqual(unchanged.updated_at, updated.updated_at)
+
+    def _count_statements(self, action) -> int:
+        statements = []
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            action()
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        return len(statements)
+
+    def test_known_names_resolve_from_identity_map(self):
+        service = MatchService()
+        service.warm_identity_maps()
+        league = service.ensure_league("Test League")
+        self.assertEqual(self._count_statements(lambda: service.ensure_team("Home FC", league)), 0)
+        self.assertEqual(service.identity_map_stats()["teams"]["hits"], 1)
+
+    def test_rolled_back_inserts_are_not_cached(self):
+        with self.assertRaises(RuntimeError), get_session() as session:
+            self.service.ensure_league("Ghost League", session=session)
+            raise RuntimeError("abort")
+        self.assertIsNone(self.service._leagues.get("Ghost League"))
+
+        fixture = {
+            "league": "Ghost League",
+            "home": "Ghost Home",
+            "away": "Ghost Away",
+            "kickoff": "2026-01-08T15:00:00Z",
+            "status": "upcoming",
+        }
+        # Fail after the league and team inserts, while building the match rows.
+        with patch("app.services.match_service.to_local", side_effect=RuntimeError("abort")):
+            with self.assertRaises(RuntimeError):
+                self.service.bulk_upsert_fixtures([fixture])
+        self.assertIsNone(self.service._teams.get("Ghost Home"))
+        with get_session() as session:
+            self.assertIsNone(session.execute(select(team.Team).where(team.Team.name == "Ghost Home")).first())
+
+        self.assertEqual(self.service.bulk_upsert_fixtures([fixture]).inserted, 1)
+        self.assertIsNotNone(self.service._teams.get("Ghost Home"))
+
+    def test_date_queries_use_the_local_match_date(self):
+        fixtures = [
+            # 23:30 UTC in July is already the next day in London.
+            {"league": "Cup", "home": "Late FC", "away": "Night FC", "kickoff": "2026-07-01T23:30:00Z"},
+            {"league": "Cup", "home": "Undated FC", "away": "Home FC", "status": "upcoming"},
+        ]
+        self.service.bulk_upsert_fixtures(fixtures, match_date=date(2026, 7, 2))
+        self.service.bulk_upsert_fixtures(fixtures[1:], match_date=date(2026, 7, 9))
+
+        day = [(m.home_team.name, m.kickoff_utc) for m in self.service.list_matches_for_date(date(2026, 7, 2))]
+        self.assertEqual(day, [("Undated FC", None), ("Late FC", datetime(2026, 7, 1, 23, 30))])
+        self.assertEqual(self.service.list_matches_for_date(date(2026, 7, 1)), [])
+        self.assertEqual(len(self.service.list_matches_for_date(date(2026, 7, 9))), 1)
+        self.assertEqual(
+            [m.home_team.name for m in self.service.list_matches_for_date(date(2026, 1, 7))], ["Home FC"]
+        )
+
+    def test_daily_summary_tracks_ingest_incrementally(self):
+        fixtures = [
+            {"league": "Cup", "home": "Late FC", "away": "Night FC", "kickoff": "2026-07-01T23:30:00Z"},
+            {"league": "Cup", "home": "Undated FC", "away": "Home FC", "status": "live"},
+        ]
+        self.service.bulk_upsert_fixtures(fixtures, match_date=date(2026, 7, 2))
+        self.service.bulk_upsert_fixtures(fixtures[1:], match_date=date(2026, 7, 9))
+        self.service.bulk_upsert_fixtures([{**fixtures[0], "status": "FT", "home_score": 1, "away_score": 0}])
+        match = self.service.get_match(self.match_id)
+        self.service.upsert_match(
+            league=self.service.ensure_league("Test League"),
+            home_team=match.home_team,
+            away_team=match.away_team,
+            kickoff=datetime(2026, 1, 7, 12, 0),
+            status="live",
+            home_score=0,
+            away_score=0,
+        )
+
+        with get_session() as session:
+            stored = session.execute(
+                select(
+                    DailyMatchSummary.match_date,
+                    DailyMatchSummary.league_id,
+                    DailyMatchSummary.status,
+                    DailyMatchSummary.match_count,
+                )
+            ).all()
+            recount = session.execute(
+                select(Match.match_date, Match.league_id, Match.status, func.count())
+                .group_by(Match.match_date, Match.league_id, Match.status)
+            ).all()
+        self.assertEqual(sorted(stored), sorted(recount))
+
+        self.assertEqual(
+            self.service.daily_summary(date(2026, 7, 2)),
+            {"statuses": {"live": 1, "finished": 1, "upcoming": 0}, "leagues": {"Cup": {"finished": 1, "live": 1}}},
+        )
+        summary = self.service.daily_summary(date(2026, 1, 1), date(2026, 7, 31))
+        self.assertEqual(summary["statuses"], {"live": 3, "finished": 1, "upcoming": 0})
+        self.assertEqual(summary["leagues"], {"Cup": {"finished": 1, "live": 2}, "Test League": {"live": 1}})
+        self.assertEqual(self.service.daily_summary(date(2026, 7, 3))["leagues"], {})
+
+    def _ingest_concurrently(self, fixtures):
+        """Run two ingests of ``fixtures`` that both try to read existing matches at the same moment."""
+        barrier = threading.Barrier(2, timeout=0.5)
+
+        def meet(conn, cursor, statement, *args):
+            if statement.lstrip().startswith("SELECT matches.id") and threading.current_thread() in workers:
+                try:
+                    barrier.wait()
+                except threading.BrokenBarrierError:
+                    pass  # The other ingest holds the write lock, as it should.
+
+        results, errors = [], []
+
+        def ingest():
+            try:
+                results.append(MatchService().bulk_upsert_fixtures(fixtures))
+            except Exception as exc:  # pragma: no cover - reported below
+                errors.append(exc)
+
+        workers = [threading.Thread(target=ingest) for _ in range(2)]
+        event.listen(engine, "before_cursor_execute", meet)
+        try:
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        finally:
+            event.remove(engine, "before_cursor_execute", meet)
+        self.assertEqual(errors, [])
+        return results
+
+    def test_concurrent_ingests_of_the_same_day_do_not_race(self):
+        fixtures = [
+            {"league": "Cup", "home": f"Home {idx}", "away": f"Away {idx}", "kickoff": "2026-03-01T15:00:00Z"}
+            for idx in range(20)
+        ]
+        results = self._ingest_concurrently(fixtures)
+        self.assertEqual(sorted((r.inserted, r.unchanged) for r in results), [(0, 20), (20, 0)])
+
+        live = [{**fixture, "status": "live", "home_score": 1, "away_score": 0} for fixture in fixtures]
+        results = self._ingest_concurrently(live)
+        self.assertEqual(sorted((r.updated, r.unchanged) for r in results), [(0, 20), (20, 0)])
+        with get_session() as session:
+            self.assertEqual(
+                session.execute(select(func.count()).select_from(Match).where(Match.status == "live")).scalar_one(),
+                20,
+            )
+
+    def test_concurrent_ingests_keep_the_daily_summary_exact(self):
+        fixtures = [
+            {"league": "Cup", "home": f"Home {idx}", "away": f"Away {idx}", "kickoff": "2026-03-01T15:00:00Z"}
+            for idx in range(10)
+        ]
+        self._ingest_concurrently(fixtures)
+        self._ingest_concurrently([{**fixture, "status": "live"} for fixture in fixtures])
+
+        self.assertEqual(
+            self.service.daily_summary(date(2026, 3, 1))["statuses"], {"live": 10, "finished": 0, "upcoming": 0}
+        )
+        with get_session() as session:
+            stored = session.execute(
+                select(
+                    DailyMatchSummary.match_date,
+                    DailyMatchSummary.league_id,
+                    DailyMatchSummary.status,
+                    DailyMatchSummary.match_count,
+                )
+            ).all()
+            recount = session.execute(
+                select(Match.match_date, Match.league_id, Match.status, func.count())
+                .group_by(Match.match_date, Match.league_id, Match.status)
+            ).all()
+        self.assertEqual(sorted(stored), sorted(recount))
+
+    def test_concurrent_ingests_log_each_event_once(self):
+        fixtures = [
+            {"league": "Cup", "home": f"Home {idx}", "away": f"Away {idx}", "kickoff": "2026-03-01T15:00:00Z"}
+            for idx in range(10)
+        ]
+        self._ingest_concurrently(fixtures)
+        results = self._ingest_concurrently(
+            [{**fixture, "status": "live", "home_score": 1, "away_score": 0} for fixture in fixtures]
+        )
+
+        logged = sorted(len(result.events) for result in results)
+        self.assertEqual(logged[0], 0)
+        with get_session() as session:
+            stored = session.execute(select(MatchEvent.match_id, MatchEvent.kind)).all()
+        self.assertEqual(len(stored), logged[1])
+        self.assertEqual(len(set(stored)), len(stored))
+        self.assertEqual(len({match_id for match_id, _kind in stored}), 10)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,173 @@
+import tempfile
+import zlib
+import unittest
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+
+from app.database.migrations import MIGRATIONS, run_migrations, schema_version
+from app.models import daily_summary, league, team, match, prediction, match_stats  # noqa: F401
+from app.models.base import Base
+
+
+class MigrationTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{Path(self._tmp.name) / 'legacy.db'}", future=True)
+        # A database created before migrations existed: tables without the new indexes.
+        Base.metadata.create_all(bind=self.engine)
+        with self.engine.begin() as conn:
+            indexes = ("ix_matches_kickoff_utc", "ix_matches_status", "ix_matches_match_date", "uq_matches_natural_key")
+            for index in indexes:
+                conn.execute(text(f"DROP INDEX {index}"))
+            conn.execute(text("ALTER TABLE matches DROP COLUMN match_date"))
+            # Raw model replies used to be stored inline on predictions.
+            conn.execute(text("ALTER TABLE predictions ADD COLUMN raw_response VARCHAR"))
+            conn.execute(
+                text(
+                    "INSERT INTO leagues (id, name, tier, country, created_at, updated_at) "
+                    "VALUES (1, 'League', 1, 'England', '2026-01-01', '2026-01-01')"
+                )
+            )
+            for team_id, name in ((1, "Home"), (2, "Away")):
+                conn.execute(
+                    text(
+                        "INSERT INTO teams (id, name, league_id, created_at, updated_at) "
+                        "VALUES (:id, :name, 1, '2026-01-01', '2026-01-01')"
+                    ),
+                    {"id": team_id, "name": name},
+                )
+            # The same fixture stored twice: an early upcoming row and a later finished one, whose
+            # status is still the raw provider text stored before ingest normalized it.
+            rows = ((1, "upcoming", None, "2026-01-01"), (2, "FT", 3, "2026-01-02"))
+            for match_id, status, score, updated in rows:
+                conn.execute(
+                    text(
+                        "INSERT INTO matches (id, league_id, home_team_id, away_team_id, kickoff_utc, status, "
+                        "home_score, away_score, created_at, updated_at) VALUES (:id, 1, 1, 2, "
+                        "'2026-01-07 15:00:00.000000', :status, :score, :score, '2026-01-01', :updated)"
+                    ),
+                    {"id": match_id, "status": status, "score": score, "updated": updated},
+                )
+            # The reverse fixture months later is not the same match as the undated row below.
+            conn.execute(
+                text(
+                    "INSERT INTO matches (id, league_id, home_team_id, away_team_id, kickoff_utc, status, "
+                    "home_score, away_score, created_at, updated_at) VALUES (6, 1, 2, 1, "
+                    "'2026-05-01 15:00:00.000000', 'STATUS_FULL_TIME', 1, 1, '2026-05-01', '2026-05-01')"
+                )
+            )
+            # Rows stored by the UI without a kickoff: one has a dated twin, the other does not.
+            for match_id, home_id, away_id in ((3, 1, 2), (4, 2, 1)):
+                conn.execute(
+                    text(
+                        "INSERT INTO matches (id, league_id, home_team_id, away_team_id, status, "
+                        "created_at, updated_at) VALUES (:id, 1, :home, :away, 'upcoming', "
+                        "'2026-01-06 10:00:00.000000', '2026-01-06 10:00:00.000000')"
+                    ),
+                    {"id": match_id, "home": home_id, "away": away_id},
+                )
+            conn.execute(
+                text(
+                    "INSERT INTO predictions (match_id, model_used, raw_response, created_at) "
+                    "VALUES (2, 'm', 'Final score: 2-1', '2026-01-01')"
+                )
+            )
+            conn.execute(
+                text("INSERT INTO predictions (match_id, model_used, created_at) VALUES (3, 'm', '2026-01-06')")
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO match_stats (match_id, corners_home, created_at, updated_at) "
+                    "VALUES (2, 7, '2026-01-01', '2026-01-01')"
+                )
+            )
+
+    def tearDown(self):
+        self.engine.dispose()
+        self._tmp.cleanup()
+
+    def test_upgrade_merges_duplicates_and_adds_natural_key(self):
+        self.assertEqual(schema_version(self.engine), 0)
+        latest = max(migration.version for migration in MIGRATIONS)
+        self.assertEqual(run_migrations(self.engine), latest)
+        self.assertEqual(run_migrations(self.engine), latest)
+
+        with self.engine.begin() as conn:
+            matches = conn.execute(text("SELECT id, status, home_score, match_date FROM matches ORDER BY id")).all()
+            self.assertEqual(
+                matches,
+                [
+                    (1, "finished", 3, "2026-01-07"),
+                    (4, "upcoming", None, None),
+                    (6, "finished", 1, "2026-05-01"),
+                ],
+            )
+            self.assertEqual(conn.execute(text("SELECT match_id FROM predictions")).scalars().all(), [1, 1])
+            columns = [row[1] for row in conn.execute(text("PRAGMA table_info(predictions)"))]
+            self.assertNotIn("raw_response", columns)
+            responses = conn.execute(text("SELECT prediction_id, body FROM prediction_responses")).all()
+            self.assertEqual(
+                [(prediction_id, zlib.decompress(body)) for prediction_id, body in responses],
+                [(1, b"Final score: 2-1")],
+            )
+            self.assertEqual(conn.execute(text("SELECT match_id, corners_home FROM match_stats")).one(), (1, 7))
+            summary = conn.execute(text("SELECT match_date, league_id, status, match_count FROM daily_match_summary"))
+            self.assertEqual(
+                sorted(summary.all()),
+                [("2026-01-07", 1, "finished", 1), ("2026-05-01", 1, "finished", 1)],
+            )
+        with self.assertRaises(IntegrityError), self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO matches (league_id, home_team_id, away_team_id, kickoff_utc, status, "
+                    "created_at, updated_at) VALUES (1, 1, 2, '2026-01-07 15:00:00.000000', 'upcoming', "
+                    "'2026-01-01', '2026-01-01')"
+                )
+            )
+
+    def test_fix_up_listed_early_still_runs_on_an_upgraded_database(self):
+        run_migrations(self.engine)
+        # A database that reached version 7 before status normalization existed.
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM schema_version WHERE version = 8"))
+            conn.execute(text("UPDATE matches SET status = 'in progress' WHERE id = 1"))
+        run_migrations(self.engine)
+        with self.engine.begin() as conn:
+            self.assertEqual(conn.execute(text("SELECT status FROM matches WHERE id = 1")).scalar_one(), "live")
+            summary = conn.execute(text("SELECT status, match_count FROM daily_match_summary")).all()
+            self.assertIn(("live", 1), summary)
+            self.assertNotIn("in progress", [status for status, _count in summary])
+
+    def test_hot_queries_use_indexes(self):
+        run_migrations(self.engine)
+        queries = {
+            "ix_matches_kickoff_utc": (
+                "SELECT * FROM matches WHERE kickoff_utc >= '2026-01-07' AND kickoff_utc <= '2026-01-08'"
+            ),
+            "ix_matches_status": "SELECT * FROM matches WHERE status = 'live'",
+            "ix_matches_match_date": "SELECT * FROM matches WHERE match_date = '2026-01-07'",
+            "ix_predictions_created_at_id": (
+                "SELECT id FROM predictions WHERE (created_at, id) < ('2026-01-02', 5) "
+                "ORDER BY created_at DESC, id DESC LIMIT 50"
+            ),
+            "ix_predictions_match_created_at": (
+                "SELECT id FROM predictions WHERE match_id = 1 ORDER BY created_at DESC, id DESC LIMIT 50"
+            ),
+            "sqlite_autoindex_daily_match_summary_1": (
+                "SELECT * FROM daily_match_summary WHERE match_date BETWEEN '2026-01-01' AND '2026-01-31'"
+            ),
+            "uq_matches_natural_key": (
+                "SELECT * FROM matches WHERE home_team_id = 1 AND away_team_id = 2 "
+                "AND kickoff_utc = '2026-01-07 15:00:00.000000'"
+            ),
+        }
+        with self.engine.begin() as conn:
+            for index, query in queries.items():
+                plan = " ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {query}")))
+                self.assertIn(f"USING INDEX {index}", plan.replace("COVERING ", ""), plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.database.db import engine, get_session, init_db
+from app.models import league, team, match, prediction, match_stats  # noqa: F401
+from app.models.base import Base
+from app.models.match import Match
+from app.models.prediction import Prediction
+from app.models.prediction_response import PredictionResponse
+from app.services.match_service import MatchService
+from app.services.prediction_service import PredictionService
+
+
+class PredictionHistoryTests(unittest.TestCase):
+    def setUp(self):
+        Base.metadata.drop_all(bind=engine)
+        init_db()
+        matches = MatchService()
+        league = matches.ensure_league("Test League", tier=1)
+        home = matches.ensure_team("Home FC", league)
+        away = matches.ensure_team("Away FC", league)
+        self.match_ids = [
+            matches.upsert_match(
+                league=league,
+                home_team=home if day % 2 else away,
+                away_team=away if day % 2 else home,
+                kickoff=datetime(2026, 1, day, 15, 0),
+                status="finished",
+                home_score=1,
+                away_score=0,
+            ).id
+            for day in (1, 2)
+        ]
+        start = datetime(2026, 1, 1, 9, 0)
+        # Pairs share a timestamp so pages have to break ties on id.
+        rows = [
+            {
+                "match_id": self.match_ids[i % 2],
+                "model_used": "llama" if i % 3 else "mistral",
+                "confidence": 0.5,
+                "final_score_home": 1,
+                "final_score_away": i % 4,
+                "created_at": start + timedelta(hours=12 * (i // 2)),
+            }
+            for i in range(23)
+        ]
+        with get_session() as session:
+            session.execute(insert(Prediction), rows)
+        self.service = PredictionService()
+
+    def _all_pages(self, limit: int, **filters):
+        ids, cursor = [], None
+        while True:
+            page = self.service.list_prediction_page(limit=limit, after=cursor, **filters)
+            self.assertLessEqual(len(page.rows), limit)
+            ids.extend(row["id"] for row in page.rows)
+            if page.next_cursor is None:
+                return ids
+            cursor = page.next_cursor
+
+    def test_pages_walk_history_newest_first_without_gaps(self):
+        with get_session() as session:
+            expected = [
+                p.id for p in session.query(Prediction).order_by(Prediction.created_at.desc(), Prediction.id.desc())
+            ]
+        self.assertEqual(self._all_pages(limit=5), expected)
+        self.assertEqual(self._all_pages(limit=23), expected)
+
+        first = self.service.list_prediction_page(limit=2).rows[0]
+        self.assertNotIn("raw_response", first)
+        self.assertEqual((first["home"], first["away"]), ("Home FC", "Away FC"))
+
+    def test_raw_response_is_stored_compressed_and_read_on_demand(self):
+        with get_session() as session:
+            match = session.get(Match, self.match_ids[0])
+        raw = "Final score: 2-1\nConfidence: 70%\n" + "The home side pressed high. " * 40
+        saved = self.service._persist_prediction(match, {"final_score_home": 2, "raw_response": raw})
+        empty = self.service._persist_prediction(match, {"final_score_home": 0, "raw_response": ""})
+
+        self.assertEqual(self.service.get_raw_response(saved.id), raw)
+        self.assertIsNone(self.service.get_raw_response(empty.id))
+        with get_session() as session:
+            stored = session.get(PredictionResponse, saved.id).body
+        self.assertLess(len(stored), len(raw) // 4)
+
+    def test_pages_filter_by_match_model_and_day(self):
+        with get_session() as session:
+            predictions = session.query(Prediction).all()
+
+        def expected(keep):
+            chosen = sorted((p for p in predictions if keep(p)), key=lambda p: (p.created_at, p.id), reverse=True)
+            return [p.id for p in chosen]
+
+        self.assertEqual(
+            self._all_pages(limit=3, match_id=self.match_ids[0]),
+            expected(lambda p: p.match_id == self.match_ids[0]),
+        )
+        self.assertEqual(self._all_pages(limit=3, model="mistral"), expected(lambda p: p.model_used == "mistral"))
+        day = date(2026, 1, 3)
+        self.assertEqual(
+            self._all_pages(limit=3, start=day, end=day),
+            expected(lambda p: p.created_at.date() == day),
+        )
+        self.assertEqual(self.service.list_prediction_page(start=date(2027, 1, 1)).rows, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from app.utils.rate_limit import RateLimiter
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimiterTests(unittest.TestCase):
+    def test_burst_then_refill_rate(self):
+        clock = _Clock()
+        limiter = RateLimiter(rate_per_second=2, burst=3, clock=clock)
+        with patch("app.utils.rate_limit.time.sleep") as sleep:
+            waits = [limiter.acquire("bbc") for _ in range(5)]
+        self.assertEqual(waits, [0.0, 0.0, 0.0, 0.5, 1.0])
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [0.5, 1.0])
+
+        clock.now = 10.0
+        with patch("app.utils.rate_limit.time.sleep"):
+            self.assertEqual(limiter.acquire("bbc"), 0.0)
+        stats = limiter.stats()["bbc"]
+        self.assertEqual((stats["acquired"], stats["delayed"]), (6, 2))
+        self.assertAlmostEqual(stats["total_wait_seconds"], 1.5)
+        self.assertEqual(stats["max_wait_seconds"], 1.0)
+
+    def test_hosts_have_independent_limits(self):
+        clock = _Clock()
+        limiter = RateLimiter(rate_per_second=1, burst=1, limits={"espn": (10, 5)}, clock=clock)
+        with patch("app.utils.rate_limit.time.sleep"):
+            self.assertEqual(limiter.acquire("bbc"), 0.0)
+            self.assertEqual(limiter.acquire("bbc"), 1.0)
+            self.assertEqual([limiter.acquire("espn") for _ in range(5)], [0.0] * 5)
+            self.assertAlmostEqual(limiter.acquire("espn"), 0.1)
+
+    def test_waiting_on_one_host_does_not_block_another(self):
+        limiter = RateLimiter(rate_per_second=2, burst=1)
+        limiter.acquire("slow")
+        blocked = threading.Thread(target=limiter.acquire, args=("slow",))
+        blocked.start()
+        time.sleep(0.05)
+        started = time.perf_counter()
+        self.assertEqual(limiter.acquire("fast"), 0.0)
+        self.assertLess(time.perf_counter() - started, 0.1)
+        blocked.join()
+
+    def test_async_acquire_sleeps_on_the_event_loop(self):
+        clock = _Clock()
+        limiter = RateLimiter(rate_per_second=4, burst=1, clock=clock)
+        slept = []
+
+        async def fake_sleep(delay):
+            slept.append(delay)
+
+        async def run():
+            return [await limiter.acquire_async("espn") for _ in range(3)]
+
+        with patch("app.utils.rate_limit.asyncio.sleep", fake_sleep):
+            self.assertEqual(asyncio.run(run()), [0.0, 0.25, 0.5])
+        self.assertEqual(slept, [0.25, 0.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
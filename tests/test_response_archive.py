@@ -0,0 +1,88 @@
+import random
+import sqlite3
+import string
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from app.services.scraper_service import ScraperService
+from app.utils.response_archive import ResponseArchive
+
+BBC_HTML = """
+<h3>Premier League</h3>
+<article class="gs-o-list-ui__item--flush">
+  <span class="sp-c-fixture__team--home"><span class="sp-c-fixture__team-name">Arsenal</span></span>
+  <span class="sp-c-fixture__team--away"><span class="sp-c-fixture__team-name">Chelsea</span></span>
+</article>
+"""
+
+
+class _MockResponse:
+    def __init__(self, text):
+        self.text = text
+        self.status_code = 200
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+
+class ResponseArchiveTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_identical_bodies_share_one_blob(self):
+        archive = ResponseArchive(self.root)
+        first = archive.store("bbc", "https://example/a", "<html>same</html>", fetched_at=1.0)
+        second = archive.store("bbc", "https://example/a", "<html>same</html>", fetched_at=2.0)
+        archive.store("bbc", "https://example/a", "<html>changed</html>", fetched_at=3.0)
+        archive.store("bbc", "https://example/a", "<html>same</html>", fetched_at=4.0)
+        self.assertEqual(first, second)
+        # An unchanged refetch adds no index row; every change of body does.
+        self.assertEqual([entry["fetched_at"] for entry in archive.entries("https://example/a")], [1.0, 3.0, 4.0])
+        self.assertEqual(archive.latest("https://example/a"), "<html>same</html>")
+        self.assertEqual(archive.latest("https://example/a", before=2.5), "<html>same</html>")
+        self.assertEqual(archive.latest("https://example/a", before=3.5), "<html>changed</html>")
+        self.assertEqual(archive.latest("https://example/a", before=0.5), None)
+
+    def test_evicts_least_recently_used_bodies_over_cap(self):
+        archive = ResponseArchive(self.root, max_bytes=10_000)
+        for idx in range(20):
+            noise = "".join(random.Random(idx).choices(string.ascii_letters, k=2_000))
+            archive.store("espn", f"https://example/{idx}", noise, fetched_at=float(idx))
+        self.assertLessEqual(archive.total_bytes(), 10_000)
+        self.assertIsNone(archive.latest("https://example/0"))
+        self.assertIsNotNone(archive.latest("https://example/19"))
+
+    def test_index_rows_count_towards_the_cap(self):
+        archive = ResponseArchive(self.root, max_bytes=4_000)
+        for idx in range(200):
+            archive.store("espn", f"https://example/{idx:04d}/" + "p" * 40, "<html>no fixtures</html>", float(idx))
+        self.assertLessEqual(archive.total_bytes(), 4_000)
+        with sqlite3.connect(f"{self.root}/index.db") as conn:
+            self.assertLess(conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0], 200)
+
+    def test_replay_mode_serves_archived_pages_without_network(self):
+        archive = ResponseArchive(self.root)
+        live = ScraperService(archive=archive, replay=False)
+
+        def fake_get(_session, url, headers=None, timeout=15):
+            return _MockResponse(text=BBC_HTML)
+
+        with patch("app.utils.http_client.requests.Session.get", fake_get):
+            recorded = live.get_fixtures(date(2026, 1, 7))
+
+        offline = ScraperService(archive=archive, replay=True)
+        with patch("app.utils.http_client.requests.Session.get", side_effect=AssertionError("network used")):
+            replayed = offline.get_fixtures(date(2026, 1, 7))
+        self.assertEqual(recorded, replayed)
+        self.assertEqual(offline.http.stats()["replayed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,27 @@
+import json
+import threading
 import unittest
 from datetime import date
 
 from unittest.mock import patch
 
-from app.services.scraper_service import ScraperService
+from app.services.bbc_parser import parse_bbc_fixtures
+from app.services.source_registry import NoFixturesError
+from app.services.scraper_service import (
+    FUTURE_TTL_SECONDS,
+    LIVE_TTL_SECONDS,
+    PAST_UNSETTLED_TTL_SECONDS,
+    ScraperService,
+    fixture_ttl,
+)
 
 
 class _MockResponse:
-    def __init__(self, text=None, json_data=None, status=200):
-        self.text = text or ""
+    def __init__(self, text=None, json_data=None, status=200, headers=None):
+        self.text = text if text is not None else json.dumps(json_data or {})
         self._json = json_data
         self.status_code = status
+        self.headers = headers or {}
 
     def raise_for_status(self):
         if self.status_code >= 400:
@@ -35,13 +46,13 @@ BBC_HTML = """
 """
 
 ESPN_JSON = {
+    "leagues": [{"id": "700", "name": "English Premier League", "abbreviation": "Prem", "slug": "eng.1"}],
     "events": [
         {
             "date": "2026-01-07T20:00Z",
-            "status": {"type": {"name": "in progress"}},
+            "status": {"type": {"name": "STATUS_IN_PROGRESS", "state": "in"}},
             "competitions": [
                 {
-                    "league": {"name": "ESPN League"},
                     "competitors": [
                         {"homeAway": "home", "team": {"displayName": "Leeds"}, "score": "0"},
                         {"homeAway": "away", "team": {"displayName": "Leicester"}, "score": "1"},
@@ -49,18 +60,61 @@ ESPN_JSON = {
                 }
             ],
         }
-    ]
+    ],
 }
 
 
+BBC_MULTI_COMPETITION_HTML = """
+<html><body>
+<article class="gs-o-list-ui__item--flush">
+  <span class="sp-c-fixture__team--home"><span class="sp-c-fixture__team-name">Orphan</span></span>
+  <span class="sp-c-fixture__team--away"><span class="sp-c-fixture__team-name">Side</span></span>
+</article>
+<div><h3>Premier League</h3></div>
+<ul>
+<li><article class="gs-o-list-ui__item--flush">
+  <span class="sp-c-fixture__team--home"><span class="sp-c-fixture__team-name">Arsenal</span></span>
+  <span class="sp-c-fixture__team--away"><span class="sp-c-fixture__team-name">Chelsea</span></span>
+  <time datetime="2026-01-07T20:00:00Z"></time>
+</article></li>
+<li><article class="other-item"><span class="sp-c-fixture__team-name">Ignored</span></article></li>
+</ul>
+<h3>Championship</h3>
+<article class="gs-o-list-ui__item--flush">
+  <span class="sp-c-fixture__team--home"><span class="sp-c-fixture__team-name">Leeds</span></span>
+  <span class="sp-c-fixture__team--away"><span class="sp-c-fixture__team-name">Hull</span></span>
+  <span class="sp-c-fixture__status">HT</span>
+  <span class="sp-c-fixture__number--home">1</span>
+  <span class="sp-c-fixture__number--away">x</span>
+</article>
+<article class="gs-o-list-ui__item--flush">
+  <span class="sp-c-fixture__team--home"><span class="sp-c-fixture__team-name">No away team</span></span>
+</article>
+</body></html>
+"""
+
+
 class ScraperServiceTests(unittest.TestCase):
+    def test_bbc_parser_tracks_competition_headings(self):
+        fixtures = parse_bbc_fixtures(BBC_MULTI_COMPETITION_HTML)
+        self.assertEqual(
+            [(f["league"], f["home"], f["away"]) for f in fixtures],
+            [("Unknown", "Orphan", "Side"), ("Premier League", "Arsenal", "Chelsea"), ("Championship", "Leeds", "Hull")],
+        )
+        self.assertEqual(fixtures[1]["status"], "upcoming")
+        self.assertEqual(fixtures[1]["kickoff"], "2026-01-07T20:00:00Z")
+        self.assertIsNone(fixtures[1]["home_score"])
+        self.assertEqual(fixtures[2]["status"], "HT")
+        self.assertEqual(fixtures[2]["home_score"], 1)
+        self.assertIsNone(fixtures[2]["away_score"])
+
     def test_bbc_scrape_parses_fixture(self):
         service = ScraperService()
 
-        def fake_get(url, timeout=15):
+        def fake_get(_session, url, headers=None, timeout=15):
             return _MockResponse(text=BBC_HTML)
 
-        with patch("app.services.scraper_service.requests.get", fake_get):
+        with patch("app.utils.http_client.requests.Session.get", fake_get):
             fixtures = service.get_fixtures(date(2026, 1, 7))
         self.assertEqual(len(fixtures), 1)
         self.assertEqual(fixtures[0]["home"], "Arsenal")
@@ -72,19 +126,20 @@ class ScraperServiceTests(unittest.TestCase):
         def failing_bbc(_):
             raise ValueError("fail bbc")
 
-        def fake_get(url, timeout=15):
+        def fake_get(_session, url, headers=None, timeout=15):
             return _MockResponse(json_data=ESPN_JSON)
 
         service._scrape_bbc = failing_bbc  # type: ignore
-        with patch("app.services.scraper_service.requests.get", fake_get):
+        with patch("app.utils.http_client.requests.Session.get", fake_get):
             fixtures = service.get_fixtures(date(2026, 1, 8))
         self.assertEqual(fixtures[0]["home"], "Leeds")
         self.assertEqual(fixtures[0]["status"], "live")
 
     def test_espn_endpoint_uses_site_api(self):
         service = ScraperService()
+        service.espn_leagues = ["eng.1"]
         target_date = date(2026, 1, 9)
-        with patch("app.services.scraper_service.requests.get") as mock_get:
+        with patch("app.utils.http_client.requests.Session.get") as mock_get:
             mock_get.return_value = _MockResponse(json_data=ESPN_JSON)
             fixtures = service._scrape_espn(target_date)
         called_url = mock_get.call_args[0][0]
@@ -92,6 +147,201 @@ class ScraperServiceTests(unittest.TestCase):
         self.assertIn(target_date.strftime("%Y%m%d"), called_url)
         self.assertEqual(fixtures[0]["home"], "Leeds")
 
+    def test_espn_fans_out_over_leagues_and_dedups(self):
+        service = ScraperService()
+        service.espn_leagues = ["eng.1", "eng.2", "eng.fa", "eng.5"]
+        cup_only = {
+            "leagues": [{"id": "40", "name": "English FA Cup", "slug": "eng.fa"}],
+            "events": [dict(ESPN_JSON["events"][0], date="2026-01-09T19:45Z")],
+        }
+        called = []
+
+        def fake_get(_session, url, headers=None, timeout=15):
+            called.append(url)
+            if "/eng.5/" in url:
+                return _MockResponse(json_data={"leagues": [{"name": "English National League"}], "events": []})
+            if "/eng.fa/" in url:
+                return _MockResponse(json_data=cup_only)
+            return _MockResponse(json_data=ESPN_JSON)
+
+        with patch("app.utils.http_client.requests.Session.get", fake_get):
+            fixtures = service._scrape_espn(date(2026, 1, 9))
+        self.assertEqual(len(called), 4)
+        self.assertEqual(sorted(f["kickoff"] for f in fixtures), ["2026-01-07T20:00Z", "2026-01-09T19:45Z"])
+        self.assertEqual(fixtures[0]["tier"], 1)
+        by_kickoff = {f["kickoff"]: (f["league"], f["tier"]) for f in fixtures}
+        self.assertEqual(by_kickoff["2026-01-07T20:00Z"], ("English Premier League", 1))
+        self.assertEqual(by_kickoff["2026-01-09T19:45Z"], ("English FA Cup", None))
+
+    def test_espn_league_failure_fails_the_day(self):
+        service = ScraperService()
+        service.espn_leagues = ["eng.1", "eng.2"]
+        empty = {"leagues": [{"name": "English Premier League"}], "events": []}
+        responses = {"eng.1": _MockResponse(json_data=empty), "eng.2": _MockResponse(status=500)}
+
+        def fake_get(_session, url, headers=None, timeout=15):
+            return next(response for slug, response in responses.items() if f"/{slug}/" in url)
+
+        with patch("app.utils.http_client.requests.Session.get", fake_get):
+            with self.assertRaises(ValueError) as caught:
+                service._scrape_espn(date(2026, 1, 10))
+            self.assertNotIsInstance(caught.exception, NoFixturesError)
+
+            responses["eng.1"] = _MockResponse(json_data=ESPN_JSON)
+            with self.assertRaises(ValueError) as caught:
+                service._scrape_espn(date(2026, 1, 11))
+            self.assertNotIsInstance(caught.exception, NoFixturesError)
+
+            responses["eng.1"] = responses["eng.2"] = _MockResponse(json_data=empty)
+            with self.assertRaises(NoFixturesError):
+                service._scrape_espn(date(2026, 1, 12))
+
+    def test_espn_league_name_falls_back_to_the_slug(self):
+        payload = json.dumps({"events": ESPN_JSON["events"]})
+        service = ScraperService()
+        self.assertEqual(service._parse_espn(payload, "eng.2")[0]["league"], "English League Championship")
+        self.assertEqual(service._parse_espn(payload, "usa.1")[0]["league"], "ESPN usa.1")
+
+    def test_hedged_fetch_returns_fallback_when_primary_is_slow(self):
+        service = ScraperService()
+        service.max_hedge_budget = 0.05
+        release = threading.Event()
+
+        def slow_bbc(_target_date):
+            release.wait(5)
+            return [{"home": "Slow"}]
+
+        service._scrape_bbc = slow_bbc  # type: ignore
+        service._scrape_espn = lambda _target_date: [{"home": "Fast"}]  # type: ignore
+        try:
+            fixtures = service.get_fixtures(date(2026, 1, 10))
+        finally:
+            release.set()
+        self.assertEqual(fixtures[0]["home"], "Fast")
+        self.assertEqual(service.latency_snapshot()["espn"]["samples"], 1)
+
+    def test_hedge_budget_adapts_to_observed_p95(self):
+        service = ScraperService()
+        service.max_hedge_budget = 3.0
+        self.assertEqual(service.hedge_budget(), 3.0)
+        for _ in range(20):
+            service.latency.record("bbc", 0.8)
+        self.assertAlmostEqual(service.hedge_budget(), 0.8)
+        for _ in range(20):
+            service.latency.record("bbc", 10.0)
+        self.assertEqual(service.hedge_budget(), 3.0)
+
+    def test_hedged_dates_all_run_at_the_requested_concurrency(self):
+        service = ScraperService()
+        service.hedge = True
+        service.max_hedge_budget = 5.0
+        dates = [date(2026, 2, day) for day in range(1, 4 * service.max_workers + 1)]
+        everyone_started = threading.Barrier(len(dates), timeout=2)
+
+        def primary(target_date):
+            everyone_started.wait()
+            return [{"home": f"Home {target_date.day}"}]
+
+        def fallback(_target_date):
+            raise ValueError("fallback should not be needed")
+
+        service._scrape_bbc = primary  # type: ignore
+        service._scrape_espn = fallback  # type: ignore
+        try:
+            results = list(service.get_fixtures_for_dates(dates, max_workers=len(dates)))
+        finally:
+            service.close()
+        self.assertEqual([error for _day, _fixtures, error in results], [None] * len(dates))
+        with self.assertRaises(RuntimeError):
+            service._submit_hedged(primary, dates[0])
+
+    def test_circuit_opens_after_repeated_primary_failures(self):
+        service = ScraperService()
+        service.hedge = False
+        bbc_calls = []
+
+        def failing_bbc(target_date):
+            bbc_calls.append(target_date)
+            raise ConnectionError("bbc down")
+
+        service._scrape_bbc = failing_bbc  # type: ignore
+        service._scrape_espn = lambda _target_date: [{"home": "Leeds"}]  # type: ignore
+        for day in range(1, 6):
+            self.assertEqual(service.get_fixtures(date(2026, 2, day))[0]["home"], "Leeds")
+        self.assertEqual(len(bbc_calls), 3)
+        health = service.health()
+        self.assertEqual(health["bbc"]["state"], "open")
+        self.assertEqual(health["espn"]["state"], "closed")
+        self.assertIn("BBC open", service.health_summary())
+
+    def test_fixture_ttl_depends_on_date_and_statuses(self):
+        today = date(2026, 1, 10)
+        finished = [{"status": "FT"}, {"status": "status_full_time"}]
+        mixed = [{"status": "FT"}, {"status": "45'"}]
+        self.assertEqual(fixture_ttl(finished, None, date(2026, 1, 9), today=today), float("inf"))
+        self.assertEqual(fixture_ttl(mixed, None, date(2026, 1, 9), today=today), PAST_UNSETTLED_TTL_SECONDS)
+        self.assertEqual(fixture_ttl(mixed, None, today, today=today), LIVE_TTL_SECONDS)
+        self.assertEqual(fixture_ttl([{"status": "15:00"}], None, date(2026, 1, 11), today=today), FUTURE_TTL_SECONDS)
+
+    def test_get_fixtures_range_yields_each_date(self):
+        service = ScraperService()
+
+        def fake_get_fixtures(target_date):
+            if target_date.day == 8:
+                raise ValueError("no fixtures")
+            return [{"home": f"Home {target_date.day}"}]
+
+        with patch.object(service, "get_fixtures", side_effect=fake_get_fixtures):
+            results = {
+                d: (fixtures, error)
+                for d, fixtures, error in service.get_fixtures_range(date(2026, 1, 7), date(2026, 1, 9))
+            }
+        self.assertEqual(sorted(results), [date(2026, 1, 7), date(2026, 1, 8), date(2026, 1, 9)])
+        self.assertEqual(results[date(2026, 1, 7)][0][0]["home"], "Home 7")
+        self.assertIsInstance(results[date(2026, 1, 8)][1], ValueError)
+        self.assertIsNone(results[date(2026, 1, 8)][0])
+
+    def test_empty_day_is_reported_as_no_fixtures(self):
+        for hedge in (True, False):
+            service = ScraperService()
+            service.hedge = hedge
+
+            def empty(target_date):
+                raise NoFixturesError(f"nothing on {target_date}")
+
+            def broken(_target_date):
+                raise ValueError("bad payload")
+
+            service._scrape_bbc = empty  # type: ignore
+            service._scrape_espn = empty  # type: ignore
+            with self.assertRaises(NoFixturesError):
+                service.get_fixtures(date(2026, 6, 20))
+
+            service._scrape_espn = broken  # type: ignore
+            with self.assertRaises(ValueError) as caught:
+                service.get_fixtures(date(2026, 6, 21))
+            self.assertNotIsInstance(caught.exception, NoFixturesError)
+
+    def test_not_modified_reuses_parsed_fixtures(self):
+        service = ScraperService()
+        seen_headers = []
+        responses = [
+            _MockResponse(text=BBC_HTML, headers={"ETag": '"v1"'}),
+            _MockResponse(status=304),
+        ]
+
+        def fake_get(_session, url, headers=None, timeout=15):
+            seen_headers.append(headers or {})
+            return responses.pop(0)
+
+        with patch("app.utils.http_client.requests.Session.get", fake_get):
+            first = service._scrape_bbc(date(2026, 1, 7))
+            with patch.object(service, "_parse_bbc", side_effect=AssertionError("reparsed")):
+                second = service._scrape_bbc(date(2026, 1, 7))
+        self.assertEqual(first, second)
+        self.assertEqual(seen_headers[1].get("If-None-Match"), '"v1"')
+        self.assertEqual(service.http.stats()["not_modified"], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,187 @@
+import tempfile
+import unittest
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event, func, insert, select
+
+from app.database.db import create_storage_engine
+from app.database.migrations import run_migrations
+from app.database.snapshot import SnapshotError, export_snapshot, import_snapshot, iter_snapshot
+from app.models import daily_summary, league, team, match, prediction, match_stats  # noqa: F401
+from app.models.base import Base
+from app.models.daily_summary import DailyMatchSummary
+from app.models.league import League
+from app.models.match import Match
+from app.models.prediction import Prediction
+from app.models.prediction_response import PredictionResponse
+from app.models.team import Team
+
+CREATED = datetime(2026, 1, 1, 9, 30, 15, 250)
+
+
+class SnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.source = create_engine(f"sqlite:///{self.dir / 'source.db'}", future=True)
+        self.target = create_engine(f"sqlite:///{self.dir / 'target.db'}", future=True)
+        run_migrations(self.source)
+        with self.source.begin() as conn:
+            conn.execute(
+                insert(League),
+                [
+                    {"id": 1, "name": "Premier League", "tier": 1, "country": "England", "created_at": CREATED},
+                    {"id": 2, "name": "Ligue 1 – Québec", "tier": 2, "country": "Canada", "created_at": CREATED},
+                ],
+            )
+            conn.execute(
+                insert(Team),
+                [
+                    {"id": 1, "name": "Team 1", "venue": "Stadium", "league_id": 1, "created_at": CREATED},
+                    {"id": 2, "name": "Team 2", "venue": None, "league_id": 1, "created_at": CREATED},
+                ],
+            )
+            conn.execute(
+                insert(Match),
+                [
+                    {
+                        "id": 1,
+                        "league_id": 1,
+                        "home_team_id": 1,
+                        "away_team_id": 2,
+                        "kickoff_utc": datetime(2026, 3, 1, 15),
+                        "match_date": date(2026, 3, 1),
+                        "status": "finished",
+                        "home_score": 2,
+                        "away_score": 1,
+                    },
+                    {
+                        "id": 5,
+                        "league_id": 2,
+                        "home_team_id": 2,
+                        "away_team_id": 1,
+                        "kickoff_utc": None,
+                        "match_date": None,
+                        "status": "upcoming",
+                        "home_score": None,
+                        "away_score": None,
+                    },
+                ],
+            )
+            conn.execute(
+                insert(Prediction),
+                [
+                    {
+                        "match_id": 1 if index % 3 else 5,
+                        "model_used": f"model-{index % 2}",
+                        "confidence": None if index % 4 == 0 else index / 10,
+                        "final_score_home": index % 3,
+                        "final_score_away": None if index == 2 else 1,
+                        "created_at": datetime(2026, 2, 1, 12, index),
+                    }
+                    for index in range(7)
+                ],
+            )
+            conn.execute(
+                insert(PredictionResponse),
+                [
+                    {"prediction_id": 1, "body": PredictionResponse.compress("Final score: 0-1")},
+                    {"prediction_id": 4, "body": b""},
+                ],
+            )
+
+    def tearDown(self):
+        self.source.dispose()
+        self.target.dispose()
+        self._tmp.cleanup()
+
+    def _indexes(self, bind):
+        with bind.connect() as conn:
+            return set(conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'").scalars())
+
+    def _rows(self, bind, table):
+        with bind.connect() as conn:
+            return conn.execute(select(table).order_by(*table.primary_key.columns)).all()
+
+    def test_round_trip_restores_rows_and_rebuilds_summary(self):
+        path = self.dir / "football.faisnap"
+        exported = export_snapshot(path, bind=self.source, chunk_rows=3)
+        self.assertEqual(
+            exported,
+            {"leagues": 2, "teams": 2, "matches": 2, "match_stats": 0, "predictions": 7, "prediction_responses": 2},
+        )
+        self.assertFalse(path.with_name(path.name + ".partial").exists())
+        # Seven predictions at three rows per chunk.
+        self.assertEqual([len(chunk["id"]) for name, chunk in iter_snapshot(path) if name == "predictions"], [3, 3, 1])
+
+        imported = import_snapshot(path, bind=self.target)
+        self.assertEqual(imported, exported)
+        for name in exported:
+            table = Base.metadata.tables[name]
+            self.assertEqual(self._rows(self.target, table), self._rows(self.source, table), name)
+        with self.target.connect() as conn:
+            summary = conn.execute(
+                select(DailyMatchSummary.match_date, DailyMatchSummary.status, DailyMatchSummary.match_count)
+            ).all()
+            indexes = conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'").scalars().all()
+        self.assertEqual(summary, [(date(2026, 3, 1), "finished", 1)])
+        self.assertIn("ix_predictions_created_at_id", indexes)
+        self.assertIn("uq_matches_natural_key", indexes)
+
+    def test_import_refuses_a_populated_database(self):
+        path = self.dir / "football.faisnap"
+        export_snapshot(path, bind=self.source)
+        with self.assertRaises(SnapshotError):
+            import_snapshot(path, bind=self.source)
+        with self.source.connect() as conn:
+            self.assertEqual(conn.execute(select(func.count()).select_from(Prediction)).scalar_one(), 7)
+
+    def test_truncated_snapshot_leaves_target_empty(self):
+        path = self.dir / "football.faisnap"
+        export_snapshot(path, bind=self.source, chunk_rows=2)
+        truncated = self.dir / "truncated.faisnap"
+        truncated.write_bytes(path.read_bytes()[:-40])
+        with self.assertRaises(SnapshotError):
+            import_snapshot(truncated, bind=self.target)
+        with self.target.connect() as conn:
+            self.assertEqual(conn.execute(select(func.count()).select_from(League)).scalar_one(), 0)
+        # The indexes dropped for the load come back with the rollback.
+        self.assertEqual(self._indexes(self.target), self._indexes(self.source))
+
+        garbage = self.dir / "garbage.faisnap"
+        garbage.write_bytes(b"not a snapshot")
+        with self.assertRaises(SnapshotError):
+            list(iter_snapshot(garbage))
+
+    def test_import_rejects_columns_the_schema_does_not_have(self):
+        run_migrations(self.target)
+        chunks = iter([("teams", {"id": [1], "name": ["Team 1"], "nickname": ["The Ones"]})])
+        with patch("app.database.snapshot.iter_snapshot", return_value=chunks):
+            with self.assertRaisesRegex(SnapshotError, "nickname"):
+                import_snapshot(self.dir / "unused.faisnap", bind=self.target)
+        self.assertIn("uq_matches_natural_key", self._indexes(self.target))
+
+    def test_export_reads_every_table_in_one_transaction(self):
+        with self.source.connect() as conn:
+            conn.exec_driver_sql("PRAGMA journal_mode = WAL")
+        reader = create_storage_engine(f"sqlite:///{self.dir / 'source.db'}", read_only=True)
+
+        def write_during_export(conn, cursor, statement, *args):
+            if statement.startswith("SELECT predictions."):
+                with self.source.begin() as writer:
+                    writer.execute(insert(Prediction), [{"match_id": 1, "model_used": "late"}])
+
+        event.listen(reader, "before_cursor_execute", write_during_export)
+        try:
+            counts = export_snapshot(self.dir / "football.faisnap", bind=reader)
+        finally:
+            reader.dispose()
+        self.assertEqual(counts["predictions"], 7)
+        with self.source.connect() as conn:
+            self.assertEqual(conn.execute(select(func.count()).select_from(Prediction)).scalar_one(), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()